@@ -1,22 +1,19 @@
 import calendar
-from collections import defaultdict
 import shutil
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
 import sys
 import os
+import sqlite3
 import configparser
 from datetime import date, datetime, timedelta
 
-from settings.settings import update_root_path_with_db_file, get_current_db_filename
+from settings.settings import update_root_path_with_db_file, get_current_db_filename, get_full_db_path
 
-from PyQt6.QtWidgets import QApplication, QMainWindow, QDialog, QTreeWidgetItem, QMenu, QMessageBox, QListWidgetItem, QCompleter, QHeaderView, QTableWidget, QTableWidgetItem, QGroupBox, QFileDialog
-from PyQt6.QtGui import QIcon, QPalette, QFontDatabase
+from PyQt6.QtWidgets import QApplication, QMainWindow, QDialog, QTreeWidgetItem, QMenu, QMessageBox, QListWidgetItem, QCompleter, QHeaderView, QTableWidgetItem, QGroupBox, QFileDialog
+from PyQt6.QtGui import QIcon, QPalette, QFontDatabase, QKeySequence, QShortcut
 from PyQt6 import QtWidgets, QtCore
-from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, Qt, QTimer
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, Qt, QTimer, QThreadPool
 
-from services.work_day_services import WorkDayDAO
+from services.packed_work_day_services import create_work_day_dao
 from ui.mainWindow import Ui_MainWindow
 from ui.newYearDialog import Ui_Dialog_NewYear
 from ui.filterDialog import Ui_Dialog_Filter
@@ -26,13 +23,25 @@ from ui.reportDialog import Ui_Dialog_Report
 from ui.groupDialog import Ui_Dialog_Group
 from ui.YearEditDialog import Ui_Dialog_YearEdit
 from ui.subjectDialog import Ui_Dialog_Subject
-from calendar_helper import CalendarTableData, setup_calendar_tables_for_half
+from calendar_helper import setup_calendar_tables_for_half
+from hours_table_model import HoursTableModel, NAME_COLUMNS, parse_hours
+from background_tasks import ExcelReportTask, SemesterPrefetchTask
 
 from services.group_services import GroupDAO
 from services.curriculum_services import CurriculumDAO
 from services.subject_services import SubjectDAO
+from services.hours_index import MonthHoursStore, load_semester_grid
+from services.general import connection_manager
+from services.write_buffer import WorkDayWriteBuffer
+from services.month_report import build_month_titles, current_first_half_year, working_days_in_month
 from services.resource_path import resource_path
 
+# Задержка (мс) между первой несохранённой правкой часов и записью буфера правок в БД
+EDIT_FLUSH_DELAY_MS = 1500
+# Пауза после ввода в строку поиска, после которой применяется фильтр (мс)
+SEARCH_DEBOUNCE_MS = 250
+
+
 # === ThemeManager ===
 class ThemeManager(QObject):
     theme_changed = pyqtSignal(str)  # theme switch signal
@@ -168,6 +177,8 @@ class YearEditDialog(ThemedDialog):
         self.group_service = group_dao 
         self.subject_service = subject_dao
         self.curriculum_service = curriculum_dao
+        # Изменились ли учебные планы в БД после закрытия окна
+        self.changed = False
         
         self.on_theme_changed(self.theme_manager.get_theme())
         self.update_icons()
@@ -304,7 +315,7 @@ class YearEditDialog(ThemedDialog):
     def apply_changes(self):
         """
         Синхронизирует данные из tableWidget_Hours с БД.
-        Удаляет старые записи для группы и семестра, добавляет новые из таблицы.
+        В БД применяется только разница с текущим планом группы на семестр, одной транзакцией.
         """
         group_name = self.ui.comboBox_Groups.currentText()
         if not group_name:
@@ -318,44 +329,38 @@ class YearEditDialog(ThemedDialog):
         else:
             return
 
-        try:
-            old_curriculums = self.curriculum_service.get_curriculums_by_group_and_semester(group_name, semester)
-            for curriculum in old_curriculums:
-                curriculum_id = curriculum[0]  
-                self.curriculum_service.delete_curriculum(curriculum_id)
+        # Собираем план из таблицы: {предмет: часы}
+        subject_hours = {}
+        for row in range(self.ui.tableWidget_Hours.rowCount()):
+            item_subject = self.ui.tableWidget_Hours.item(row, 0)
+            item_hour = self.ui.tableWidget_Hours.item(row, 1)
 
-            for row in range(self.ui.tableWidget_Hours.rowCount()):
-                item_subject = self.ui.tableWidget_Hours.item(row, 0)
-                item_hour = self.ui.tableWidget_Hours.item(row, 1)
-
-                if not item_subject or not item_hour:
-                    continue  
-
-                subject_name = item_subject.text().strip()
-                total_hour_str = item_hour.text().strip()
-
-                if not subject_name or not total_hour_str:
-                    continue  
-
-                try:
-                    total_hour = int(total_hour_str) 
-                except ValueError:
-                    QMessageBox.information(self, f"Некорректное значение часов для предмета '{subject_name}': {total_hour_str}")
-                    continue
-
-                # Создаём новую запись в БД
-                self.curriculum_service.create_curriculum(
-                    semester=semester,
-                    total_hour=total_hour,
-                    group_name=group_name,
-                    subject_name=subject_name
-                )
-            QMessageBox.information(self, "Успех", f"Данные для группы '{group_name}' и семестра {semester} успешно сохранены.")
-            self.accept()
-            
+            if not item_subject or not item_hour:
+                continue
 
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Произошла ошибка при сохранении данных: {e}")
+            subject_name = item_subject.text().strip()
+            total_hour_str = item_hour.text().strip()
+
+            if not subject_name or not total_hour_str:
+                continue
+
+            try:
+                subject_hours[subject_name] = int(total_hour_str)
+            except ValueError:
+                # План сохраняется целиком, поэтому с ошибкой в часах не сохраняем ничего
+                QMessageBox.warning(self, "Ошибка",
+                                    f"Некорректное значение часов для предмета '{subject_name}': {total_hour_str}")
+                return
+
+        # Изменения плана применяются одной транзакцией: добавление, изменение часов и удаление предметов
+        result = self.curriculum_service.sync_group_semester(group_name, semester, subject_hours)
+        if result is None:
+            QMessageBox.critical(self, "Ошибка", "Произошла ошибка при сохранении данных. Изменения не сохранены.")
+            return
+        self.changed = any(result)
+
+        QMessageBox.information(self, "Успех", f"Данные для группы '{group_name}' и семестра {semester} успешно сохранены.")
+        self.accept()
 
 
 class SubjectDialog(ThemedDialog):
@@ -365,6 +370,8 @@ class SubjectDialog(ThemedDialog):
         self.ui.setupUi(self)
 
         self.subject_service = subject_dao
+        # Изменился ли список дисциплин в БД после закрытия окна
+        self.changed = False
 
         self.on_theme_changed(self.theme_manager.get_theme())
         self.update_icons()
@@ -398,76 +405,44 @@ class SubjectDialog(ThemedDialog):
     
     def accept_and_sync(self):
         """
-        Синхронизирует список групп в QListWidget с базой данных
-        Удаляет из БД группы, отсутствующие в списке, и добавляет в БД группы, отсутствующие в БД
+        Синхронизирует список дисциплин в QListWidget с базой данных.
+        Переименованные строки меняются в БД через update_subject - одна строка справочника, планы и часы ссылаются
+        на её id. Затем одной транзакцией удаляются из БД дисциплины, отсутствующие в списке,
+        и добавляются дисциплины, отсутствующие в БД
         """
-        errors_occurred = False
-        error_messages = []
-        
-        list_widget_names = set()
-        for i in range(self.ui.listWidget_Subjects.count()):
-            item = self.ui.listWidget_Subjects.item(i)
-            name = item.text().strip()
-            if name: 
-                list_widget_names.add(name.lower()) 
-
-        try:
-            db_subjects_raw = self.subject_service.get_all_subjects()
-            db_names = set()
-            for subject_tuple in db_subjects_raw:
-                db_name = subject_tuple[0]
-                db_names.add(db_name.lower()) 
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Не удалось получить список дисциплин из базы данных: {e}")
+        list_widget = self.ui.listWidget_Subjects
+        renamed = []
+        for i in range(list_widget.count()):
+            list_item = list_widget.item(i)
+            db_name = list_item.data(Qt.ItemDataRole.UserRole)
+            new_name = list_item.text().strip()
+            if not db_name or not new_name or new_name == db_name:
+                continue
+            if self.subject_service.update_subject(db_name, new_name) is None:
+                QMessageBox.warning(self, "Данные не синхронизированы",
+                                    f"Не удалось переименовать дисциплину '{db_name}' в '{new_name}'.\n"
+                                    f"Остальные изменения списка не сохранены.")
+                return
+            # Переименование уже в БД - при повторной синхронизации оно не повторяется
+            list_item.setData(Qt.ItemDataRole.UserRole, new_name)
+            renamed.append((db_name, new_name))
+            self.changed = True
+
+        names = [list_widget.item(i).text() for i in range(list_widget.count())]
+
+        result = self.subject_service.replace_all(names)
+        if result is None:
+            QMessageBox.warning(self, "Данные не синхронизированы",
+                                "Произошла ошибка при синхронизации с базой данных. Изменения не сохранены.\n"
+                                "Удаляемые дисциплины не должны использоваться в учебных планах и часах.")
             return
 
-        print(f"[DEBUG] Список из UI (lower): {list_widget_names}")
-        print(f"[DEBUG] Список из БД (lower): {db_names}")
-
-        names_to_delete = db_names - list_widget_names
-        names_to_add = list_widget_names - db_names
-
-        for name_lower in names_to_delete:
-            original_name_for_deletion = None
-            for subject_tuple in db_subjects_raw:
-                if subject_tuple[0].lower() == name_lower: 
-                    original_name_for_deletion = subject_tuple[0] 
-                    break
-
-            if original_name_for_deletion:
-                result = self.subject_service.delete_subject(original_name_for_deletion)
-                if result is None:
-                    error_msg = f"Не удалось удалить дисциплину '{original_name_for_deletion}' из базы данных."
-                    print(f"Ошибка: {error_msg}")
-                    error_messages.append(error_msg)
-                    errors_occurred = True
-                else:
-                    print(f"Дисциплина '{original_name_for_deletion}' успешно удалена из БД.")
-
-        for name_lower in names_to_add:
-            original_name_for_addition = None
-            for i in range(self.ui.listWidget_Subjects.count()):
-                item = self.ui.listWidget_Subjects.item(i)
-                if item.text().strip().lower() == name_lower:
-                    original_name_for_addition = item.text().strip()
-                    break
-
-            if original_name_for_addition:
-                result = self.subject_service.create_subject(original_name_for_addition)
-                if result is None:
-                    error_msg = f"Не удалось создать дисциплину '{original_name_for_addition}' в базе данных."
-                    print(f"Ошибка: {error_msg}")
-                    error_messages.append(error_msg)
-                    errors_occurred = True
-                else:
-                    print(f"Дисциплина '{original_name_for_addition}' успешно добавлена в БД.")
-
-        if errors_occurred:
-            error_details = "\n".join(error_messages)
-            QMessageBox.warning(self, "Часть данных не синхронизирована", f"Произошли ошибки при синхронизации:\n{error_details}\n\n.")
-        else:
-            QMessageBox.information(self, "Успешно", f"Список дисциплин синхронизирован с базой данных.\nУдалено: {len(names_to_delete)}, добавлено: {len(names_to_add)}.")
-            self.accept()
+        added, deleted = result
+        self.changed = self.changed or bool(added or deleted)
+        print(f"Синхронизация дисциплин: переименовано {renamed}, добавлено {added}, удалено {deleted}")
+        QMessageBox.information(self, "Успешно", f"Список дисциплин синхронизирован с базой данных.\n"
+                                                 f"Переименовано: {len(renamed)}, удалено: {len(deleted)}, добавлено: {len(added)}.")
+        self.accept()
 
     def count_empty_items(self):
         """
@@ -652,8 +627,10 @@ class SubjectDialog(ThemedDialog):
 
             subjects = self.subject_service.get_all_subjects()
             for subject in subjects:
-                # Добавление элемента в QListWidget
-                self.ui.listWidget_Subjects.addItem(subject[0])
+                # Добавление элемента в QListWidget; название из БД сохраняется, чтобы распознать переименование
+                list_item = QListWidgetItem(subject[0])
+                list_item.setData(Qt.ItemDataRole.UserRole, subject[0])
+                self.ui.listWidget_Subjects.addItem(list_item)
                 # Добавление элемента в QComboBox
                 self.ui.comboBox_Subjects.addItem(subject[0])
 
@@ -683,6 +660,8 @@ class GroupDialog(ThemedDialog):
         self.ui.setupUi(self)
 
         self.group_service = group_dao
+        # Изменился ли список групп в БД после закрытия окна
+        self.changed = False
 
         self.on_theme_changed(self.theme_manager.get_theme())
         self.update_icons()
@@ -716,76 +695,44 @@ class GroupDialog(ThemedDialog):
     
     def accept_and_sync(self):
         """
-        Синхронизирует список групп в QListWidget с базой данных
-        Удаляет из БД группы, отсутствующие в списке, и добавляет в БД группы, отсутствующие в БД
+        Синхронизирует список групп в QListWidget с базой данных.
+        Переименованные строки меняются в БД через update_group - одна строка справочника, планы и часы ссылаются
+        на её id. Затем одной транзакцией удаляются из БД группы, отсутствующие в списке,
+        и добавляются группы, отсутствующие в БД
         """
-        errors_occurred = False
-        error_messages = []
-        
-        list_widget_names = set()
-        for i in range(self.ui.listWidget_Groups.count()):
-            item = self.ui.listWidget_Groups.item(i)
-            name = item.text().strip()
-            if name: 
-                list_widget_names.add(name.lower()) 
-
-        try:
-            db_groups_raw = self.group_service.get_all_groups()
-            db_names = set()
-            for group_tuple in db_groups_raw:
-                db_name = group_tuple[0]
-                db_names.add(db_name.lower()) 
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Не удалось получить список групп из базы данных: {e}")
+        list_widget = self.ui.listWidget_Groups
+        renamed = []
+        for i in range(list_widget.count()):
+            list_item = list_widget.item(i)
+            db_name = list_item.data(Qt.ItemDataRole.UserRole)
+            new_name = list_item.text().strip()
+            if not db_name or not new_name or new_name == db_name:
+                continue
+            if self.group_service.update_group(db_name, new_name) is None:
+                QMessageBox.warning(self, "Данные не синхронизированы",
+                                    f"Не удалось переименовать группу '{db_name}' в '{new_name}'.\n"
+                                    f"Остальные изменения списка не сохранены.")
+                return
+            # Переименование уже в БД - при повторной синхронизации оно не повторяется
+            list_item.setData(Qt.ItemDataRole.UserRole, new_name)
+            renamed.append((db_name, new_name))
+            self.changed = True
+
+        names = [list_widget.item(i).text() for i in range(list_widget.count())]
+
+        result = self.group_service.replace_all(names)
+        if result is None:
+            QMessageBox.warning(self, "Данные не синхронизированы",
+                                "Произошла ошибка при синхронизации с базой данных. Изменения не сохранены.\n"
+                                "Удаляемые группы не должны использоваться в учебных планах и часах.")
             return
 
-        print(f"[DEBUG] Список из UI (lower): {list_widget_names}")
-        print(f"[DEBUG] Список из БД (lower): {db_names}")
-
-        names_to_delete = db_names - list_widget_names
-        names_to_add = list_widget_names - db_names
-
-        for name_lower in names_to_delete:
-            original_name_for_deletion = None
-            for group_tuple in db_groups_raw:
-                if group_tuple[0].lower() == name_lower: 
-                    original_name_for_deletion = group_tuple[0] 
-                    break
-
-            if original_name_for_deletion:
-                result = self.group_service.delete_group(original_name_for_deletion)
-                if result is None:
-                    error_msg = f"Не удалось удалить группу '{original_name_for_deletion}' из базы данных."
-                    print(f"Ошибка: {error_msg}")
-                    error_messages.append(error_msg)
-                    errors_occurred = True
-                else:
-                    print(f"Группа '{original_name_for_deletion}' успешно удалена из БД.")
-
-        for name_lower in names_to_add:
-            original_name_for_addition = None
-            for i in range(self.ui.listWidget_Groups.count()):
-                item = self.ui.listWidget_Groups.item(i)
-                if item.text().strip().lower() == name_lower:
-                    original_name_for_addition = item.text().strip()
-                    break
-
-            if original_name_for_addition:
-                result = self.group_service.create_group(original_name_for_addition)
-                if result is None:
-                    error_msg = f"Не удалось создать группу '{original_name_for_addition}' в базе данных."
-                    print(f"Ошибка: {error_msg}")
-                    error_messages.append(error_msg)
-                    errors_occurred = True
-                else:
-                    print(f"Группа '{original_name_for_addition}' успешно добавлена в БД.")
-
-        if errors_occurred:
-            error_details = "\n".join(error_messages)
-            QMessageBox.warning(self, "Часть данных не синхронизирована", f"Произошли ошибки при синхронизации:\n{error_details}\n\nСм. лог для подробностей.")
-        else:
-            QMessageBox.information(self, "Успешно", f"Список групп синхронизирован с базой данных.\nУдалено: {len(names_to_delete)}, добавлено: {len(names_to_add)}.")
-            self.accept()
+        added, deleted = result
+        self.changed = self.changed or bool(added or deleted)
+        print(f"Синхронизация групп: переименовано {renamed}, добавлено {added}, удалено {deleted}")
+        QMessageBox.information(self, "Успешно", f"Список групп синхронизирован с базой данных.\n"
+                                                 f"Переименовано: {len(renamed)}, удалено: {len(deleted)}, добавлено: {len(added)}.")
+        self.accept()
 
     def count_empty_items(self):
         """
@@ -970,8 +917,10 @@ class GroupDialog(ThemedDialog):
 
             groups = self.group_service.get_all_groups()
             for group in groups:
-                # Добавление элемента в QListWidget
-                self.ui.listWidget_Groups.addItem(group[0])
+                # Добавление элемента в QListWidget; название из БД сохраняется, чтобы распознать переименование
+                list_item = QListWidgetItem(group[0])
+                list_item.setData(Qt.ItemDataRole.UserRole, group[0])
+                self.ui.listWidget_Groups.addItem(list_item)
                 # Добавление элемента в QComboBox
                 self.ui.comboBox_Groups.addItem(group[0])
 
@@ -1446,8 +1395,13 @@ class ReportDialog(ThemedDialog):
 
 # === PrintReport ===
 class PrintReportDialog(ThemedDialog):
-    def __init__(self, theme_manager: ThemeManager):
+    def __init__(self, theme_manager: ThemeManager, flush_pending_edits=None):
+        """
+        :parameter flush_pending_edits: Функция записи несохранённых правок главного окна -
+        вызывается перед выгрузкой, так как отчёт читает БД своим соединением
+        """
         super().__init__(theme_manager)
+        self.flush_pending_edits = flush_pending_edits
         self.ui = Ui_PrintReportDialog()
         self.ui.setupUi(self)
 
@@ -1455,9 +1409,12 @@ class PrintReportDialog(ThemedDialog):
         self.on_theme_changed(self.theme_manager.get_theme())
 
         # DAO
-        self.work_day_dao = WorkDayDAO()
+        self.work_day_dao = create_work_day_dao()
         self.curriculum_dao = CurriculumDAO()
 
+        # Год первого полугодия - как в главном окне и в cli.py: начало текущего учебного года
+        self.first_half_year = current_first_half_year()
+
         # Сохраняем ссылки на группы и чекбоксы для удобства
         self.first_half_checkboxes = [
             self.ui.chB_september,
@@ -1478,7 +1435,11 @@ class PrintReportDialog(ThemedDialog):
         self.ui.chB_first_half.clicked.connect(self.toggle_first_half_group)
         self.ui.chB_second_half.clicked.connect(self.toggle_second_half_group)
         
-        self.ui.btn_Cancel.clicked.connect(self.close)
+        # Во время выгрузки "Отменить" останавливает её, иначе закрывает окно
+        self.ui.btn_Cancel.clicked.connect(self.on_cancel_clicked)
+
+        # Текущая фоновая выгрузка отчёта
+        self.export_task = None
 
         # Подключаем сигналы для месяцев, чтобы синхронизировать "полугодие"
         for cb in self.first_half_checkboxes:
@@ -1523,29 +1484,9 @@ class PrintReportDialog(ThemedDialog):
     
     def get_days_in_month(self, month_name):
         """
-        Возвращает список рабочих дней (без воскресений) для указанного месяца в текущем году.
+        Возвращает список рабочих дней (без воскресений) для указанного месяца учебного года.
         """
-        month_to_num = {
-            "Январь": 1, "Февраль": 2, "Март": 3, "Апрель": 4,
-            "Май": 5, "Июнь": 6, "Июль": 7, "Август": 8,
-            "Сентябрь": 9, "Октябрь": 10, "Ноябрь": 11, "Декабрь": 12
-        }
-
-        month_num = month_to_num.get(month_name, 0)
-        if not month_num:
-            return []
-
-        current_year = datetime.now().year
-
-        # Собираем даты месяца, исключая воскресенья
-        days = []
-        for day in range(1, calendar.monthrange(current_year, month_num)[1] + 1):
-            dt = date(current_year, month_num, day)
-            weekday = dt.weekday()  # 0 — понедельник, 6 — воскресенье
-            if weekday != 6:  # Исключаем воскресенье
-                days.append(day)
-
-        return days
+        return working_days_in_month(self.first_half_year, month_name)
 
     def check_select_all_state(self):
         """Проверяет, должны ли быть сняты галочки с chB_select_all"""
@@ -1608,125 +1549,89 @@ class PrintReportDialog(ThemedDialog):
             self,
             "Сохранить отчёт",
             "",
-            "Excel файлы (*.xlsx);;Все файлы (*)"
+            "Excel файлы (*.xlsx);;CSV файлы (*.csv);;TSV файлы (*.tsv);;Все файлы (*)"
         )
 
         if not file_path:
             return
 
-        if not file_path.lower().endswith('.xlsx'):
+        # CSV и TSV пишутся построчно из курсора БД, остальное - книгой Excel
+        if not file_path.lower().endswith(('.xlsx', '.csv', '.tsv')):
             file_path += '.xlsx'
 
-        try:
-            # Сортируем месяцы: сначала первое полугодие, потом второе
-            sorted_months = self.sort_months_by_semester(selected_months)
-            self.generate_excel_report(file_path, sorted_months)
-            QMessageBox.information(self, "Успех", f"Отчёт сохранён:\n{file_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл:\n{str(e)}")
-            
-    def get_academic_year_for_month(self, month_name):
-        """
-        Возвращает учебный год, определяемый по дате начала учебного года (1 сентября текущего года)
-        """
-        current_year = datetime.now().year
+        # Сортируем месяцы: сначала первое полугодие, потом второе
+        sorted_months = self.sort_months_by_semester(selected_months)
+        self.start_export(file_path, sorted_months)
 
-        # Если текущий месяц >= 9 (сентябрь), то учебный год: current_year / current_year + 1
-        current_month = datetime.now().month
+    def start_export(self, file_path, sorted_months):
+        """Запускает выгрузку отчёта в фоне: окна остаются доступными, ход выгрузки виден по месяцам"""
+        if self.flush_pending_edits is not None:
+            self.flush_pending_edits()
 
-        if current_month >= 9:  # Сентябрь–Декабрь → 2025/2026
-            return f"{current_year}/{current_year + 1}"
-        else:  # Январь–Август → 2024/2025
-            return f"{current_year - 1}/{current_year}"
-    
-    def generate_excel_report(self, file_path, selected_months):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Отчёт"
-
-        # Шрифты
-        title_font = Font(bold=True, size=14)
-        header_font = Font(bold=True)
-        center_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        left_alignment = Alignment(horizontal="left", vertical="center")
-
-        # Границы
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
+        self.export_task = ExcelReportTask(
+            self.work_day_dao.get_db_path(),
+            file_path,
+            self.first_half_year,
+            self.get_month_titles(sorted_months)
         )
+        self.export_task.signals.progress.connect(self.on_export_progress)
+        self.export_task.signals.finished.connect(self.on_export_finished)
+        self.export_task.signals.failed.connect(self.on_export_failed)
+        self.export_task.signals.cancelled.connect(self.on_export_cancelled)
+
+        self.ui.btn_Print.setEnabled(False)
+        self.ui.progressBar_export.setRange(0, len(sorted_months))
+        self.ui.progressBar_export.setValue(0)
+        self.ui.progressBar_export.setFormat("Подготовка данных...")
+        self.ui.progressBar_export.setVisible(True)
+
+        QThreadPool.globalInstance().start(self.export_task)
+
+    def is_exporting(self):
+        return self.export_task is not None
+
+    def finish_export(self):
+        """Возвращает окно в обычное состояние после выгрузки"""
+        self.export_task = None
+        self.ui.btn_Print.setEnabled(True)
+        self.ui.progressBar_export.setVisible(False)
+
+    def on_export_progress(self, written, total, month_name):
+        self.ui.progressBar_export.setValue(written)
+        self.ui.progressBar_export.setFormat(f"{month_name}: %v из %m")
+
+    def on_export_finished(self, file_path):
+        self.finish_export()
+        QMessageBox.information(self, "Успех", f"Отчёт сохранён:\n{file_path}")
+
+    def on_export_failed(self, message):
+        self.finish_export()
+        QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл:\n{message}")
+
+    def on_export_cancelled(self):
+        self.finish_export()
+        print("Выгрузка отчёта отменена.")
+
+    def on_cancel_clicked(self):
+        if self.is_exporting():
+            self.ui.progressBar_export.setFormat("Остановка...")
+            self.export_task.cancel()
+        else:
+            self.close()
+
+    def closeEvent(self, event):
+        """Закрытие окна останавливает выгрузку: прежний файл отчёта при этом не затрагивается"""
+        if self.is_exporting():
+            self.export_task.cancel()
+        super().closeEvent(event)
+            
+    def get_month_titles(self, selected_months):
+        """
+        Заголовки таблиц отчёта: список (month_name, year_title, caption).
+        Учебный год берётся из first_half_year - того же года, за который выбираются данные
+        """
+        return build_month_titles(self.first_half_year, selected_months)
 
-        row_num = 1
-
-        for month in selected_months:
-            academic_year = self.get_academic_year_for_month(month)
-
-            ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=2)  
-            cell = ws.cell(row=row_num, column=1, value=f"{academic_year} учебный год")
-            cell.font = title_font
-            cell.alignment = center_alignment
-
-            col_start = 3  # Столбец после "Дисциплина"
-            working_days = self.get_days_in_month(month)  
-            col_end = col_start + len(working_days) + 2  
-            ws.merge_cells(start_row=row_num, start_column=col_start, end_row=row_num, end_column=col_end)
-            semester_text = self.get_semester_for_month(month)
-            cell = ws.cell(row=row_num, column=col_start, value=f"Учет проведенных занятий в {semester_text} — {month}")
-            cell.font = title_font
-            cell.alignment = center_alignment
-
-            row_num += 1
-
-            # Заголовки столбцов
-            headers = [
-                "Всего ч.",
-                "Дисциплина",
-                "Группа"
-            ] + [str(day) for day in working_days] + ["Прошло", "Осталось"]
-
-            # Пишем заголовки
-            for col_num, header in enumerate(headers, 1):
-                cell = ws.cell(row=row_num, column=col_num, value=header)
-                cell.font = header_font
-                cell.alignment = center_alignment
-                cell.border = thin_border
-
-            row_num += 1
-
-            # Получаем данные для месяца
-            data_rows = self.get_month_data(month)
-
-            # Пишем данные
-            for data_row in data_rows:
-                for col_num, value in enumerate(data_row, 1):
-                    cell = ws.cell(row=row_num, column=col_num, value=value)
-                    cell.alignment = center_alignment
-                    cell.border = thin_border
-                    # Если значение = 0 и это день месяца — оставляем пустым
-                    if col_num >= 4 and col_num <= 3 + len(working_days) and value == 0:  # ✅
-                        cell.value = ""  # Пустая ячейка
-                row_num += 1
-
-            # Пустая строка между таблицами
-            row_num += 1
-
-        # Автоподбор ширины
-        for col in ws.columns:
-            max_length = 0
-            col_letter = get_column_letter(col[0].column)
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[col_letter].width = adjusted_width
-
-        wb.save(file_path)
-        
     def get_academic_year_from_date(self, date_str):
         """Определяет учебный год по дате в формате 'YYYY-MM-DD'"""
         try:
@@ -1769,83 +1674,6 @@ class PrintReportDialog(ThemedDialog):
 
         return first_half + second_half  # Сначала первое полугодие, потом второе
         
-    def write_month_table(self, writer, month_name):
-        """
-        Пишет таблицу для одного месяца
-        """
-        # Получаем данные для этого месяца
-        data_rows = self.get_month_data(month_name)
-
-        # Записываем заголовок таблицы
-        writer.writerow(["2025/2026 учебный год", "", "", "Учет проведенных занятий в 1 полугодии"])
-        writer.writerow([f"{month_name}", "", "", ""])  # Название месяца
-        writer.writerow(["I полугодие", "Дисциплина", "Группа"] + 
-                        [str(day) for day in range(1, self.get_days_in_month(month_name) + 1)] + 
-                        ["Прошло", "Осталось"])
-
-        # Записываем данные
-        for row in data_rows:
-            writer.writerow(row)
-
-        # Пустая строка между таблицами
-        writer.writerow([])
-        
-    def get_month_data(self, month_name):
-        work_days = self.work_day_dao.get_all_work_days()
-        curricula = self.curriculum_dao.get_all_curriculums()
-
-        # Создаем словарь: (subject, group) -> {day: hours}
-        grouped_data = defaultdict(lambda: defaultdict(int))
-
-        for wd in work_days:
-            date_str = wd[1]  # date
-            subject = wd[2]   # subject_name
-            group = wd[3]     # group_name
-            hours = wd[5]     # hours
-
-            try:
-                dt = datetime.strptime(date_str, "%Y-%m-%d")
-            except ValueError:
-                continue
-
-            # Фильтруем только по нужному месяцу
-            if self.month_number_to_name(dt.month) != month_name:
-                continue
-
-            # Пропускаем воскресенье
-            day_num = dt.day
-            weekday = dt.weekday()
-            if weekday == 6:  # воскресенье
-                continue
-
-            key = (subject, group)
-            grouped_data[key][day_num] += hours
-
-        # Карта: (group, subject) -> total_hour
-        curriculum_map = {(c[3], c[4]): c[2] for c in curricula}  # (group_name, subject_name) -> total_hour
-
-        rows = []
-        for (subject, group), daily_hours in grouped_data.items():
-            # Первый столбец — общее число часов по предмету у группы в плане
-            total_plan = curriculum_map.get((group, subject), 0)
-
-            row = [total_plan, subject, group]  # I полугодие, дисциплина, группа
-
-            working_days = self.get_days_in_month(month_name)
-            for day in working_days:
-                row.append(daily_hours.get(day, 0))
-
-            # Прошло и Осталось
-            total_in_month = sum(daily_hours.get(d, 0) for d in working_days)
-            remaining = max(0, total_plan - total_in_month)
-
-            row.append(total_in_month)
-            row.append(remaining)
-
-            rows.append(row)
-
-        return rows
-    
     # В класс PrintReportDialog добавьте:
     def month_number_to_name(self, month_num):
         """Преобразует номер месяца в его имя"""
@@ -1867,15 +1695,46 @@ class MainWindow(ThemedWindow):
         current_db_filename = get_current_db_filename()
         print(f"MainWindow: Используется база данных: {current_db_filename}")
         
-        self.work_day_dao = WorkDayDAO(db_filename=current_db_filename)
+        self.work_day_dao = create_work_day_dao(db_filename=current_db_filename)
         self.curriculum_dao = CurriculumDAO(db_filename=current_db_filename)
         self.group_dao = GroupDAO(db_filename=current_db_filename)
         self.subject_dao = SubjectDAO(db_filename=current_db_filename)
+
+        # Правки часов копятся в буфере и пишутся в БД пачками по таймеру
+        self.write_buffer = WorkDayWriteBuffer(self.work_day_dao)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(EDIT_FLUSH_DELAY_MS)
+        self.flush_timer.timeout.connect(self.flush_pending_edits)
+
+        # Перезагрузка таблиц после смены полугодия, фильтров, БД или справочников.
+        # Запросы до возврата в цикл событий схлопываются в одну загрузку
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(0)
+        self.reload_timer.timeout.connect(self.load_and_display_work_days)
+
+        # Поиск по мере ввода: фильтр применяется, когда пользователь перестал печатать
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.on_search_clicked)
         
         self.current_group_filter = set() 
         self.current_subject_filter = set() 
         
-        self.table_date_mapping = {} 
+        self.hours_index = None
+        # Строки таблиц месяцев (группа, предмет) и уже построенные таблицы текущей загрузки
+        self.table_rows = []
+        self.materialized_tables = set()
+        # Загруженные данные семестров: semester -> (hours_index, rows).
+        # Второй семестр подгружается в фоне, чтобы переключение полугодий не обращалось к БД
+        self.semester_cache = {}
+        # Номер поколения кэша: фоновые результаты прошлых поколений отбрасываются
+        self.semester_cache_generation = 0
+        self.prefetch_task = None
+        # Немодальное окно выгрузки отчёта
+        self.print_report_dialog = None
 
         # Первое полугодие = Сент–Дек (4 месяца)
         self.first_half = [
@@ -1894,7 +1753,11 @@ class MainWindow(ThemedWindow):
             (6, "Июнь")
         ]
         
-        self.first_half_year = date.today().year
+        # Год первого полугодия - начало текущего учебного года (то же определение, что у cli.py)
+        self.first_half_year = current_first_half_year()
+
+        # Модели таблиц месяцев нужны до первой настройки полугодия
+        self.initialize_table_widgets()
 
         # Подключаем радиокнопки
         self.ui.rBtn_First.toggled.connect(self.on_half_changed)
@@ -1933,17 +1796,15 @@ class MainWindow(ThemedWindow):
             self.ui.btn_Default.clicked.connect(self.on_reset_clicked)
         if hasattr(self.ui, 'btn_Search'):
             self.ui.btn_Search.clicked.connect(self.on_search_clicked)
+        self.ui.line_Search.textChanged.connect(lambda _: self.search_timer.start())
 
-        # Initialize table widgets - hide headers if needed
-        self.initialize_table_widgets()
-        
         # Подключаем обработчики сигналов для таблиц
         self.setup_table_connections()
         
-        QTimer.singleShot(0, self.load_and_display_work_days)
+        self.schedule_grid_reload()
 
     def initialize_table_widgets(self):
-        """Initialize properties for all QTableWidget instances."""
+        """Initialize properties and models for all month QTableView instances."""
         # Список всех виджетов вкладок и соответствующих table widgets
         tables_data = [
             (self.ui.tab_September, self.ui.tableV_hours_1),
@@ -1959,6 +1820,9 @@ class MainWindow(ThemedWindow):
             table_widget.verticalHeader().setVisible(False)
             # table_widget.horizontalHeader().setVisible(False) # Uncomment if you want to hide horizontal headers too
 
+            # Одна модель на таблицу на всё время работы окна - при загрузке данных меняется только её содержимое
+            table_widget.setModel(HoursTableModel(table_widget))
+
     @pyqtSlot(str)
     def on_theme_changed(self, theme: str):
         """Call when theme switched"""
@@ -1973,52 +1837,61 @@ class MainWindow(ThemedWindow):
         Учебный год начинается 1 сентября.
         Возвращает кортеж (год_начала, год_конца).
         """
-        current_date = datetime.now().date()
-        current_month = current_date.month
-        current_year = current_date.year
-
-        if current_month >= 9: # Сентябрь или позже -> начало нового учебного года
-            start_year = current_year
-            end_year = current_year + 1
-        else: # До сентября -> всё ещё предыдущий учебный год
-            start_year = current_year - 1
-            end_year = current_year
-
-        return start_year, end_year
+        start_year = current_first_half_year()
+        return start_year, start_year + 1
     
     def close_all_connections(self):
         """
         Закрывает все соединения с базой данных.
         """
-        # Закрываем соединения DAO
-        if hasattr(self, 'work_day_dao') and self.work_day_dao is not None:
-            try:
-                self.work_day_dao._connection.close()
-                print("Соединение WorkDayDAO закрыто.")
-            except Exception as e:
-                print(f"Ошибка при закрытии соединения WorkDayDAO: {e}")
-
-        if hasattr(self, 'curriculum_dao') and self.curriculum_dao is not None:
-            try:
-                self.curriculum_dao._connection.close()
-                print("Соединение CurriculumDAO закрыто.")
-            except Exception as e:
-                print(f"Ошибка при закрытии соединения CurriculumDAO: {e}")
-
-        if hasattr(self, 'group_dao') and self.group_dao is not None:
-            try:
-                self.group_dao._connection.close()
-                print("Соединение GroupDAO закрыто.")
-            except Exception as e:
-                print(f"Ошибка при закрытии соединения GroupDAO: {e}")
-        
-        if hasattr(self, 'subject_dao') and self.subject_dao is not None:
-            try:
-                self.subject_dao._connection.close()
-                print("Соединение SubjectDAO закрыто.")
-            except Exception as e:
-                print(f"Ошибка при закрытии соединения SubjectDAO: {e}")
-
+        # Все DAO работают через общие соединения - закрываем их разом
+        try:
+            connection_manager.close_all()
+            print("Соединения с базой данных закрыты.")
+        except Exception as e:
+            print(f"Ошибка при закрытии соединений с базой данных: {e}")
+
+    def flush_pending_edits(self) -> bool:
+        """Записывает накопленные правки часов в БД одной транзакцией"""
+        self.flush_timer.stop()
+        if not self.write_buffer.has_pending():
+            return True
+
+        pending_count = len(self.write_buffer)
+        dropped = self.write_buffer.flush()
+        if dropped is None:
+            # Повтор по таймеру не запускается: правки запишутся при следующем изменении часов или закрытии окна
+            self.show_error_message("Не удалось сохранить изменения часов. Они будут записаны при следующем сохранении.")
+            return False
+
+        print(f"Записано изменений часов: {pending_count - len(dropped)}")
+        if dropped:
+            print(f"Отброшены изменения часов, которые нельзя записать в БД: {dropped}")
+            lines = "\n".join(f"{date}: {group_name} / {subject_name}"
+                              for date, group_name, subject_name, _, _ in dropped[:10])
+            if len(dropped) > 10:
+                lines += f"\n... и ещё {len(dropped) - 10}"
+            self.show_error_message(f"Не сохранено изменений часов: {len(dropped)}. Группа или дисциплина "
+                                    f"не найдена в базе данных, либо база данных не приняла значение:\n{lines}")
+            # Таблицы показывают отброшенные значения - перечитываем их из БД
+            self.invalidate_semester_cache()
+        return True
+
+    def schedule_flush(self):
+        """Запускает таймер записи буфера, если он ещё не запущен"""
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def closeEvent(self, event):
+        """Перед закрытием окна записывает несохранённые правки и закрывает соединения"""
+        self.flush_pending_edits()
+        # Незавершённая выгрузка отчёта отменяется
+        if self.print_report_dialog is not None:
+            self.print_report_dialog.close()
+        # Фоновые загрузки должны завершиться до закрытия окна
+        QThreadPool.globalInstance().waitForDone()
+        self.close_all_connections()
+        super().closeEvent(event)
 
     def create_new_database(self):
         """
@@ -2043,7 +1916,6 @@ class MainWindow(ThemedWindow):
         base_path = get_base_root_path() # Это Path объект
         db_dir = base_path / "db" 
         archive_dir = base_path / "archive" 
-        base_script_path = db_dir / "base_script.sql" 
 
         db_dir.mkdir(exist_ok=True)
         archive_dir.mkdir(exist_ok=True)
@@ -2066,7 +1938,10 @@ class MainWindow(ThemedWindow):
         if existing_db_path:
             print(f"Найдена существующая база данных (текущая): {existing_db_path}")
 
-            # Закрываем все соединения перед архивацией
+            # Записываем несохранённые правки в архивируемую БД и закрываем все соединения
+            if not self.flush_pending_edits():
+                QMessageBox.critical(self, "Ошибка", "Не удалось сохранить изменения часов перед архивацией базы данных.")
+                return
             self.close_all_connections()
 
             # Сформировать имя для архива
@@ -2086,37 +1961,27 @@ class MainWindow(ThemedWindow):
 
         # 6. Создать новую базу данных и инициализировать её
         try:
-            import sqlite3
-            conn = sqlite3.connect(new_full_db_path_str)
-            cursor = conn.cursor()
-
-            with open(str(base_script_path), 'r', encoding='utf-8') as script_file:
-                init_script = script_file.read()
-
-            cursor.executescript(init_script)
-            conn.commit()
-            conn.close()
-
-            print(f"Новая база данных создана и инициализирована: {new_full_db_path_str}")
-
             update_root_path_with_db_file(new_full_db_path_str)
             print(f"ROOT_PATH и имя БД обновлены через settings.")
 
-            self.work_day_dao = WorkDayDAO(db_filename=new_db_filename)
+            # Общее соединение создаёт файл БД со схемой из base_script.sql, DAO переиспользуют его
+            if connection_manager.get_connection(new_full_db_path_str) is None:
+                raise sqlite3.Error(f"не удалось открыть {new_full_db_path_str}")
+            print(f"Новая база данных создана и инициализирована: {new_full_db_path_str}")
+
+            self.work_day_dao = create_work_day_dao(db_filename=new_db_filename)
             self.curriculum_dao = CurriculumDAO(db_filename=new_db_filename)
             self.group_dao = GroupDAO(db_filename=new_db_filename)
             self.subject_dao = SubjectDAO(db_filename=new_db_filename)
+            self.write_buffer = WorkDayWriteBuffer(self.work_day_dao)
 
             print("DAO пересозданы с новой базой данных.")
 
             QMessageBox.information(self, "Успешно", f"Новая база данных для учебного года {academic_year_str} создана:\n{new_db_filename}\n\nСтарая база данных (если была) перемещена в папку 'archive'.")
 
             # Перезагружаем данные в интерфейсе, чтобы они отображались из новой БД
-            QTimer.singleShot(0, self.load_and_display_work_days)
+            self.invalidate_semester_cache()
 
-        except FileNotFoundError:
-            print(f"Файл скрипта инициализации не найден: {base_script_path}")
-            QMessageBox.critical(self, "Ошибка", f"Файл скрипта инициализации не найден: {base_script_path}")
         except sqlite3.Error as e:
             print(f"Ошибка SQLite при создании/инициализации базы данных: {e}")
             QMessageBox.critical(self, "Ошибка", f"Ошибка SQLite при создании базы данных: {e}")
@@ -2135,126 +2000,111 @@ class MainWindow(ThemedWindow):
     def load_and_display_work_days(self):
         """Загружает данные из БД и строит таблицы для текущего полугодия/семестра."""
         # print("Загрузка данных рабочих дней и учебных планов...")
+        # Таблицы строятся из БД, поэтому сначала записываем накопленные правки
+        self.flush_pending_edits()
         try:
-            # Получить все записи из БД (для работы с ними)
-            all_work_days = self.work_day_dao.get_all_work_days()
-
             # Определить текущий семестр на основе выбранного полугодия
             current_semester = 1 if self.ui.rBtn_First.isChecked() else 2
 
-            # Получить все учебные планы для текущего семестра
-            curriculums_for_semester = self.curriculum_dao.get_curriculums_by_semester(current_semester)
-            
-            if self.current_group_filter or self.current_subject_filter:
-                filtered_curriculums = []
-                for curriculum in curriculums_for_semester:
-                    group_name = curriculum[3]
-                    subject_name = curriculum[4]
-                    # Проверяем, проходит ли запись фильтр
-                    group_ok = not self.current_group_filter or group_name in self.current_group_filter
-                    subject_ok = not self.current_subject_filter or subject_name in self.current_subject_filter
-                    if group_ok and subject_ok:
-                        filtered_curriculums.append(curriculum)
-                curriculums_for_semester = filtered_curriculums
-                print(f"После фильтрации осталось {len(curriculums_for_semester)} учебных планов.")
-
-            # Создать маппинг между метками месяцев и виджетами таблиц
-            is_first_half = self.ui.rBtn_First.isChecked()
-            current_months_data = self.first_half if is_first_half else self.second_half
-            current_year = self.first_half_year if is_first_half else self.first_half_year + 1
-
-            month_label_to_table = self.get_month_label_to_table_map() # Используем метод, определенный ниже
-            
-            table_widgets_to_load = []
-            for month_label in [label for num, label in current_months_data]:
-                table_widget = month_label_to_table.get(month_label)
-                if table_widget:
-                    table_widget.blockSignals(True) # Блокируем сигналы
-                    table_widgets_to_load.append(table_widget)
-
-            # Для каждого месяца в текущем полугодии
-            for month_num, month_label in current_months_data:
-                table_widget = month_label_to_table.get(month_label)
-                if not table_widget:
-                    continue # Пропускаем, если таблица не найдена
-
-                # Очистить таблицу перед заполнением
-                table_widget.setRowCount(0)
-                table_widget.setColumnCount(0)
-
-                # Создаем объект данных для календаря
-                calendar_data = CalendarTableData(current_year, month_num)
-                # Сохраняем mapping дат для этой таблицы
-                self.table_date_mapping[table_widget] = calendar_data.dates
-
-                # Создать список дней месяца (для шапки) - только не-воскресенья
-                day_list = [dt.strftime("%d") for dt in calendar_data.dates] # Берем из отфильтрованного списка
-
-                # Установить заголовки столбцов: Группа, Предмет, Дни месяца (без воскресений)
-                headers = ["Группа", "Предмет"] + day_list
-                table_widget.setColumnCount(len(headers))
-                table_widget.setHorizontalHeaderLabels(headers)
-
-                # Заполнить строки данными из учебных планов
-                for curriculum in curriculums_for_semester:
-                    group_name = curriculum[3]  # group_name
-                    subject_name = curriculum[4] # subject_name
-
-                    # Добавить новую строку
-                    row_position = table_widget.rowCount()
-                    table_widget.insertRow(row_position)
-
-                    item_group = QTableWidgetItem(group_name)
-                    table_widget.setItem(row_position, 0, item_group)
-
-                    item_subject = QTableWidgetItem(subject_name)
-                    table_widget.setItem(row_position, 1, item_subject)
-                    # print(f"  Добавляем строку для Группа='{group_name}', Предмет='{subject_name}' на позицию {row_position}")
-
-                    for col_index, target_date in enumerate(calendar_data.dates, start=2): # Перебираем даты, а не строки
-                        # Найти запись workDay для этой группы, предмета и даты
-                        found_hours = None
-                        for wd in all_work_days:
-                            wd_date = datetime.strptime(wd[1], "%Y-%m-%d").date()
-                            wd_subject = wd[2]
-                            wd_group = wd[3]
-                            wd_semester = wd[4]
-
-                            if (wd_group == group_name and
-                                wd_subject == subject_name and
-                                wd_date == target_date and # Сравниваем с target_date из calendar_data.dates
-                                wd_semester == current_semester):
-                                found_hours = wd[5]
-                                break
-
-                        item_hours = QTableWidgetItem(str(found_hours) if found_hours is not None else "")
-                        table_widget.setItem(row_position, col_index, item_hours)
-
-                # После заполнения всех строк обновить размеры
-                table_widget.resizeColumnsToContents()
-                table_widget.resizeRowsToContents()
-            
-            for table_widget in table_widgets_to_load:
-                table_widget.blockSignals(False) # Разблокируем сигналы
+            # Данные семестра берём из кэша (в т.ч. подгруженные в фоне), иначе читаем из БД
+            cached = self.semester_cache.get(current_semester)
+            if cached is None:
+                cached = load_semester_grid(self.work_day_dao, self.curriculum_dao, current_semester,
+                                            self.current_group_filter, self.current_subject_filter)
+                self.semester_cache[current_semester] = cached
+
+            # Индекс часов общий для всех таблиц месяцев, правки обновляют его на месте - кэш остаётся актуальным
+            self.hours_index, self.table_rows = cached
+
+            # Построенные ранее таблицы устарели - очищаем их, строиться они будут при первом показе вкладки
+            self.materialized_tables = set()
+            for table_widget in self.get_month_label_to_table_map().values():
+                table_widget.model().clear()
 
         except Exception as e:
             print(f"Ошибка при загрузке данных: {e}")
             return
 
-        # После загрузки всех данных обновите размеры таблиц
-        self.update_table_sizes()
+        # Сразу строим только таблицу открытой вкладки
+        self.materialize_current_table()
+        # Пока пользователь работает с этим полугодием, загружаем другое
+        self.prefetch_other_semester(current_semester)
         # print("Данные успешно загружены и отображены.")
-        
-    def add_record_to_table(self, table_widget, record):
-        """Добавляет одну запись в указанную таблицу."""
-        # record - это кортеж (id, date, subject_name, group_name, semester, hours)
-        row_position = table_widget.rowCount()
-        table_widget.insertRow(row_position)
-        
-        # Заполняем ячейки данными из кортежа
-        for col_index, data in enumerate(record):
-            item = QTableWidgetItem(str(data)) # Преобразуем всё к строке для простоты
-            table_widget.setItem(row_position, col_index, item)
+
+    def schedule_grid_reload(self):
+        """Перезагружает таблицы после возврата в цикл событий; повторные запросы до этого схлопываются"""
+        self.reload_timer.start()
+
+    def invalidate_semester_cache(self):
+        """
+        Сбрасывает загруженные данные семестров (смена фильтров, БД, справочников или учебных планов)
+        и перезагружает таблицы: построенные таблицы вкладок показывают данные сброшенного кэша
+        """
+        self.semester_cache = {}
+        self.semester_cache_generation += 1
+        self.schedule_grid_reload()
+
+    def prefetch_other_semester(self, current_semester):
+        """Запускает фоновую загрузку другого семестра, если его ещё нет в кэше"""
+        other_semester = 2 if current_semester == 1 else 1
+        if other_semester in self.semester_cache:
+            return
+
+        # Фоновая задача читает БД своим соединением, поэтому правки должны быть уже записаны
+        self.flush_pending_edits()
+        self.prefetch_task = SemesterPrefetchTask(
+            self.work_day_dao.get_db_path(),
+            other_semester,
+            self.current_group_filter,
+            self.current_subject_filter,
+            self.semester_cache_generation
+        )
+        self.prefetch_task.signals.finished.connect(self.on_semester_prefetched)
+        QThreadPool.globalInstance().start(self.prefetch_task)
+
+    def on_semester_prefetched(self, generation, semester, hours_index, rows):
+        """Сохраняет в кэш семестр, загруженный в фоне"""
+        # Пока задача работала, кэш могли сбросить или семестр уже загрузили на переднем плане
+        if generation != self.semester_cache_generation or semester in self.semester_cache:
+            return
+        self.semester_cache[semester] = (hours_index, rows)
+        print(f"Семестр {semester} загружен в фоне: {len(rows)} учебных планов.")
+
+    def materialize_month_table(self, table_widget):
+        """
+        Строит таблицу месяца из индекса часов семестра, если она ещё не построена.
+        Построенная таблица кэшируется до следующей загрузки данных (правки, фильтры, смена БД):
+        правки пишутся прямо в её модель, поэтому перестраивать её при переключении вкладок не нужно.
+        """
+        if table_widget is None or table_widget in self.materialized_tables or self.hours_index is None:
+            return
+
+        model = table_widget.model()
+        # Дни месяца уже выставлены в модели при настройке полугодия
+        model.set_store(MonthHoursStore(self.table_rows, model.store.dates, self.hours_index))
+        self.materialized_tables.add(table_widget)
+
+        # Строка поиска действует и на вкладки, построенные после поиска
+        search_text = self.ui.line_Search.text().strip().lower()
+        if search_text:
+            self.filter_table_rows(table_widget, search_text)
+
+        self.fit_table_to_contents(table_widget)
+
+    def fit_table_to_contents(self, table_widget):
+        """
+        Подгоняет ширину столбцов группы и предмета под содержимое.
+        Столбцы дней растягиваются заголовком, а строки однострочные, поэтому их не пересчитываем:
+        полный пересчёт обходит каждую ячейку таблицы и заметно тормозит на больших таблицах
+        """
+        for col in range(min(NAME_COLUMNS, table_widget.model().columnCount())):
+            table_widget.resizeColumnToContents(col)
+        table_widget.updateGeometry()
+
+    def materialize_current_table(self):
+        """Строит таблицу открытой вкладки, если она ещё не построена"""
+        current_tab = self.ui.tabW_SlidesFirstHalf.currentWidget()
+        self.materialize_month_table(self.get_table_widget_for_tab(current_tab))
 
     def clear_all_tables(self):
         """Очищает все таблицы."""
@@ -2267,7 +2117,7 @@ class MainWindow(ThemedWindow):
             self.ui.tableV_hours_6,
         ]
         for table_widget in table_widgets:
-            table_widget.setRowCount(0)
+            table_widget.model().clear()
         # print("Все таблицы очищены.")
         
     def get_half_year_date_range(self, is_first_half: bool = True):
@@ -2331,6 +2181,12 @@ class MainWindow(ThemedWindow):
     @pyqtSlot()
     def on_half_changed(self):
         """Общий обработчик изменения полугодия"""
+        # Правки прошлого полугодия записываем до перестроения таблиц
+        self.flush_pending_edits()
+        # Данные прошлого полугодия не должны попасть в таблицы нового до его загрузки
+        self.hours_index = None
+        self.materialized_tables = set()
+
         if self.ui.rBtn_First.isChecked():
             setup_calendar_tables_for_half(self.ui, year=self.first_half_year, months_data=self.first_half)
         elif self.ui.rBtn_Second.isChecked():
@@ -2341,20 +2197,12 @@ class MainWindow(ThemedWindow):
         self.update_table_sizes()
         self.ui.line_Search.clear()
         
-        QTimer.singleShot(0, self.load_and_display_work_days)
+        self.schedule_grid_reload()
 
     def on_tab_changed(self, index):
         """Вызывается при переключении вкладки"""
-        # Обновляем размеры только для текущей вкладки
-        current_tab = self.ui.tabW_SlidesFirstHalf.currentWidget()
-        # Find the specific table widget for the current tab
-        table_widget = self.get_table_widget_for_tab(current_tab)
-        if table_widget:
-            table_widget.resizeColumnsToContents()
-            table_widget.resizeRowsToContents()
-            table_widget.updateGeometry()
-        
-        QTimer.singleShot(0, self.load_and_display_work_days)
+        # Таблица вкладки строится при первом показе, дальше берётся уже построенная
+        self.materialize_current_table()
 
     def get_table_widget_for_tab(self, tab):
         """Helper function to get the table widget for a given tab."""
@@ -2370,7 +2218,8 @@ class MainWindow(ThemedWindow):
         return tab_to_table.get(tab)
     
     def on_search_clicked(self):
-        """Обработчик нажатия кнопки поиска."""
+        """Обработчик нажатия кнопки поиска и паузы при вводе в строку поиска."""
+        self.search_timer.stop()
         search_text = self.ui.line_Search.text().strip().lower() 
         print(f"Поиск по запросу: '{search_text}'")
         self.apply_search_filter(search_text)
@@ -2396,7 +2245,7 @@ class MainWindow(ThemedWindow):
             }
 
     def update_table_sizes(self):
-        """Обновляет размеры всех QTableWidget в виджетах вкладок"""
+        """Обновляет ширину столбцов названий во всех таблицах месяцев (QTableView) на вкладках"""
         # Список всех table widgets
         table_widgets = [
             self.ui.tableV_hours_1,
@@ -2408,9 +2257,7 @@ class MainWindow(ThemedWindow):
         ]
 
         for table_widget in table_widgets:
-            table_widget.resizeColumnsToContents()
-            table_widget.resizeRowsToContents()
-            table_widget.updateGeometry()
+            self.fit_table_to_contents(table_widget)
             
     def apply_search_filter(self, search_text: str):
         """
@@ -2430,39 +2277,24 @@ class MainWindow(ThemedWindow):
             if not table_widget:
                 continue
 
-            # Проходим по всем строкам в таблице
-            for row in range(table_widget.rowCount()):
-                # Получаем данные из первых двух столбцов (Группа, Предмет)
-                item_group = table_widget.item(row, 0)
-                item_subject = table_widget.item(row, 1)
-
-                group_text = item_group.text().lower() if item_group else ""
-                subject_text = item_subject.text().lower() if item_subject else ""
-
-                # Поиск по группе или предмету
-                if search_text in group_text or search_text in subject_text:
-                    table_widget.showRow(row) # Показываем строку, если совпадение найдено
-                    continue # Переходим к следующей строке
-
-                # Поиск по часам (данные в столбцах с 2 и далее)
-                found_in_hours = False
-                for col in range(2, table_widget.columnCount()):
-                    item_hours = table_widget.item(row, col)
-                    if item_hours:
-                        hours_text = item_hours.text().lower()
-                        if search_text in hours_text:
-                             found_in_hours = True
-                             break # Нашли совпадение в одном из столбцов часов, выходим из цикла по столбцам
-
-                if found_in_hours:
-                    table_widget.showRow(row) # Показываем строку, если совпадение найдено в часах
-                else:
-                    table_widget.hideRow(row) # Скрываем строку, если совпадений не найдено
-
-        self.update_table_sizes()
+            # Непостроенные таблицы отфильтруются при первом показе
+            if table_widget in self.materialized_tables:
+                self.filter_table_rows(table_widget, search_text)
             
+    def filter_table_rows(self, table_widget, search_text):
+        """Скрывает строки таблицы, в которых нет search_text (по группе, предмету или часам)"""
+        # Совпадения ищутся по поисковому индексу модели, уточняя прошлый результат, если запрос его продолжает
+        store = table_widget.model().store
+        matches = store.match_rows(search_text)
+
+        # Меняем видимость только тех строк, у которых она действительно меняется
+        for row in range(store.row_count()):
+            hidden = row not in matches
+            if table_widget.isRowHidden(row) != hidden:
+                table_widget.setRowHidden(row, hidden)
+
     def setup_table_connections(self):
-        """Подключает сигнал cellChanged ко всем таблицам."""
+        """Подключает сигналы моделей и массовые операции ко всем таблицам."""
         table_widgets = [
             self.ui.tableV_hours_1,
             self.ui.tableV_hours_4,
@@ -2473,120 +2305,153 @@ class MainWindow(ThemedWindow):
         ]
 
         for table_widget in table_widgets:
-            # Подключаем сигнал к общему обработчику
-            table_widget.cellChanged.connect(self.on_cell_changed)
-    
-    def on_cell_changed(self, row, col):
-        """Обработчик изменения ячейки в любой таблице."""
-        sender = self.sender() # Получаем QTableWidget, который вызвал сигнал
-
-        if not isinstance(sender, QTableWidget):
-            # print(f"on_cell_changed вызван не для QTableWidget, а для {type(sender)}. Игнорируем.")
+            # Подключаем сигналы модели к общим обработчикам
+            table_widget.model().hours_edited.connect(self.on_hours_edited)
+            table_widget.model().invalid_value.connect(self.show_error_message)
+
+            # Массовые операции: вставка блока из буфера обмена и заполнение диапазона
+            QShortcut(QKeySequence.StandardKey.Paste, table_widget,
+                      lambda tw=table_widget: self.paste_into_table(tw))
+            QShortcut(QKeySequence("Ctrl+D"), table_widget, lambda tw=table_widget: self.fill_table_range(tw, down=True))
+            QShortcut(QKeySequence("Ctrl+R"), table_widget, lambda tw=table_widget: self.fill_table_range(tw, down=False))
+
+            table_widget.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
+            table_widget.customContextMenuRequested.connect(
+                lambda pos, tw=table_widget: self.open_table_context_menu(pos, tw))
+
+    def open_table_context_menu(self, position, table_widget):
+        """Контекстное меню таблицы часов с массовыми операциями."""
+        menu = QMenu(table_widget)
+        paste_action = menu.addAction("Вставить (Ctrl+V)")
+        fill_down_action = menu.addAction("Заполнить вниз (Ctrl+D)")
+        fill_right_action = menu.addAction("Заполнить вправо (Ctrl+R)")
+
+        paste_action.triggered.connect(lambda: self.paste_into_table(table_widget))
+        fill_down_action.triggered.connect(lambda: self.fill_table_range(table_widget, down=True))
+        fill_right_action.triggered.connect(lambda: self.fill_table_range(table_widget, down=False))
+
+        menu.exec(table_widget.viewport().mapToGlobal(position))
+
+    def paste_into_table(self, table_widget):
+        """
+        Вставляет блок часов из буфера обмена (строки через перевод строки, столбцы через табуляцию).
+        Блок вставляется от левой верхней выделенной ячейки. Одно значение заполняет всё выделение.
+        Строки, скрытые поиском, пропускаются: строки блока ложатся на видимые строки таблицы подряд.
+        """
+        text = QApplication.clipboard().text()
+        if not text:
             return
 
-        if col < 2:
-            return
+        block = [line.split("\t") for line in text.rstrip("\r\n").replace("\r\n", "\n").split("\n")]
 
-        # Получаем текст из ячейки
-        item = sender.item(row, col)
-        if item is None:
-            new_text = ""
+        selected_ranges = list(table_widget.selectionModel().selection())
+        current_index = table_widget.currentIndex()
+        if selected_ranges:
+            top = min(r.top() for r in selected_ranges)
+            left = min(r.left() for r in selected_ranges)
+        elif current_index.isValid():
+            top, left = current_index.row(), current_index.column()
         else:
-            new_text = item.text().strip()
-
-        # Получаем список дат для текущей таблицы
-        if sender not in self.table_date_mapping:
-            # print("Ошибка: Не найдены даты для таблицы.")
-            self.show_error_message("Произошла ошибка при обработке данных.")
             return
 
-        filtered_dates = self.table_date_mapping[sender]
-        date_index = col - 2
-        if date_index < 0 or date_index >= len(filtered_dates):
-            #  print(f"Ошибка: Индекс столбца {col} вне диапазона отфильтрованных дат.")
-             self.show_error_message("Произошла ошибка при обработке данных.")
-             return
+        cells = {}
+        if len(block) == 1 and len(block[0]) == 1 and selected_ranges:
+            # Одно значение - заполняем им все выделенные ячейки
+            for selected_range in selected_ranges:
+                for row in range(selected_range.top(), selected_range.bottom() + 1):
+                    if table_widget.isRowHidden(row):
+                        continue
+                    for col in range(selected_range.left(), selected_range.right() + 1):
+                        cells[(row, col)] = block[0][0]
+        else:
+            row_count = table_widget.model().rowCount()
+            visible_rows = [row for row in range(top, row_count) if not table_widget.isRowHidden(row)]
+            if len(visible_rows) < len(block):
+                self.show_error_message("Вставляемый блок выходит за границы таблицы.")
+                return
+            for row, values in zip(visible_rows, block):
+                for col_offset, value in enumerate(values):
+                    cells[(row, left + col_offset)] = value
 
-        target_date = filtered_dates[date_index]
+        self.apply_cells_block(table_widget, cells)
 
-        # Определяем семестр
-        is_first_half = self.ui.rBtn_First.isChecked()
-        current_semester = 1 if is_first_half else 2
+    def fill_table_range(self, table_widget, down=True):
+        """
+        Заполняет выделенные диапазоны значением первой строки (down=True) или первого столбца (down=False).
+        Строки, скрытые поиском, пропускаются.
+        """
+        model = table_widget.model()
+        cells = {}
+        for selected_range in table_widget.selectionModel().selection():
+            rows = [row for row in range(selected_range.top(), selected_range.bottom() + 1)
+                    if not table_widget.isRowHidden(row)]
+            cols = list(range(selected_range.left(), selected_range.right() + 1))
+            if not rows:
+                continue
+
+            for row in rows:
+                for col in cols:
+                    source_row, source_col = (rows[0], col) if down else (row, cols[0])
+                    if (row, col) == (source_row, source_col):
+                        continue
+                    cells[(row, col)] = model.data(model.index(source_row, source_col)) or ""
 
-        # Получаем группу и предмет из строки
-        item_group = sender.item(row, 0)
-        item_subject = sender.item(row, 1)
+        self.apply_cells_block(table_widget, cells)
 
-        # Проверяем, существуют ли ячейки и содержат ли они непустой текст
-        if item_group is None or item_subject is None:
+    def apply_cells_block(self, table_widget, cells):
+        """
+        Проверяет и записывает блок значений часов {(row, col): text}.
+        Блок проверяется целиком: при любой ошибке ничего не записывается.
+        Модель обновляется одним изменением, запись в БД - одна транзакция.
+        """
+        if not cells:
             return
 
-        group_name = item_group.text().strip()
-        subject_name = item_subject.text().strip()
+        model = table_widget.model()
 
-        if not group_name or not subject_name:
-            return
+        # Проверяем весь блок до записи
+        block = {}
+        for (row, col), text in cells.items():
+            if row >= model.rowCount() or col >= model.columnCount():
+                self.show_error_message("Вставляемый блок выходит за границы таблицы.")
+                return
+            if col < NAME_COLUMNS:
+                self.show_error_message("Вставлять и заполнять можно только ячейки с часами.")
+                return
 
-        # Валидация числового значения
-        if new_text == "":
             try:
-                existing_records = self.work_day_dao.get_work_days_by_date(target_date)
-                for record in existing_records:
-                    if record[3] == group_name and record[2] == subject_name and record[4] == current_semester:
-                        self.work_day_dao.delete_work_day(record[0])
-                        break
-            except Exception as e:
-                self.show_error_message(f"Ошибка при удалении данных: {e}")
-            return # Завершаем обработку, если значение пустое
+                block[(row, col)] = parse_hours(text)
+            except ValueError:
+                self.show_error_message(f"Значение '{text.strip()}' в строке {row + 1} должно быть числом (часы).")
+                return
 
-        try:
-            hours_float = float(new_text) # Позволим вводить дробные числа
-            if hours_float < 0:
-                raise ValueError("Часы не могут быть отрицательными.")
-        except ValueError:
-            # Значение не является числом или отрицательное
-            item.setText("") 
-            self.show_error_message("Значение должно быть числом (часы).")
-            return
-        
-        try:
-            # Проверим, существует ли уже запись для этой даты, группы, предмета и семестра
-            existing_records = self.work_day_dao.get_work_days_by_date(target_date)
-            found_existing = False
-            for record in existing_records:
-                if record[3] == group_name and record[2] == subject_name and record[4] == current_semester:
-                    # Обновляем существующую запись
-                    updated_record = self.work_day_dao.update_work_day(
-                        record[0], # id
-                        date=target_date.isoformat(),
-                        subject_name=subject_name,
-                        group_name=group_name,
-                        semester=current_semester,
-                        hours=hours_float
-                    )
-                    if updated_record:
-                        print(f"Обновлена запись: {updated_record}")
-                    else:
-                        print(f"Не удалось обновить запись с id {record[0]}")
-                    found_existing = True
-                    break
-
-            if not found_existing:
-                # Вставляем новую запись
-                new_record = self.work_day_dao.create_work_day(
-                    date=target_date.isoformat(),
-                    subject_name=subject_name,
-                    group_name=group_name,
-                    semester=current_semester,
-                    hours=hours_float
-                )
-                if new_record:
-                    print(f"Создана новая запись: {new_record}")
+        # Изменения попадают в буфер через on_hours_edited, весь блок уходит в БД одной транзакцией
+        model.set_block(block)
+        self.flush_pending_edits()
+
+    def on_hours_edited(self, changes):
+        """
+        Обработчик изменения часов в модели любой таблицы.
+        :parameter changes: Список (group_name, subject_name, date, hours), hours=None - часы удалены
+        """
+        # Определяем семестр
+        current_semester = 1 if self.ui.rBtn_First.isChecked() else 2
+
+        for group_name, subject_name, target_date, hours in changes:
+            # Повторные правки той же ячейки схлопываются в буфере, в БД уходит последнее значение
+            if hours is None:
+                self.write_buffer.delete_hours(target_date, group_name, subject_name, current_semester)
+            else:
+                self.write_buffer.set_hours(target_date, group_name, subject_name, current_semester, hours)
+
+            # Поддерживаем индекс часов в актуальном состоянии
+            if self.hours_index is not None:
+                if hours is None:
+                    self.hours_index.remove(group_name, subject_name, target_date)
                 else:
-                    print("Не удалось создать новую запись.")
-        except Exception as e:
-            print(f"Ошибка при обновлении/вставке записи в БД: {e}")
-            self.show_error_message(f"Ошибка при сохранении данных: {e}")
+                    self.hours_index.set(group_name, subject_name, target_date, hours)
+
+        self.schedule_flush()
 
     def show_error_message(self, message):
         """Показывает окно с сообщением об ошибке."""
@@ -2601,6 +2466,7 @@ class MainWindow(ThemedWindow):
         # Сброс фильтров по группам и предметам
         self.current_group_filter = set()
         self.current_subject_filter = set()
+        self.invalidate_semester_cache()
 
         # Сброс строки поиска
         self.ui.line_Search.clear()
@@ -2640,7 +2506,7 @@ class MainWindow(ThemedWindow):
             self.current_subject_filter = dialog.selected_subjects.copy()
             print(f"Фильтры обновлены в MainWindow: Группы={self.current_group_filter}, Предметы={self.current_subject_filter}")
             # Перезагружаем данные с учетом фильтров
-            QTimer.singleShot(0, self.load_and_display_work_days)
+            self.invalidate_semester_cache()
         # Если пользователь нажал "Отменить", фильтры остаются неизменными
         
     def get_report_data(self):
@@ -2648,51 +2514,18 @@ class MainWindow(ThemedWindow):
         Подготавливает данные для отчёта: (group_name, subject_name, total_hour_plan, sum_of_hours_done).
         Учитывает текущие фильтры по группам и предметам.
         """
+        # Сводка считается по данным БД - записываем накопленные правки
+        self.flush_pending_edits()
+
         # Определить текущий семестр
         current_semester = 1 if self.ui.rBtn_First.isChecked() else 2
 
-        # Получить все учебные планы для текущего семестра
-        curriculums_for_semester = self.curriculum_dao.get_curriculums_by_semester(current_semester)
-
-        # Фильтруем учебные планы по текущим фильтрам
-        if self.current_group_filter or self.current_subject_filter:
-            filtered_curriculums = []
-            for curriculum in curriculums_for_semester:
-                group_name = curriculum[3]
-                subject_name = curriculum[4]
-                group_ok = not self.current_group_filter or group_name in self.current_group_filter
-                subject_ok = not self.current_subject_filter or subject_name in self.current_subject_filter
-                if group_ok and subject_ok:
-                    filtered_curriculums.append(curriculum)
-            curriculums_for_semester = filtered_curriculums
-
-        all_work_days = self.work_day_dao.get_all_work_days()
-
-        # Подготовить итоговый список
-        report_data = []
-
-        for curriculum in curriculums_for_semester:
-            # curriculum - это (id, semester, total_hour, group_name, subject_name)
-            curriculum_id = curriculum[0]
-            semester = curriculum[1]
-            total_hour = curriculum[2]
-            group_name = curriculum[3]
-            subject_name = curriculum[4]
-
-            # Суммируем часы для этой группы и предмета в этом семестре
-            sum_of_hours = 0
-            for work_day in all_work_days:
-                # work_day - это (id, date_str, subject_name, group_name, semester, hours)
-                wd_subject = work_day[2]
-                wd_group = work_day[3]
-                wd_semester = work_day[4]
-                wd_hours = work_day[5]
-
-                if (wd_group == group_name and wd_subject == subject_name and
-                    wd_semester == current_semester):
-                    sum_of_hours += wd_hours
-
-            report_data.append((group_name, subject_name, total_hour, sum_of_hours))
+        # Сводка считается в БД одним запросом, фильтры по группам и предметам тоже применяются в SQL
+        report_data = self.curriculum_dao.get_semester_report(
+            current_semester,
+            group_names=self.current_group_filter,
+            subject_names=self.current_subject_filter
+        )
 
         return report_data
 
@@ -2707,20 +2540,44 @@ class MainWindow(ThemedWindow):
         dialog.exec()
 
     def open_group_dialog(self):
+        # Правки в буфере ссылаются на группы по названию: записываем их до переименований в окне
+        self.flush_pending_edits()
         dialog = GroupDialog(self.theme_manager, self.group_dao)
         dialog.exec()
+        # Группы изменились - загруженные семестры больше не актуальны, таблицы перезагружаются.
+        # Окно, ничего не изменившее в БД, перезагрузки не требует
+        if dialog.changed:
+            self.invalidate_semester_cache()
 
     def open_subject_dialog(self):
+        # Правки в буфере ссылаются на предметы по названию: записываем их до переименований в окне
+        self.flush_pending_edits()
         dialog = SubjectDialog(self.theme_manager, self.subject_dao) 
         dialog.exec()
+        # Предметы изменились - загруженные семестры больше не актуальны, таблицы перезагружаются.
+        # Окно, ничего не изменившее в БД, перезагрузки не требует
+        if dialog.changed:
+            self.invalidate_semester_cache()
         
     def open_print_report(self):
-        dialog = PrintReportDialog(self.theme_manager)
-        dialog.exec()
+        # Окно немодальное: пока выгружается отчёт, с главным окном можно работать
+        if self.print_report_dialog is not None and self.print_report_dialog.isVisible():
+            self.print_report_dialog.raise_()
+            self.print_report_dialog.activateWindow()
+            return
+
+        self.print_report_dialog = PrintReportDialog(self.theme_manager, self.flush_pending_edits)
+        self.print_report_dialog.show()
         
     def open_new_year_dialog(self):
+        # Несохранённые часы записываем до изменения планов: после него таблицы перечитываются из БД
+        self.flush_pending_edits()
         dialog = YearEditDialog(self.theme_manager, self.group_dao, self.subject_dao, self.curriculum_dao) 
         dialog.exec()
+        # Учебные планы изменились - загруженные семестры больше не актуальны, таблицы перезагружаются.
+        # Окно, ничего не изменившее в БД, перезагрузки не требует
+        if dialog.changed:
+            self.invalidate_semester_cache()
         
 
 if __name__ == '__main__':
@@ -2729,6 +2586,13 @@ if __name__ == '__main__':
     # Create themeManager
     theme_manager = ThemeManager()
 
+    # БД, которую не удалось открыть или мигрировать, не используется - без неё окно работать не может
+    current_db_path = get_full_db_path(get_current_db_filename())
+    if connection_manager.get_connection(current_db_path) is None:
+        QMessageBox.critical(None, "Ошибка", f"Не удалось открыть базу данных:\n{current_db_path}\n\n"
+                                             "Подробности выведены в консоль.")
+        sys.exit(1)
+
     # Create MainWindow
     window = MainWindow(theme_manager)
     window.show()
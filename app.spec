@@ -14,6 +14,8 @@ a = Analysis(
         ('themes', 'themes'),
         ('ui', 'ui'),
         ('calendar_helper.py', '.'),
+        ('hours_table_model.py', '.'),
+        ('background_tasks.py', '.'),
     ],
     hiddenimports=[],
     hookspath=[],
@@ -0,0 +1,124 @@
+import os
+import tempfile
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from services.curriculum_services import CurriculumDAO
+from services.general import open_connection
+from services.hours_index import load_semester_grid
+from services.month_report import CSV_DELIMITERS, write_month_report, write_month_report_csv
+from services.packed_work_day_services import create_work_day_dao
+
+
+class SemesterPrefetchSignals(QObject):
+    # (generation, semester, hours_index, rows)
+    finished = pyqtSignal(int, int, object, list)
+
+
+class SemesterPrefetchTask(QRunnable):
+    """
+    Загружает данные таблиц семестра в фоновом потоке.
+    Работает через своё соединение только для чтения: общее соединение принадлежит потоку интерфейса
+    """
+    def __init__(self, db_path, semester, group_names, subject_names, generation):
+        super().__init__()
+        self.db_path = db_path
+        self.semester = semester
+        # Копии фильтров - окно может поменять их, пока задача выполняется
+        self.group_names = set(group_names)
+        self.subject_names = set(subject_names)
+        # Номер загрузки, по которому окно отбрасывает устаревшие результаты
+        self.generation = generation
+        self.signals = SemesterPrefetchSignals()
+
+    def run(self):
+        connection = open_connection(self.db_path, readonly=True)
+        if connection is None:
+            return
+
+        try:
+            work_day_dao = create_work_day_dao(db_filename=self.db_path, connection=connection)
+            curriculum_dao = CurriculumDAO(db_filename=self.db_path, connection=connection)
+            hours_index, rows = load_semester_grid(work_day_dao, curriculum_dao, self.semester,
+                                                   self.group_names, self.subject_names)
+        except Exception as e:
+            print(f"Ошибка при фоновой загрузке семестра {self.semester}: {e}")
+            return
+        finally:
+            connection.close()
+
+        self.signals.finished.emit(self.generation, self.semester, hours_index, rows)
+
+
+class ExcelReportSignals(QObject):
+    # (записано месяцев, всего месяцев, название месяца)
+    progress = pyqtSignal(int, int, str)
+    # Путь к сохранённому отчёту
+    finished = pyqtSignal(str)
+    # Текст ошибки
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ExcelReportTask(QRunnable):
+    """
+    Формирует отчёт по месяцам в фоновом потоке через своё соединение только для чтения.
+    Формат выбирается по расширению файла: .csv и .tsv - текстовая выгрузка, иначе книга Excel.
+    Отчёт пишется во временный файл рядом с целевым и заменяет его только после успешной записи
+    """
+    def __init__(self, db_path, file_path, first_half_year, month_titles):
+        """
+        :parameter month_titles: Список (month_name, year_title, caption), см. write_month_report
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.file_path = file_path
+        self.first_half_year = first_half_year
+        self.month_titles = list(month_titles)
+        self.signals = ExcelReportSignals()
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Просит задачу остановиться после текущего месяца"""
+        self._cancel_requested = True
+
+    def on_month_written(self, written, month_name):
+        self.signals.progress.emit(written, len(self.month_titles), month_name)
+        return not self._cancel_requested
+
+    def run(self):
+        connection = open_connection(self.db_path, readonly=True)
+        if connection is None:
+            self.signals.failed.emit("Не удалось открыть базу данных для чтения.")
+            return
+
+        # Временный файл в той же папке: os.replace тогда атомарно подменяет отчёт
+        target_dir = os.path.dirname(os.path.abspath(self.file_path))
+        extension = os.path.splitext(self.file_path)[1].lower()
+        temp_fd, temp_path = tempfile.mkstemp(suffix=extension, dir=target_dir)
+        os.close(temp_fd)
+        try:
+            work_day_dao = create_work_day_dao(db_filename=self.db_path, connection=connection)
+            curriculum_dao = CurriculumDAO(db_filename=self.db_path, connection=connection)
+            if extension in CSV_DELIMITERS:
+                written = write_month_report_csv(temp_path, work_day_dao, curriculum_dao, self.first_half_year,
+                                                 self.month_titles, CSV_DELIMITERS[extension], self.on_month_written)
+            else:
+                written = write_month_report(temp_path, work_day_dao, curriculum_dao, self.first_half_year,
+                                             self.month_titles, self.on_month_written)
+            if not written:
+                os.remove(temp_path)
+                self.signals.cancelled.emit()
+                return
+
+            os.replace(temp_path, self.file_path)
+        except Exception as e:
+            print(f"Ошибка при формировании отчёта {self.file_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            connection.close()
+
+        self.signals.finished.emit(self.file_path)
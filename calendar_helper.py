@@ -1,8 +1,9 @@
 import calendar
-from PyQt6.QtWidgets import QTableWidgetItem, QTableWidget, QHeaderView
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QHeaderView
 from datetime import date
 
+from services.hours_index import MonthHoursStore
+
 
 class CalendarTableData:
     def __init__(self, year: int, month: int):
@@ -54,22 +55,9 @@ def setup_calendar_tables_for_half(ui, year: int, months_data: list):
             continue  # Пропускаем если индекс больше доступных таблиц
 
         if table_widget:
-            # Устанавливаем количество строк и колонок
-            table_widget.setRowCount(1)
+            # Пустая таблица месяца: в шапке дни без воскресений, строки появятся при загрузке данных
+            table_widget.model().set_store(MonthHoursStore([], calendar_data.dates))
             col_count = len(calendar_data.dates) + 2
-            table_widget.setColumnCount(col_count)
-
-            # Заполняем шапку таблицы (заголовки столбцов)
-            headers = ["Группа", "Предмет"] + [dt.strftime("%d") for dt in calendar_data.dates]
-            for col in range(col_count):
-                header_item = QTableWidgetItem(headers[col])
-                table_widget.setHorizontalHeaderItem(col, header_item)
-
-            # Заполняем ячейки данными
-            for col in range(col_count):
-                item = QTableWidgetItem(calendar_data.data_values[col])
-                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)  # Делаем редактируемыми
-                table_widget.setItem(0, col, item)
 
             # Устанавливаем фиксированную ширину для первых двух колонок
             for col in range(min(2, col_count)):
@@ -0,0 +1,224 @@
+"""
+Формирование отчётов без графического интерфейса (PyQt6 не импортируется).
+
+Примеры:
+    python cli.py summary db/hour_track.db --semester 1 --output-dir reports
+    python cli.py months db/*.db --all --year 2025 --format csv --output-dir reports
+    python cli.py months db/hour_track.db --all --year 2020 --to-year 2025 --format tsv --output-dir reports
+    python cli.py batch db/hour_track.db --all --by group --output-dir reports
+    python cli.py import db/hour_track.db hours.xlsx --rejected rejected.csv
+    python cli.py storage db/archive_2023.db --format packed
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from services.batch_export import PARTITION_COLUMNS, export_partitioned_reports
+from services.curriculum_services import CurriculumDAO
+from services.general import connection_manager
+from services.group_services import GroupDAO
+from services.hours_import import import_hours, write_rejected_rows_csv
+from services.month_report import (ACADEMIC_YEAR_MONTHS, CSV_DELIMITERS, MONTH_NUMBERS, build_month_titles,
+                                   current_first_half_year, write_month_report, write_years_report_csv)
+from services.packed_work_day_services import PackedWorkDayDAO, create_work_day_dao
+from services.subject_services import SubjectDAO
+from services.summary_report import build_semester_summary, write_summary_csv, write_summary_xlsx
+
+
+def selected_month_names(args):
+    """Месяцы из командной строки в порядке учебного года независимо от порядка в командной строке"""
+    return ACADEMIC_YEAR_MONTHS if args.all else [m for m in ACADEMIC_YEAR_MONTHS if m in args.months]
+
+
+def selected_month_titles(args):
+    """Заголовки таблиц для месяцев из командной строки"""
+    return build_month_titles(args.year, selected_month_names(args))
+
+
+def export_summary(db_path, args):
+    """Сводка по семестру для одного файла БД. Возвращает путь к записанному файлу"""
+    curriculum_dao = CurriculumDAO(db_filename=db_path)
+    summary_rows = build_semester_summary(curriculum_dao, args.semester, args.groups, args.subjects)
+
+    file_path = os.path.join(args.output_dir, f"{Path(db_path).stem}_semester{args.semester}.{args.format}")
+    if args.format == "xlsx":
+        write_summary_xlsx(file_path, summary_rows)
+    else:
+        write_summary_csv(file_path, summary_rows)
+    return file_path
+
+
+def export_months(db_path, args):
+    """Отчёт по месяцам для одного файла БД. Возвращает путь к записанному файлу"""
+    work_day_dao = create_work_day_dao(db_filename=db_path)
+    curriculum_dao = CurriculumDAO(db_filename=db_path)
+
+    file_path = os.path.join(args.output_dir, f"{Path(db_path).stem}_months.{args.format}")
+    if args.format == "xlsx":
+        write_month_report(file_path, work_day_dao, curriculum_dao, args.year, selected_month_titles(args))
+    else:
+        # Текстовая выгрузка пишется построчно из курсора и может охватывать несколько учебных лет
+        first_half_years = range(args.year, (args.to_year or args.year) + 1)
+        write_years_report_csv(file_path, work_day_dao, curriculum_dao, first_half_years,
+                               selected_month_names(args), CSV_DELIMITERS[f".{args.format}"])
+    return file_path
+
+
+def export_batch(db_path, args):
+    """Отдельные отчёты по группам или дисциплинам для одного файла БД. Возвращает путь к манифесту"""
+    work_day_dao = create_work_day_dao(db_filename=db_path)
+    curriculum_dao = CurriculumDAO(db_filename=db_path)
+
+    # Отчёты каждой БД - в своём каталоге, чтобы одноимённые группы разных БД не перезаписывали друг друга
+    output_dir = os.path.join(args.output_dir, Path(db_path).stem)
+    return export_partitioned_reports(work_day_dao, curriculum_dao, args.year, selected_month_titles(args),
+                                      output_dir, args.by, args.workers)
+
+
+def import_file(db_path, args):
+    """
+    Импорт часов из файла в одну БД. Возвращает путь к отчёту об отклонённых строках
+    или None, если отклонённых строк нет
+    """
+    result = import_hours(args.file, create_work_day_dao(db_filename=db_path), GroupDAO(db_filename=db_path),
+                          SubjectDAO(db_filename=db_path), CurriculumDAO(db_filename=db_path))
+    if result.error:
+        raise RuntimeError(result.error)
+
+    print(f"Импортировано строк: {result.imported}, отклонено: {len(result.rejected)}")
+    if not result.rejected:
+        return None
+
+    rejected_path = args.rejected or f"{os.path.splitext(args.file)[0]}_rejected.csv"
+    write_rejected_rows_csv(rejected_path, result.rejected)
+    return rejected_path
+
+
+def convert_storage(db_path, args):
+    """Перевод часов одной БД в упакованное (packed) или построчное (rows) хранение. Отчёт не записывается"""
+    work_day_dao = PackedWorkDayDAO(db_filename=db_path)
+    if args.format == "packed":
+        # Упаковка хранит часы в сотых долях, не больше 655.34 за день - о записях, которые она изменит, сообщаем
+        lossy = work_day_dao.count_lossy_hours()
+        if lossy is None:
+            raise RuntimeError("не удалось проверить часы перед упаковкой")
+        rounded, unstorable = lossy
+        if rounded:
+            print(f"Часов точнее сотых (будут округлены): {rounded}")
+        if unstorable:
+            raise RuntimeError(f"записей с часами больше 655.34 или не числом: {unstorable}, "
+                               f"упаковка невозможна без потери данных")
+        if rounded and not args.allow_rounding:
+            raise RuntimeError("упаковка округлит часы, для согласия укажите --allow-rounding")
+        moved = work_day_dao.pack_rows(allow_rounding=args.allow_rounding)
+    else:
+        moved = work_day_dao.unpack_rows()
+    if moved is None:
+        raise RuntimeError("конвертация не выполнена, изменения отменены")
+    print(f"Перенесено записей часов: {moved}")
+
+    # Освободившиеся страницы возвращаются системе только после VACUUM
+    if moved:
+        connection_manager.get_connection(db_path).execute("VACUUM")
+    return None
+
+
+def add_month_arguments(parser):
+    """Выбор месяцев и учебного года - общий для отчётов по месяцам"""
+    month_group = parser.add_mutually_exclusive_group(required=True)
+    month_group.add_argument("--months", nargs="+", choices=list(MONTH_NUMBERS), metavar="МЕСЯЦ",
+                             help="Названия месяцев: Сентябрь Октябрь ...")
+    month_group.add_argument("--all", action="store_true", help="Все месяцы учебного года")
+    parser.add_argument("--year", type=int, default=current_first_half_year(),
+                        help="Год начала учебного года (по умолчанию - текущий)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Отчёты по учёту часов без графического интерфейса")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    summary_parser = subparsers.add_parser("summary", help="Сводка по семестру: проведено и осталось часов")
+    summary_parser.add_argument("databases", nargs="+", help="Файлы БД")
+    summary_parser.add_argument("--semester", type=int, choices=(1, 2), required=True)
+    summary_parser.add_argument("--groups", nargs="*", help="Только указанные группы")
+    summary_parser.add_argument("--subjects", nargs="*", help="Только указанные дисциплины")
+    summary_parser.add_argument("--format", choices=("csv", "xlsx"), default="xlsx")
+    summary_parser.add_argument("--output-dir", default=".")
+    summary_parser.set_defaults(export=export_summary)
+
+    months_parser = subparsers.add_parser("months", help="Таблицы по месяцам, как в окне печати отчёта")
+    months_parser.add_argument("databases", nargs="+", help="Файлы БД")
+    add_month_arguments(months_parser)
+    months_parser.add_argument("--to-year", type=int,
+                               help="Последний учебный год выгрузки за несколько лет (только csv и tsv)")
+    months_parser.add_argument("--format", choices=("csv", "tsv", "xlsx"), default="xlsx")
+    months_parser.add_argument("--output-dir", default=".")
+    months_parser.set_defaults(export=export_months)
+
+    batch_parser = subparsers.add_parser("batch", help="Отдельный отчёт по месяцам для каждой группы или дисциплины")
+    batch_parser.add_argument("databases", nargs="+", help="Файлы БД")
+    add_month_arguments(batch_parser)
+    batch_parser.add_argument("--by", choices=list(PARTITION_COLUMNS), default="group",
+                              help="Разбиение: по группам (group) или по дисциплинам (subject)")
+    batch_parser.add_argument("--workers", type=int, help="Число процессов (по умолчанию - по числу ядер)")
+    batch_parser.add_argument("--output-dir", default=".")
+    batch_parser.set_defaults(export=export_batch)
+
+    import_parser = subparsers.add_parser("import", help="Импорт часов из CSV/TSV или книги Excel")
+    import_parser.add_argument("databases", nargs=1, metavar="DB", help="Файл БД")
+    import_parser.add_argument("file", help="Файл со столбцами Дата, Группа, Дисциплина, Часы [, Семестр]")
+    import_parser.add_argument("--rejected", help="Отчёт об отклонённых строках (по умолчанию - рядом с файлом)")
+    import_parser.set_defaults(export=import_file)
+
+    storage_parser = subparsers.add_parser("storage", help="Перевод часов в упакованное или построчное хранение")
+    storage_parser.add_argument("databases", nargs="+", help="Файлы БД")
+    storage_parser.add_argument("--format", choices=("packed", "rows"), required=True,
+                                help="packed - запись на группу, дисциплину и месяц; rows - запись на каждый день")
+    storage_parser.add_argument("--allow-rounding", action="store_true",
+                                help="Разрешить упаковку с округлением часов до сотых")
+    storage_parser.set_defaults(export=convert_storage)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "to_year", None) is not None:
+        if args.format == "xlsx":
+            parser.error("--to-year поддерживается только для форматов csv и tsv")
+        if args.to_year < args.year:
+            parser.error("--to-year не может быть меньше --year")
+    if getattr(args, "output_dir", None):
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    # Все файлы БД обрабатываются в одном процессе; ошибка в одном файле не останавливает остальные
+    failed = 0
+    for database in args.databases:
+        db_path = os.path.abspath(database)
+        if not os.path.isfile(db_path):
+            print(f"Файл БД не найден: {database}", file=sys.stderr)
+            failed += 1
+            continue
+
+        try:
+            # Ошибка миграции схемы не даёт открыть БД - с недомигрированной схемой команды не работают
+            if connection_manager.get_connection(db_path) is None:
+                print(f"Не удалось открыть БД: {database}", file=sys.stderr)
+                failed += 1
+                continue
+            file_path = args.export(db_path, args)
+            if file_path:
+                print(f"Отчёт сохранён: {file_path}")
+        except Exception as e:
+            print(f"Не удалось сформировать отчёт для {database}: {e}", file=sys.stderr)
+            failed += 1
+        finally:
+            connection_manager.close(db_path)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+from services.hours_index import MonthHoursStore, format_hours, parse_hours
+
+# Количество служебных столбцов перед днями месяца: Группа, Предмет
+NAME_COLUMNS = 2
+
+
+class HoursTableModel(QAbstractTableModel):
+    """Модель таблицы часов месяца поверх MonthHoursStore"""
+
+    # Изменения часов: список (group_name, subject_name, date, hours), hours=None - удаление
+    hours_edited = pyqtSignal(list)
+    # Введено некорректное значение часов
+    invalid_value = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = MonthHoursStore([], [])
+
+    def set_store(self, store):
+        """Полностью заменяет данные модели - один сброс модели вместо перестроения ячеек"""
+        self.beginResetModel()
+        self.store = store
+        self.endResetModel()
+
+    def clear(self):
+        """Очищает строки, сохраняя дни месяца в шапке"""
+        self.set_store(MonthHoursStore([], self.store.dates))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.store.row_count()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.store.column_count() + NAME_COLUMNS
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+
+        row, col = index.row(), index.column()
+        if col < NAME_COLUMNS:
+            return self.store.rows[row][col]
+        return format_hours(self.store.get(row, col - NAME_COLUMNS))
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Vertical:
+            return str(section + 1)
+        if section == 0:
+            return "Группа"
+        if section == 1:
+            return "Предмет"
+        return self.store.dates[section - NAME_COLUMNS].strftime("%d")
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+        if index.column() >= NAME_COLUMNS:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or index.column() < NAME_COLUMNS:
+            return False
+
+        try:
+            hours = parse_hours(str(value))
+        except ValueError:
+            self.invalid_value.emit("Значение должно быть числом (часы).")
+            return False
+
+        return bool(self.set_block({(index.row(), index.column()): hours}))
+
+    def cell_key(self, row, col):
+        """Возвращает (group_name, subject_name, date) для ячейки часов"""
+        group_name, subject_name = self.store.rows[row]
+        return group_name, subject_name, self.store.dates[col - NAME_COLUMNS]
+
+    def set_block(self, cells):
+        """
+        Записывает блок часов {(row, col): hours} одним изменением модели.
+        Возвращает список изменений (group_name, subject_name, date, hours) и передаёт его в hours_edited
+        """
+        changes = []
+        for (row, col), hours in cells.items():
+            if self.store.get(row, col - NAME_COLUMNS) == hours:
+                continue
+            self.store.set(row, col - NAME_COLUMNS, hours)
+            changes.append(self.cell_key(row, col) + (hours,))
+
+        if not changes:
+            return changes
+
+        rows = [row for row, _ in cells]
+        cols = [col for _, col in cells]
+        self.dataChanged.emit(self.index(min(rows), min(cols)), self.index(max(rows), max(cols)),
+                              [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        self.hours_edited.emit(changes)
+        return changes
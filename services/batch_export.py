@@ -0,0 +1,109 @@
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from .excel_export import write_report_workbook
+from .month_report import build_month_tables, build_months_data
+
+# Разбиение отчёта: по группе или по дисциплине (индекс столбца в строке таблицы месяца)
+PARTITION_COLUMNS = {"group": 2, "subject": 1}
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def safe_filename(name):
+    """Название группы или дисциплины как имя файла: недопустимые символы заменяются на '_'"""
+    return re.sub(r'[<>:"/\\|?*\s]+', "_", str(name)).strip("._") or "_"
+
+
+def partition_months_data(months_data, by="group"):
+    """
+    Разбивает данные месяцев по группам или дисциплинам за один проход.
+    :parameter months_data: {month_name: rows}, см. build_months_data
+    :parameter by: "group" или "subject"
+    Возвращает {название: {month_name: rows}}; у каждой части есть все месяцы, пустые - с пустым списком
+    """
+    key_index = PARTITION_COLUMNS[by]
+    partitions = {}
+    for month_name, rows in months_data.items():
+        for row in rows:
+            partition = partitions.get(row[key_index])
+            if partition is None:
+                partition = partitions[row[key_index]] = {month: [] for month in months_data}
+            partition[month_name].append(row)
+    return partitions
+
+
+def _write_partition_workbook(file_path, month_tables, column_widths):
+    """Выполняется в дочернем процессе: записывает одну книгу и возвращает число строк данных"""
+    write_report_workbook(file_path, month_tables, column_widths)
+    return sum(len(table.rows) for table in month_tables)
+
+
+def export_partitioned_reports(work_day_dao, curriculum_dao, first_half_year, month_titles, output_dir,
+                               by="group", max_workers=None):
+    """
+    Записывает отдельный отчёт Excel (в раскладке окна печати отчёта) для каждой группы или дисциплины.
+    Данные читаются из БД один раз в текущем процессе, а книги сериализуются параллельно в пуле процессов:
+    openpyxl загружает одно ядро, и на многоядерной машине книги пишутся в несколько раз быстрее.
+    :parameter month_titles: Список (month_name, year_title, caption) в порядке вывода в отчёт
+    :parameter by: "group" или "subject"
+    :parameter max_workers: Число процессов (по умолчанию - по числу ядер)
+    Возвращает путь к манифесту (manifest.json в output_dir) со списком записанных файлов.
+    Если часть книг записать не удалось, манифест всё равно записывается, затем выбрасывается RuntimeError
+    """
+    month_names = [month_name for month_name, _, _ in month_titles]
+    months_data = build_months_data(work_day_dao, curriculum_dao, first_half_year, month_names)
+    partitions = partition_months_data(months_data, by)
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    entries = []
+    errors = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        used_filenames = set()
+        for name in sorted(partitions):
+            month_tables, column_widths = build_month_tables(partitions[name], first_half_year, month_titles)
+
+            # Разные названия могут дать одно имя файла ("ИС/21" и "ИС 21") - добавляем номер
+            filename = base_filename = safe_filename(name)
+            suffix = 2
+            while filename.lower() in used_filenames:
+                filename = f"{base_filename}_{suffix}"
+                suffix += 1
+            used_filenames.add(filename.lower())
+
+            file_path = os.path.join(output_dir, f"{filename}.xlsx")
+            future = executor.submit(_write_partition_workbook, file_path, month_tables, column_widths)
+            futures[future] = (name, file_path)
+
+        for future in as_completed(futures):
+            name, file_path = futures[future]
+            try:
+                row_count = future.result()
+                entries.append({"name": name, "file": os.path.basename(file_path), "rows": row_count})
+            except Exception as e:
+                print(f"Ошибка при записи отчёта '{name}': {e}")
+                errors.append({"name": name, "error": str(e)})
+
+    # Манифест: что и когда записано; порядок файлов - по названию, как и при отправке задач
+    entries.sort(key=lambda entry: entry["name"])
+    manifest = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "academic_year": f"{first_half_year}/{first_half_year + 1}",
+        "months": month_names,
+        "partition_by": by,
+        "files": entries,
+        "errors": errors,
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False, indent=2)
+
+    if errors:
+        raise RuntimeError(f"не записано отчётов: {len(errors)}, подробности в {manifest_path}")
+
+    return manifest_path
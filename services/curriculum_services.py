@@ -1,9 +1,14 @@
 from .general import DBBase
 
+# Учебные планы хранят id группы и предмета; наружу DAO отдаёт строки с названиями в прежнем порядке столбцов:
+# (id, semester, total_hour, group_name, subject_name)
+CURRICULUM_COLUMNS = "c.id, c.semester, c.total_hour, g.name, s.name"
+CURRICULUM_TABLES = "curriculums c JOIN groups g ON g.id = c.group_id JOIN subjects s ON s.id = c.subject_id"
+
 
 class CurriculumDAO(DBBase):
-    def __init__(self, db_filename=None):
-        super().__init__(db_filename)
+    def __init__(self, db_filename=None, connection=None):
+        super().__init__(db_filename, connection)
         # self.cursor = self.create_cursor()
         # Включаем проверку внешних ключей
         # self._connection.execute("PRAGMA foreign_keys = ON")
@@ -11,9 +16,9 @@ class CurriculumDAO(DBBase):
     def create_curriculum(self, semester, total_hour, group_name, subject_name) -> tuple | None:
         """Заполнение одного учбеного плана"""
 
-        query = """INSERT INTO curriculums (semester, total_hour, group_name, subject_name) VALUES (?, ?, ?, ?)"""
+        query = """INSERT INTO curriculums (semester, total_hour, group_id, subject_id) VALUES (?, ?, ?, ?)"""
         try:
-            self.cursor.execute(query, (semester, total_hour, group_name, subject_name))
+            self.cursor.execute(query, (semester, total_hour, self._group_id(group_name), self._subject_id(subject_name)))
 
             # Проверяем, получилось ли добавить новую запись
             new_row = self.cursor.lastrowid
@@ -22,7 +27,7 @@ class CurriculumDAO(DBBase):
             self._connection.commit()
 
             # Возвращаем набор данных, записанный в бд, используя встроенную переменную ROWID в sqlite
-            select_query = """SELECT * FROM curriculums WHERE id = ?"""
+            select_query = f"""SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} WHERE c.id = ?"""
             self.cursor.execute(select_query, (new_row,))
             return self.cursor.fetchone()
         except Exception as e:
@@ -33,7 +38,7 @@ class CurriculumDAO(DBBase):
     def get_curriculum_by_id(self, curriculum_id) -> tuple:
         """Строгий поиск учебного плана по его id"""
 
-        query = """SELECT * FROM curriculums WHERE id = ?"""
+        query = f"""SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} WHERE c.id = ?"""
         try:
             result = self.cursor.execute(query, (curriculum_id,)).fetchone()
             return result
@@ -44,7 +49,7 @@ class CurriculumDAO(DBBase):
     def get_all_curriculums(self) -> list:
         """Получение всех учебных планов"""
 
-        query = "SELECT * FROM curriculums"
+        query = f"SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES}"
         try:
             result = self.cursor.execute(query).fetchall()
             return result
@@ -52,12 +57,21 @@ class CurriculumDAO(DBBase):
             print(f"Произошла ошибка при получении всех учебных планов: {e}")
             return []
 
-    def get_curriculums_by_semester(self, semester) -> list:
-        """Получение учебных планов по семестру"""
+    def get_curriculums_by_semester(self, semester, group_names=None, subject_names=None) -> list:
+        """
+        Получение учебных планов по семестру
+        :parameter group_names: Набор групп для фильтрации (None или пустой набор - без фильтра)
+        :parameter subject_names: Набор предметов для фильтрации (None или пустой набор - без фильтра)
+        """
 
-        query = "SELECT * FROM curriculums WHERE semester = ?"
+        where, params = self._build_where(
+            ["c.semester = ?"], [semester],
+            [("c.group_id", self._ids_filter("groups", group_names)),
+             ("c.subject_id", self._ids_filter("subjects", subject_names))]
+        )
+        query = f"SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} {where}"
         try:
-            result = self.cursor.execute(query, (semester,)).fetchall()
+            result = self.cursor.execute(query, params).fetchall()
             return result
         except Exception as e:
             print(f"Произошла ошибка при получении учебных планов по семестру {semester}: {e}")
@@ -67,10 +81,10 @@ class CurriculumDAO(DBBase):
         """Получение учебных планов по группе"""
 
         if use_like:
-            query = "SELECT * FROM curriculums WHERE group_name LIKE ?"
+            query = f"SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} WHERE g.name LIKE ?"
             group_name = f"%{group_name}%"
         else:
-            query = "SELECT * FROM curriculums WHERE group_name = ?"
+            query = f"SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} WHERE g.name = ?"
         try:
             result = self.cursor.execute(query, (group_name,)).fetchall()
             return result
@@ -80,7 +94,7 @@ class CurriculumDAO(DBBase):
         
     def get_curriculums_by_group_and_semester(self, group_name, semester) -> list:
         """Получение учебных планов по группе и семестру"""
-        query = "SELECT * FROM curriculums WHERE group_name = ? AND semester = ?"
+        query = f"SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} WHERE g.name = ? AND c.semester = ?"
         try:
             result = self.cursor.execute(query, (group_name, semester)).fetchall()
             return result
@@ -92,10 +106,10 @@ class CurriculumDAO(DBBase):
         """Получение учебных планов по предмету"""
 
         if use_like:
-            query = "SELECT * FROM curriculums WHERE subject_name LIKE ?"
+            query = f"SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} WHERE s.name LIKE ?"
             subject_name = f"%{subject_name}%"
         else:
-            query = "SELECT * FROM curriculums WHERE subject_name = ?"
+            query = f"SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} WHERE s.name = ?"
         try:
             result = self.cursor.execute(query, (subject_name,)).fetchall()
             return result
@@ -103,9 +117,53 @@ class CurriculumDAO(DBBase):
             print(f"Произошла ошибка при получении учебных планов по предмету: {e}")
             return []
 
+    def get_semester_report(self, semester, group_names=None, subject_names=None) -> list:
+        """
+        Сводка по семестру за один запрос: (group_name, subject_name, total_hour, sum_of_hours)
+        :parameter group_names: Набор групп для фильтрации (None или пустой набор - без фильтра)
+        :parameter subject_names: Набор предметов для фильтрации (None или пустой набор - без фильтра)
+        """
+
+        where, params = self._build_where(
+            ["c.semester = ?"], [semester],
+            [("c.group_id", self._ids_filter("groups", group_names)),
+             ("c.subject_id", self._ids_filter("subjects", subject_names))]
+        )
+
+        # Часы складываются из обоих вариантов хранения: построчного workDays и упакованного workDaysPacked
+        # (у несконвертированной БД упакованная таблица пуста).
+        # Сумма приводится к одному виду для обоих форматов: округление до сотых часа (точность упакованного
+        # хранения), целое число часов - INTEGER. Иначе SUM по дробным часам даёт 8.0 и 0.30000000000000004
+        # там, где суммы месяцев упакованного хранения дают 8 и 0.3
+        query = f"""
+            SELECT group_name, subject_name, total_hour,
+                   CASE WHEN done = CAST(done AS INTEGER) THEN CAST(done AS INTEGER) ELSE done END
+            FROM (
+                SELECT c.id, g.name AS group_name, s.name AS subject_name, c.total_hour,
+                       ROUND(COALESCE((SELECT SUM(w.hours) FROM workDays w
+                                       WHERE w.semester = c.semester AND w.group_id = c.group_id
+                                             AND w.subject_id = c.subject_id), 0)
+                             + COALESCE((SELECT SUM(p.total_hours) FROM workDaysPacked p
+                                         WHERE p.semester = c.semester AND p.group_id = c.group_id
+                                               AND p.subject_id = c.subject_id), 0), 2) AS done
+                FROM {CURRICULUM_TABLES}
+                {where}
+            )
+            ORDER BY id
+        """
+        try:
+            result = self.cursor.execute(query, params).fetchall()
+            return result
+        except Exception as e:
+            print(f"Произошла ошибка при получении сводки по семестру {semester}: {e}")
+            return []
+
     def update_curriculum(self, id, **kwargs) -> str | None:
         """Обновление учебного плана"""
 
+        # Группа и предмет хранятся по id
+        kwargs = self._names_to_ids(kwargs)
+
         # Формируем строку запроса на основе переданных именованных аргументов
         query = """UPDATE curriculums SET """
         for k in kwargs:
@@ -125,7 +183,7 @@ class CurriculumDAO(DBBase):
                 return None
 
             # Возвращаем набор данных, записанный в бд, используя встроенную переменную ROWID в sqlite
-            select_query = """SELECT * FROM curriculums WHERE id = ?"""
+            select_query = f"""SELECT {CURRICULUM_COLUMNS} FROM {CURRICULUM_TABLES} WHERE c.id = ?"""
             self.cursor.execute(select_query, (id,))
             return self.cursor.fetchone()
         except Exception as e:
@@ -133,6 +191,59 @@ class CurriculumDAO(DBBase):
             if self._connection:
                 self._connection.rollback()
 
+    def sync_group_semester(self, group_name, semester, subject_hours) -> tuple | None:
+        """
+        Приводит учебные планы группы в семестре к переданному набору одной транзакцией.
+        :parameter subject_hours: {subject_name: total_hour}
+        Новые предметы добавляются, у существующих меняются только отличающиеся часы, лишние удаляются -
+        id неизменённых и обновлённых планов сохраняются.
+        Возвращает (добавлено, обновлено, удалено) или None при ошибке (транзакция откатывается)
+        """
+
+        select_query = """
+            SELECT c.id, s.name, c.total_hour
+            FROM curriculums c JOIN subjects s ON s.id = c.subject_id
+            WHERE c.group_id = ? AND c.semester = ?
+        """
+        insert_query = """INSERT INTO curriculums (semester, total_hour, group_id, subject_id) VALUES (?, ?, ?, ?)"""
+        update_query = """UPDATE curriculums SET total_hour = ? WHERE id = ?"""
+        delete_query = """DELETE FROM curriculums WHERE id = ?"""
+
+        try:
+            group_id = self._group_id(group_name)
+            current = {}
+            deletes = []
+            for curriculum_id, subject_name, total_hour in self.cursor.execute(select_query, (group_id, semester)):
+                if subject_name in current or subject_name not in subject_hours:
+                    # Повторная запись того же предмета или предмет убран из плана
+                    deletes.append((curriculum_id,))
+                else:
+                    current[subject_name] = (curriculum_id, total_hour)
+
+            inserts = []
+            updates = []
+            for subject_name, total_hour in subject_hours.items():
+                if subject_name not in current:
+                    inserts.append((semester, total_hour, group_id, self._subject_id(subject_name)))
+                elif current[subject_name][1] != total_hour:
+                    updates.append((total_hour, current[subject_name][0]))
+
+            if not inserts and not updates and not deletes:
+                return 0, 0, 0
+
+            if deletes:
+                self.cursor.executemany(delete_query, deletes)
+            if updates:
+                self.cursor.executemany(update_query, updates)
+            if inserts:
+                self.cursor.executemany(insert_query, inserts)
+            self._connection.commit()
+            return len(inserts), len(updates), len(deletes)
+        except Exception as e:
+            print(f"Произошла ошибка при сохранении учебного плана группы {group_name} на семестр {semester}: {e}")
+            if self._connection:
+                self._connection.rollback()
+
     def delete_curriculum(self, curriculum_id) -> str | None:
         """Удаление записи учебного плана"""
 
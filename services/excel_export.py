@@ -0,0 +1,149 @@
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, Side
+from openpyxl.utils import get_column_letter
+
+REPORT_SHEET_TITLE = "Отчёт"
+
+# Служебные столбцы перед днями месяца и после них
+LEADING_HEADERS = ["Всего ч.", "Дисциплина", "Группа"]
+TRAILING_HEADERS = ["Прошло", "Осталось"]
+
+# Ширина столбца дня: номер дня или часы за день
+DAY_COLUMN_WIDTH = 5
+# Наибольшая ширина столбца с названиями
+MAX_COLUMN_WIDTH = 50
+
+# Имена стилей отчёта
+TITLE_STYLE = "report_title"
+HEADER_STYLE = "report_header"
+CELL_STYLE = "report_cell"
+
+
+class MonthReportTable:
+    """Таблица одного месяца в отчёте"""
+    def __init__(self, year_title, caption, working_days, rows):
+        """
+        :parameter year_title: Заголовок над столбцами "Всего ч." и "Дисциплина" (учебный год)
+        :parameter caption: Заголовок над остальными столбцами (полугодие и месяц)
+        :parameter working_days: Номера рабочих дней месяца (без воскресений)
+        :parameter rows: Строки [всего ч., дисциплина, группа, часы по дням..., прошло, осталось]
+        """
+        self.year_title = year_title
+        self.caption = caption
+        self.working_days = list(working_days)
+        self.rows = rows
+
+
+def create_report_styles():
+    """Именованные стили отчёта: описываются один раз на книгу, а не создаются для каждой ячейки"""
+    center_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    thin_side = Side(style="thin")
+    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+
+    return [
+        NamedStyle(name=TITLE_STYLE, font=Font(bold=True, size=14), alignment=center_alignment),
+        NamedStyle(name=HEADER_STYLE, font=Font(bold=True), alignment=center_alignment, border=thin_border),
+        NamedStyle(name=CELL_STYLE, alignment=center_alignment, border=thin_border),
+    ]
+
+
+def report_column_widths(day_counts, subject_names, group_names):
+    """
+    Ширины столбцов отчёта по уже известным данным, без прохода по записанным ячейкам.
+    :parameter day_counts: Количество рабочих дней в каждом месяце отчёта
+    :parameter subject_names: Названия дисциплин в отчёте
+    :parameter group_names: Названия групп в отчёте
+    Возвращает {номер столбца (с 1): ширина}
+    """
+    def name_width(header, names):
+        return min(max([len(header)] + [len(str(name)) for name in names]) + 2, MAX_COLUMN_WIDTH)
+
+    widths = {
+        1: len(LEADING_HEADERS[0]) + 2,
+        2: name_width(LEADING_HEADERS[1], subject_names),
+        3: name_width(LEADING_HEADERS[2], group_names),
+    }
+
+    # Столбцы "Прошло" и "Осталось" у месяцев разной длины стоят на разных местах -
+    # берём наибольшую ширину среди месяцев
+    trailing_width = max(len(header) for header in TRAILING_HEADERS) + 2
+    first_day_col = len(LEADING_HEADERS) + 1
+    for day_count in day_counts:
+        for offset in range(day_count + len(TRAILING_HEADERS)):
+            width = DAY_COLUMN_WIDTH if offset < day_count else trailing_width
+            col = first_day_col + offset
+            widths[col] = max(widths.get(col, 0), width)
+
+    return widths
+
+
+def write_report_workbook(file_path, month_tables, column_widths, progress_callback=None):
+    """
+    Записывает отчёт по месяцам в книгу Excel в потоковом режиме (write-only):
+    строки уходят в файл по мере записи, поэтому память не растёт с размером отчёта.
+    :parameter month_tables: Итерируемый набор MonthReportTable (может быть генератором)
+    :parameter column_widths: {номер столбца: ширина}, см. report_column_widths
+    :parameter progress_callback: Вызывается после каждой таблицы с (записано таблиц, caption таблицы);
+    если вернёт False, запись прерывается и файл не сохраняется
+    Возвращает True, если книга сохранена, и False, если запись прервана
+    """
+    wb = Workbook(write_only=True)
+    for style in create_report_styles():
+        wb.add_named_style(style)
+
+    ws = wb.create_sheet(REPORT_SHEET_TITLE)
+
+    # В потоковом режиме ширины задаются до первой строки
+    for col, width in column_widths.items():
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+    def styled(value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    row_num = 1
+    tables_written = 0
+    for table in month_tables:
+        day_count = len(table.working_days)
+        last_col = len(LEADING_HEADERS) + day_count + len(TRAILING_HEADERS)
+
+        # Заголовок: учебный год над первыми двумя столбцами, полугодие и месяц - над остальными
+        title_row = [styled(table.year_title, TITLE_STYLE), None, styled(table.caption, TITLE_STYLE)]
+        ws.append(title_row)
+        ws.merged_cells.add(f"A{row_num}:B{row_num}")
+        ws.merged_cells.add(f"C{row_num}:{get_column_letter(last_col)}{row_num}")
+        row_num += 1
+
+        # Заголовки столбцов
+        headers = LEADING_HEADERS + [str(day) for day in table.working_days] + TRAILING_HEADERS
+        ws.append([styled(header, HEADER_STYLE) for header in headers])
+        row_num += 1
+
+        # Данные: нулевые часы за день оставляем пустыми.
+        # Строка записывается в файл сразу при append, поэтому одни и те же ячейки со стилем
+        # переиспользуются для всех строк таблицы - стиль не назначается заново каждой ячейке
+        first_day_index = len(LEADING_HEADERS)
+        last_day_index = first_day_index + day_count
+        row_cells = [styled(None, CELL_STYLE) for _ in range(last_col)]
+        for data_row in table.rows:
+            for index, value in enumerate(data_row):
+                if first_day_index <= index < last_day_index and value == 0:
+                    value = None
+                row_cells[index].value = value
+            ws.append(row_cells)
+            row_num += 1
+
+        # Пустая строка между таблицами
+        ws.append([])
+        row_num += 1
+
+        tables_written += 1
+        if progress_callback is not None and progress_callback(tables_written, table.caption) is False:
+            # Закрываем лист, чтобы освободить его временный файл; книга не сохраняется
+            ws.close()
+            return False
+
+    wb.save(file_path)
+    return True
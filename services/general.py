@@ -1,11 +1,376 @@
+import configparser
+import json
 import os
 import sqlite3
-from settings.settings import get_full_db_path, get_current_db_filename, SQL_SCRIPT_PATH
+from pathlib import Path
+from settings.settings import get_full_db_path, get_current_db_filename, SQL_SCRIPT_PATH, CONFIG_PATH
+
+# Наибольший набор значений фильтра, который передаётся списком "IN (?, ...)"; больший - через json_each
+IN_LIST_LIMIT = 500
+
+# Профиль производительности SQLite по умолчанию, значения переопределяются в секции [database] config.ini.
+# WAL и synchronous=NORMAL сокращают задержку коммита при записи правок часов по сравнению с журналом DELETE
+# и synchronous=FULL. cache_size в КиБ (отрицательное значение), 16 МиБ вмещают БД учебного года.
+# mmap для БД такого размера по умолчанию выключен.
+# checkpoint_on_close - режим wal_checkpoint при закрытии соединения на запись (none - не выполнять):
+# после него файл БД содержит все данные и его можно копировать или архивировать без файла -wal
+DEFAULT_DB_PROFILE = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -16384,
+    "mmap_size": 0,
+    "temp_store": "memory",
+    "busy_timeout": 5000,
+    "checkpoint_on_close": "truncate",
+}
+# Допустимые значения текстовых параметров профиля; остальные параметры - целые числа
+DB_PROFILE_CHOICES = {
+    "journal_mode": ("delete", "truncate", "persist", "wal"),
+    "synchronous": ("off", "normal", "full", "extra"),
+    "temp_store": ("default", "file", "memory"),
+    "checkpoint_on_close": ("none", "passive", "full", "restart", "truncate"),
+}
+
+# Миграции схемы БД: (версия, список SQL-команд).
+# Текущая версия схемы хранится в PRAGMA user_version, новые миграции добавляются в конец списка
+MIGRATIONS = [
+    # Составной индекс для выборок рабочих дней по семестру, группе, предмету и дате
+    (1, [
+        """CREATE INDEX IF NOT EXISTS idx_workDays_semester_group_subject_date
+           ON workDays (semester, group_name, subject_name, date)""",
+    ]),
+    # Составной индекс для выборок учебных планов по семестру и группе
+    (2, [
+        """CREATE INDEX IF NOT EXISTS idx_curriculums_semester_group_subject
+           ON curriculums (semester, group_name, subject_name)""",
+    ]),
+    # Индекс для выборок рабочих дней по дате
+    (3, [
+        """CREATE INDEX IF NOT EXISTS idx_workDays_date ON workDays (date)""",
+    ]),
+    # Одна запись часов на (дата, группа, предмет, семестр): убираем дубликаты, оставляя последнюю запись,
+    # и заменяем составной индекс уникальным - на нём работает INSERT ... ON CONFLICT
+    (4, [
+        """DELETE FROM workDays WHERE id NOT IN (
+               SELECT MAX(id) FROM workDays GROUP BY date, group_name, subject_name, semester
+           )""",
+        """DROP INDEX IF EXISTS idx_workDays_semester_group_subject_date""",
+        """CREATE UNIQUE INDEX IF NOT EXISTS ux_workDays_semester_group_subject_date
+           ON workDays (semester, group_name, subject_name, date)""",
+    ]),
+    # Номер дня (дней с 1970-01-01) - вычисляемый столбец по тексту даты с индексом:
+    # выборки за месяц или полугодие идут диапазоном по индексу без разбора дат в Python
+    (5, [
+        """ALTER TABLE workDays ADD COLUMN day_number INTEGER
+           GENERATED ALWAYS AS (CAST(julianday(date) - 2440587.5 AS INTEGER)) VIRTUAL""",
+        """CREATE INDEX IF NOT EXISTS idx_workDays_day_number ON workDays (day_number)""",
+    ]),
+    # Целочисленные ключи групп и предметов: учебные планы и часы ссылаются на id вместо названий.
+    # Таблицы пересоздаются (в SQLite нельзя поменять столбцы и внешние ключи таблицы на месте),
+    # id групп и предметов берутся из rowid - существующие записи сохраняют свои номера.
+    # Названия, на которые есть ссылки, но которых нет в справочниках, добавляются в справочники,
+    # чтобы не потерять часы и планы
+    (6, [
+        """CREATE TABLE groups_new (
+               id INTEGER PRIMARY KEY,
+               name TEXT NOT NULL UNIQUE
+           )""",
+        """INSERT INTO groups_new (id, name) SELECT rowid, name FROM groups""",
+        """INSERT INTO groups_new (name)
+           SELECT group_name FROM workDays WHERE group_name NOT IN (SELECT name FROM groups_new)
+           UNION
+           SELECT group_name FROM curriculums WHERE group_name NOT IN (SELECT name FROM groups_new)""",
+        """CREATE TABLE subjects_new (
+               id INTEGER PRIMARY KEY,
+               name TEXT NOT NULL UNIQUE
+           )""",
+        """INSERT INTO subjects_new (id, name) SELECT rowid, name FROM subjects""",
+        """INSERT INTO subjects_new (name)
+           SELECT subject_name FROM workDays WHERE subject_name NOT IN (SELECT name FROM subjects_new)
+           UNION
+           SELECT subject_name FROM curriculums WHERE subject_name NOT IN (SELECT name FROM subjects_new)""",
+        """CREATE TABLE workDays_new (
+               id INTEGER NOT NULL UNIQUE,
+               date TEXT NOT NULL,
+               subject_id INTEGER NOT NULL,
+               group_id INTEGER NOT NULL,
+               semester INTEGER NOT NULL,
+               hours INTEGER NOT NULL,
+               day_number INTEGER GENERATED ALWAYS AS (CAST(julianday(date) - 2440587.5 AS INTEGER)) VIRTUAL,
+               PRIMARY KEY (id AUTOINCREMENT),
+               FOREIGN KEY (group_id) REFERENCES groups (id),
+               FOREIGN KEY (subject_id) REFERENCES subjects (id)
+           )""",
+        """INSERT INTO workDays_new (id, date, subject_id, group_id, semester, hours)
+           SELECT w.id, w.date, s.id, g.id, w.semester, w.hours
+           FROM workDays w
+           JOIN groups_new g ON g.name = w.group_name
+           JOIN subjects_new s ON s.name = w.subject_name""",
+        """CREATE TABLE curriculums_new (
+               id INTEGER NOT NULL UNIQUE,
+               semester INTEGER NOT NULL,
+               total_hour INTEGER NOT NULL,
+               group_id INTEGER NOT NULL,
+               subject_id INTEGER NOT NULL,
+               PRIMARY KEY (id),
+               FOREIGN KEY (group_id) REFERENCES groups (id),
+               FOREIGN KEY (subject_id) REFERENCES subjects (id)
+           )""",
+        """INSERT INTO curriculums_new (id, semester, total_hour, group_id, subject_id)
+           SELECT c.id, c.semester, c.total_hour, g.id, s.id
+           FROM curriculums c
+           JOIN groups_new g ON g.name = c.group_name
+           JOIN subjects_new s ON s.name = c.subject_name""",
+        """DROP TABLE workDays""",
+        """DROP TABLE curriculums""",
+        """DROP TABLE groups""",
+        """DROP TABLE subjects""",
+        """ALTER TABLE groups_new RENAME TO groups""",
+        """ALTER TABLE subjects_new RENAME TO subjects""",
+        """ALTER TABLE workDays_new RENAME TO workDays""",
+        """ALTER TABLE curriculums_new RENAME TO curriculums""",
+        """CREATE UNIQUE INDEX ux_workDays_semester_group_subject_date
+           ON workDays (semester, group_id, subject_id, date)""",
+        """CREATE INDEX idx_workDays_date ON workDays (date)""",
+        """CREATE INDEX idx_workDays_day_number ON workDays (day_number)""",
+        """CREATE INDEX idx_curriculums_semester_group_subject ON curriculums (semester, group_id, subject_id)""",
+    ]),
+    # Упакованное хранение часов (необязательное, см. packed_work_day_services): одна запись на
+    # (семестр, группа, предмет, месяц 'YYYY-MM'), часы за дни месяца - массивом в BLOB,
+    # total_hours - сумма часов месяца для подсчётов в SQL. Пока БД не сконвертирована, таблица пуста
+    (7, [
+        """CREATE TABLE workDaysPacked (
+               id INTEGER PRIMARY KEY,
+               semester INTEGER NOT NULL,
+               group_id INTEGER NOT NULL,
+               subject_id INTEGER NOT NULL,
+               month TEXT NOT NULL,
+               hours BLOB NOT NULL,
+               total_hours INTEGER NOT NULL,
+               FOREIGN KEY (group_id) REFERENCES groups (id),
+               FOREIGN KEY (subject_id) REFERENCES subjects (id)
+           )""",
+        """CREATE UNIQUE INDEX ux_workDaysPacked_semester_group_subject_month
+           ON workDaysPacked (semester, group_id, subject_id, month)""",
+        """CREATE INDEX idx_workDaysPacked_month ON workDaysPacked (month)""",
+    ]),
+    # Служебные параметры БД: (ключ, значение). work_days_storage - формат хранения часов,
+    # его записывает конвертер (cli.py storage). У уже упакованных БД формат определяется по данным
+    (8, [
+        """CREATE TABLE meta (
+               key TEXT PRIMARY KEY,
+               value TEXT NOT NULL
+           )""",
+        """INSERT INTO meta (key, value)
+           SELECT 'work_days_storage', 'packed' WHERE EXISTS (SELECT 1 FROM workDaysPacked)""",
+    ]),
+]
+
+# Кэш соответствия названий и id групп и предметов: {(путь к БД, таблица): {название: id}}.
+# Справочники маленькие и меняются редко - читаются один раз на файл БД,
+# сбрасываются при записи в них через GroupDAO/SubjectDAO и при закрытии соединений с файлом.
+# Кэшем пользуются только DAO на общем соединении (поток интерфейса, cli.py); DAO со своим соединением
+# (фоновые задачи) держат собственный кэш - их снимок БД может быть устаревшим
+_name_id_cache = {}
+
+
+def invalidate_name_ids(db_path, table=None):
+    """Сбрасывает кэш названий и id для файла БД (для одной таблицы или для обеих)"""
+    for cached_table in ((table,) if table else ("groups", "subjects")):
+        _name_id_cache.pop((db_path, cached_table), None)
+
+
+def table_exists(connection, table_name):
+    """Проверяет, существует ли таблица в базе данных"""
+    result = connection.execute("""SELECT name FROM sqlite_master WHERE type='table' AND name=?;""",
+                                (table_name,)).fetchone()
+
+    # Если результат не None, значит таблица существует
+    return result is not None
+
+
+def get_schema_version(connection):
+    """Возвращает версию схемы БД из PRAGMA user_version"""
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(connection):
+    """
+    Применяет миграции, версия которых больше текущей версии схемы. Каждая миграция - отдельная транзакция.
+    Неудачная миграция откатывается, и исключение пробрасывается дальше: с недомигрированной схемой БД не открывается
+    """
+    current_version = get_schema_version(connection)
+    for version, statements in MIGRATIONS:
+        if version <= current_version:
+            continue
+        try:
+            connection.execute("BEGIN")
+            for statement in statements:
+                connection.execute(statement)
+            # PRAGMA не принимает параметры, версия берётся из списка MIGRATIONS
+            connection.execute(f"PRAGMA user_version = {int(version)}")
+            connection.commit()
+            print(f"Применена миграция схемы БД до версии {version}")
+        except Exception as e:
+            print(f"Произошла ошибка при применении миграции {version}: {e}")
+            connection.rollback()
+            raise
+
+
+def prepare_schema(connection):
+    """Создаёт таблицы в пустой БД и доводит схему до актуальной версии"""
+    # Проверяем, есть ли одна из таблиц в бд
+    # Если нет, то в базе данных нет таблиц и их нужно создать скриптом
+    if not table_exists(connection, "groups"):
+        # Читаем содержимое SQL-скрипта
+        sql_script_content = SQL_SCRIPT_PATH.read_text(encoding='utf-8')
+
+        # Выполняем скрипт для заполнения бд таблицами
+        connection.executescript(sql_script_content)
+
+    # Доводим схему до актуальной версии (в т.ч. у архивных БД прошлых лет)
+    apply_migrations(connection)
+
+
+def load_db_profile(config_path=CONFIG_PATH):
+    """
+    Профиль производительности SQLite: DEFAULT_DB_PROFILE с переопределениями из секции [database] config.ini.
+    Неизвестные параметры и некорректные значения пропускаются - действует значение по умолчанию
+    """
+    profile = dict(DEFAULT_DB_PROFILE)
+    config = configparser.ConfigParser()
+    try:
+        config.read(config_path, encoding="utf-8")
+    except configparser.Error as e:
+        print(f"Ошибка при чтении {config_path}, используется профиль БД по умолчанию: {e}")
+        return profile
+    if not config.has_section("database"):
+        return profile
+
+    for key, value in config["database"].items():
+        value = value.strip().lower()
+        if key not in profile:
+            print(f"Неизвестный параметр [database] {key} в {config_path}")
+        elif key in DB_PROFILE_CHOICES:
+            if value in DB_PROFILE_CHOICES[key]:
+                profile[key] = value
+            else:
+                print(f"Некорректное значение [database] {key} = {value}, используется {profile[key]}")
+        else:
+            try:
+                profile[key] = int(value)
+            except ValueError:
+                print(f"Некорректное значение [database] {key} = {value}, используется {profile[key]}")
+    return profile
+
+
+def apply_db_profile(connection, profile, readonly=False):
+    """
+    Настраивает соединение по профилю производительности.
+    journal_mode хранится в самом файле БД, поэтому его меняет только соединение на запись
+    """
+    if not readonly:
+        connection.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    connection.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    connection.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+    connection.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    connection.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+    connection.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+
+
+def checkpoint_on_close(connection, profile=None):
+    """Переносит журнал WAL в файл БД перед закрытием соединения на запись (политика checkpoint_on_close)"""
+    profile = profile or load_db_profile()
+    mode = profile["checkpoint_on_close"]
+    if mode == "none":
+        return
+    if connection.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        return
+    busy, _, _ = connection.execute(f"PRAGMA wal_checkpoint({mode.upper()})").fetchone()
+    if busy:
+        print("Контрольная точка WAL выполнена не полностью: БД занята другим соединением")
+
+
+def open_connection(db_path, readonly=False):
+    """
+    Открывает и настраивает новое соединение с БД по указанному пути.
+    Соединение принадлежит вызывающему коду - его нужно закрыть самостоятельно.
+    :parameter readonly: Открыть БД только для чтения (схема при этом не проверяется)
+    Возвращает None, если БД не удалось открыть или довести её схему до актуальной версии
+    """
+    print(f"[DEBUG DBBase] Подключение к БД по пути: {db_path}")
+    profile = load_db_profile()
+    conn = None
+    try:
+        if readonly:
+            conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+            apply_db_profile(conn, profile, readonly=True)
+        else:
+            # Убедимся, что директория db существует
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            conn = sqlite3.connect(db_path)
+            apply_db_profile(conn, profile)
+            prepare_schema(conn)
+    except Exception as e:
+        print(f"Ошибка при подключении к БД по пути {db_path}: {e}")
+        if conn is not None:
+            conn.close()
+        return None
+
+    # Включаем проверку внешних ключей
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+class ConnectionManager:
+    """
+    Хранит по одному общему соединению на каждый файл БД и раздаёт его всем DAO.
+    Открытие, проверка схемы и миграции выполняются один раз - при первом обращении к файлу
+    """
+    def __init__(self):
+        self._connections = {}
+
+    def get_connection(self, db_path):
+        """Возвращает общее соединение для файла БД, открывая его при первом обращении"""
+        conn = self._connections.get(db_path)
+        if conn is None:
+            conn = open_connection(db_path)
+            if conn is not None:
+                self._connections[db_path] = conn
+        return conn
+
+    def close(self, db_path):
+        """
+        Закрывает общее соединение с указанным файлом БД.
+        Фоновые задачи открывают собственные соединения только для чтения и закрывают их сами
+        """
+        invalidate_name_ids(db_path)
+        conn = self._connections.pop(db_path, None)
+        if conn is not None:
+            try:
+                checkpoint_on_close(conn)
+                conn.close()
+            except Exception as e:
+                print(f"Ошибка при закрытии соединения с БД {db_path}: {e}")
+
+    def close_all(self):
+        """Закрывает все открытые соединения"""
+        for db_path in list(self._connections):
+            self.close(db_path)
+
+
+# Общий менеджер соединений приложения
+connection_manager = ConnectionManager()
 
 
 class DBBase:
     """Base class to work with db"""
-    def __init__(self, db_filename=None):
+    def __init__(self, db_filename=None, connection=None):
+        """
+        :parameter db_filename: Имя файла БД (по умолчанию - текущая БД)
+        :parameter connection: Готовое соединение (например, своё соединение фонового потока).
+        Если не передано, используется общее соединение из connection_manager
+        """
         # Если имя файла не передано, используем текущее
         if db_filename is None:
              db_filename = get_current_db_filename()
@@ -13,59 +378,133 @@ class DBBase:
         self.db_path = get_full_db_path(db_filename)
         print(f"Подключение к БД: {self.db_path}") # Для отладки
 
-        # Убедимся, что директория db существует
-        db_dir = os.path.dirname(self.db_path)
-        os.makedirs(db_dir, exist_ok=True)
+        # Своё соединение - свой кэш названий и id, общий _name_id_cache принадлежит общему соединению
+        self._own_name_ids = None if connection is None else {}
 
-        # Создаем соединение
-        self._connection = self.__create_connection(self.db_path)
+        # Берём общее соединение с файлом БД - схема проверяется один раз при его открытии
+        if connection is None:
+            connection = connection_manager.get_connection(self.db_path)
+        self._connection = connection
         self.cursor = self.create_cursor()
 
-        # Проверяем, есть ли одна из таблиц в бд
-        # Если нет, то в базе данных нет таблиц и их нужно создать скриптом
-        is_groups_exits = self.table_exists("groups")
-        if not is_groups_exits:
-            # Читаем содержимое SQL-скрипта
-            sql_script_content = SQL_SCRIPT_PATH.read_text(encoding='utf-8')
-
-            # Выполняем скрипт для заполнения бд таблицами
-            self._connection.executescript(sql_script_content)
-
-        # Включаем проверку внешних ключей
-        self._connection.execute("PRAGMA foreign_keys = ON")
-
     def get_db_path(self):
         return self.db_path
 
     def create_cursor(self):
-        """Создаёт курсор и сохраняет соединение для последующего закрытия"""
+        """Создаёт курсор из соединения, с которым работает DAO"""
         # Курсор создается из существующего соединения
         if self._connection is None:
             print("Предупреждение: Попытка создать курсор при закрытом соединении.")
             return None
         return self._connection.cursor()
 
-    def __create_connection(self, path):
-        """Создает соединение с БД по указанному пути."""
-        print(f"[DEBUG DBBase] Подключение к БД по пути: {path}")
-        try:
-            conn = sqlite3.connect(path)
-            return conn
-        except Exception as e:
-            print(f"Ошибка при подключении к БД по пути {path}: {e}")
-            return None
-
     def close(self):
-        """Закрывает соединение с БД, если оно открыто"""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """Отвязывает DAO от соединения. Само общее соединение закрывает connection_manager"""
+        self.cursor = None
+        self._connection = None
+
+    def get_schema_version(self):
+        """Возвращает версию схемы БД из PRAGMA user_version"""
+        return get_schema_version(self._connection)
 
     def table_exists(self, table_name):
         """Проверяет, существует ли таблица в базе данных"""
-        self.cursor.execute("""SELECT name FROM sqlite_master WHERE type='table' AND name=?;""",
-                            (table_name,))
-        result = self.cursor.fetchone()
+        return table_exists(self._connection, table_name)
+
+    def _name_ids(self, table):
+        """{название: id} для таблицы groups или subjects, из кэша или одним запросом"""
+        if self._own_name_ids is not None:
+            cache, key = self._own_name_ids, table
+        else:
+            cache, key = _name_id_cache, (self.db_path, table)
+        ids = cache.get(key)
+        if ids is None:
+            ids = {name: row_id for row_id, name in self._connection.execute(f"SELECT id, name FROM {table}")}
+            cache[key] = ids
+        return ids
+
+    def _reload_name_ids(self, table):
+        """Перечитывает справочник мимо кэша: название могло появиться или смениться через другое соединение"""
+        if self._own_name_ids is not None:
+            self._own_name_ids.pop(table, None)
+        else:
+            invalidate_name_ids(self.db_path, table)
+        return self._name_ids(table)
+
+    def _name_id(self, table, name):
+        """id группы или предмета по названию; None, если такого названия нет"""
+        row_id = self._name_ids(table).get(name)
+        if row_id is None:
+            row_id = self._reload_name_ids(table).get(name)
+        return row_id
+
+    def _group_id(self, group_name):
+        return self._name_id("groups", group_name)
+
+    def _subject_id(self, subject_name):
+        return self._name_id("subjects", subject_name)
+
+    def _ids_filter(self, table, names):
+        """
+        Переводит фильтр по названиям в фильтр по id для _build_where.
+        None или пустой набор - без фильтра. Если ни одного названия нет в справочнике,
+        возвращается {0}: такого id нет, и фильтр не пропускает ни одной строки
+        """
+        if not names:
+            return None
+        ids = self._name_ids(table)
+        if any(name not in ids for name in names):
+            ids = self._reload_name_ids(table)
+        return {ids[name] for name in names if name in ids} or {0}
+
+    def _names_to_ids(self, values):
+        """
+        Заменяет в именованных значениях столбцов group_name/subject_name на group_id/subject_id.
+        Нужно для update_* методов, принимающих столбцы через **kwargs
+        """
+        converted = {}
+        for column, value in values.items():
+            if column == "group_name":
+                converted["group_id"] = self._group_id(value)
+            elif column == "subject_name":
+                converted["subject_id"] = self._subject_id(value)
+            else:
+                converted[column] = value
+        return converted
+
+    @staticmethod
+    def _build_in_filter(column, values):
+        """
+        Формирует условие "column IN (?, ?, ...)" и список параметров для него.
+        Большие наборы (больше IN_LIST_LIMIT) передаются одним JSON-параметром через json_each,
+        чтобы не упираться в лимит параметров SQLite.
+        Пустой или None набор значений означает отсутствие фильтра - возвращается ("", []).
+        """
+        if not values:
+            return "", []
+        values = list(values)
+        if len(values) > IN_LIST_LIMIT:
+            return f"{column} IN (SELECT value FROM json_each(?))", [json.dumps(values)]
+        placeholders = ", ".join("?" * len(values))
+        return f"{column} IN ({placeholders})", values
+
+    @classmethod
+    def _build_where(cls, conditions, params, filters):
+        """
+        Собирает WHERE из обязательных условий и фильтров по наборам значений.
+        :parameter conditions: Список условий с плейсхолдерами (например, ["semester = ?"])
+        :parameter params: Параметры для conditions
+        :parameter filters: Пары (column, values), values=None или пустой набор - без фильтра
+        Возвращает (строка "WHERE ..." или "", список параметров)
+        """
+        conditions = list(conditions)
+        params = list(params)
+        for column, values in filters:
+            condition, condition_params = cls._build_in_filter(column, values)
+            if condition:
+                conditions.append(condition)
+                params.extend(condition_params)
 
-        # Если результат не None, значит таблица существует
-        return result is not None
\ No newline at end of file
+        if not conditions:
+            return "", params
+        return f"WHERE {' AND '.join(conditions)}", params
@@ -0,0 +1,201 @@
+import csv
+import os
+from datetime import date, datetime
+
+from openpyxl import load_workbook
+
+from .hours_index import parse_hours
+
+# Допустимые заголовки столбцов файла импорта (без учёта регистра) -> поле записи
+IMPORT_HEADERS = {
+    "дата": "date", "date": "date",
+    "группа": "group", "group": "group",
+    "дисциплина": "subject", "предмет": "subject", "subject": "subject",
+    "часы": "hours", "hours": "hours",
+    "семестр": "semester", "semester": "semester",
+}
+REQUIRED_FIELDS = ("date", "group", "subject", "hours")
+
+# Строк в одной пачке executemany
+IMPORT_BATCH_SIZE = 5000
+
+REJECTED_HEADERS = ["Строка", "Причина", "Исходные значения"]
+
+
+class ImportResult:
+    """Итог импорта часов"""
+    def __init__(self):
+        # Количество записанных строк
+        self.imported = 0
+        # Отклонённые строки: (номер строки в файле, причина, исходные значения)
+        self.rejected = []
+        # Ошибка, из-за которой импорт не выполнен целиком (не найден заголовок, ошибка записи в БД)
+        self.error = None
+
+
+def iter_csv_rows(file_path, delimiter=None):
+    """
+    Построчно читает CSV/TSV (UTF-8, с BOM или без).
+    Если разделитель не указан, он определяется по началу файла: ',', ';' или табуляция
+    """
+    with open(file_path, newline="", encoding="utf-8-sig") as csv_file:
+        if delimiter is None:
+            sample = csv_file.read(64 * 1024)
+            csv_file.seek(0)
+            try:
+                delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+            except csv.Error:
+                delimiter = "\t" if file_path.lower().endswith(".tsv") else ","
+        yield from csv.reader(csv_file, delimiter=delimiter)
+
+
+def iter_xlsx_rows(file_path):
+    """Построчно читает первый лист книги Excel в режиме read_only: книга не загружается в память целиком"""
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from wb.worksheets[0].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def iter_import_rows(file_path):
+    """Строки файла импорта: .xlsx/.xlsm - книга Excel, остальное - CSV/TSV"""
+    if os.path.splitext(file_path)[1].lower() in (".xlsx", ".xlsm"):
+        return iter_xlsx_rows(file_path)
+    return iter_csv_rows(file_path)
+
+
+def parse_import_date(value):
+    """Дата из ячейки: date/datetime, строка 'YYYY-MM-DD' или 'DD.MM.YYYY'. Бросает ValueError"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    text = str(value).strip()
+    for date_format in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            pass
+    raise ValueError(f"некорректная дата '{text}'")
+
+
+def semester_for_date(work_date):
+    """Семестр по дате: сентябрь-декабрь - 1, январь-июнь - 2, летние месяцы - None"""
+    if work_date.month >= 9:
+        return 1
+    if work_date.month <= 6:
+        return 2
+    return None
+
+
+def import_hours(file_path, work_day_dao, group_dao, subject_dao, curriculum_dao, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Импорт часов из CSV/TSV или книги Excel.
+    Первая строка - заголовки: Дата, Группа, Дисциплина, Часы и необязательный Семестр
+    (без него семестр определяется по дате). Строка принимается, если группа, дисциплина и учебный план
+    группы по дисциплине в этом семестре есть в БД; проверки идут по множествам, прочитанным один раз.
+    Принятые строки пишутся пачками через executemany в одной транзакции: при ошибке записи
+    в БД не попадает ничего. Воскресенья принимаются так же, как при вводе в таблице.
+    Возвращает ImportResult
+    """
+    result = ImportResult()
+
+    # Справочники читаем один раз - дальше каждая строка проверяется поиском в множестве
+    groups = {row[0] for row in group_dao.get_all_groups()}
+    subjects = {row[0] for row in subject_dao.get_all_subjects()}
+    curricula = {(c[1], c[3], c[4]) for c in curriculum_dao.get_all_curriculums()}  # (semester, group, subject)
+
+    rows = iter_import_rows(file_path)
+    header = next(rows, None)
+    columns = {}
+    for index, title in enumerate(header or []):
+        field = IMPORT_HEADERS.get(str(title or "").strip().lower())
+        if field is not None and field not in columns:
+            columns[field] = index
+    missing = [field for field in REQUIRED_FIELDS if field not in columns]
+    if missing:
+        rows.close()
+        result.error = "В первой строке нет столбцов: Дата, Группа, Дисциплина, Часы"
+        return result
+
+    def cell(values, field):
+        index = columns.get(field)
+        if index is None or index >= len(values) or values[index] is None:
+            return ""
+        return values[index]
+
+    def parse_row(values):
+        """Возвращает (date, group, subject, semester, hours) или бросает ValueError с причиной"""
+        work_date = parse_import_date(cell(values, "date"))
+
+        group_name = str(cell(values, "group")).strip()
+        if group_name not in groups:
+            raise ValueError(f"нет группы '{group_name}'")
+        subject_name = str(cell(values, "subject")).strip()
+        if subject_name not in subjects:
+            raise ValueError(f"нет дисциплины '{subject_name}'")
+
+        semester_value = str(cell(values, "semester")).strip()
+        if semester_value:
+            semester = {"1": 1, "1.0": 1, "2": 2, "2.0": 2}.get(semester_value)
+            if semester is None:
+                raise ValueError(f"некорректный семестр '{semester_value}'")
+        else:
+            semester = semester_for_date(work_date)
+            if semester is None:
+                raise ValueError("дата вне учебного года, укажите семестр")
+
+        if (semester, group_name, subject_name) not in curricula:
+            raise ValueError(f"нет учебного плана: {group_name} - {subject_name}, {semester} семестр")
+
+        hours_value = str(cell(values, "hours"))
+        try:
+            hours = parse_hours(hours_value)
+        except ValueError:
+            raise ValueError(f"некорректные часы '{hours_value}'")
+        if hours is None:
+            raise ValueError("не указаны часы")
+        # Например, больше 655.34 ч за день в упакованном хранении
+        if not work_day_dao.hours_storable(hours):
+            raise ValueError(f"часы '{hours_value}' нельзя записать в БД")
+
+        return work_date, group_name, subject_name, semester, hours
+
+    def batches():
+        batch = []
+        # Нумерация строк как в файле: заголовок - строка 1
+        for line_number, values in enumerate(rows, 2):
+            if not any(value not in (None, "") for value in values):
+                continue  # пустые строки пропускаем молча
+            try:
+                batch.append(parse_row(values))
+            except ValueError as e:
+                result.rejected.append((line_number, str(e), list(values)))
+                continue
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # Строки, которые БД не примет (например, группу удалили во время импорта), DAO пропускает до записи.
+    # Номер строки файла для них уже неизвестен - в отчёте он остаётся пустым
+    skipped = []
+    written = work_day_dao.import_hours(batches(), skipped)
+    if written is None:
+        result.error = "Не удалось записать часы в БД, изменения отменены"
+    else:
+        result.imported = written
+        result.rejected.extend((None, reason, list(row)) for row, reason in skipped)
+    return result
+
+
+def write_rejected_rows_csv(file_path, rejected):
+    """Отчёт об отклонённых строках импорта в CSV (UTF-8 с BOM)"""
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(REJECTED_HEADERS)
+        for line_number, reason, values in rejected:
+            writer.writerow([line_number, reason] + ["" if value is None else value for value in values])
@@ -0,0 +1,172 @@
+import math
+from array import array
+
+
+def format_hours(hours):
+    """Отображение часов в ячейке: 2.0 -> '2', 2.5 -> '2.5'"""
+    return "" if hours is None else f"{hours:g}"
+
+
+def parse_hours(text):
+    """
+    Разбирает введённое значение часов.
+    Возвращает None для пустой строки (часы удаляются), иначе неотрицательное конечное число.
+    Бросает ValueError, если значение не является неотрицательным числом (в т.ч. для 'nan' и 'inf')
+    """
+    text = text.strip()
+    if not text:
+        return None
+    hours = float(text.replace(",", "."))
+    if not math.isfinite(hours):
+        raise ValueError("Часы должны быть конечным числом.")
+    if hours < 0:
+        raise ValueError("Часы не могут быть отрицательными.")
+    return hours
+
+
+class HoursIndex:
+    """
+    Индекс проведённых часов семестра в памяти.
+    Ключ - (group_name, subject_name, semester, date), где date - строка 'YYYY-MM-DD'
+    """
+    def __init__(self, semester):
+        self.semester = semester
+        self._hours = {}
+
+    @classmethod
+    def from_dao(cls, work_day_dao, semester, group_names=None, subject_names=None):
+        """
+        Строит индекс за один проход по рабочим дням семестра.
+        Фильтры по группам и предметам применяются в SQL - читаются только нужные записи
+        """
+        index = cls(semester)
+        hours = index._hours
+        rows = work_day_dao.get_hours_by_semester(semester, group_names, subject_names)
+        for date_str, subject_name, group_name, hours_value in rows:
+            hours[(group_name, subject_name, semester, date_str)] = hours_value
+        return index
+
+    @staticmethod
+    def _date_key(work_date):
+        """Приводит дату к строковому виду, в котором она хранится в БД"""
+        return work_date if isinstance(work_date, str) else work_date.isoformat()
+
+    def get(self, group_name, subject_name, work_date):
+        """Возвращает часы за день или None, если записи нет"""
+        return self._hours.get((group_name, subject_name, self.semester, self._date_key(work_date)))
+
+    def set(self, group_name, subject_name, work_date, hours):
+        """Обновляет часы за день"""
+        self._hours[(group_name, subject_name, self.semester, self._date_key(work_date))] = hours
+
+    def remove(self, group_name, subject_name, work_date):
+        """Удаляет запись о часах за день, если она есть"""
+        self._hours.pop((group_name, subject_name, self.semester, self._date_key(work_date)), None)
+
+    def __len__(self):
+        return len(self._hours)
+
+
+class MonthHoursStore:
+    """
+    Часы одного месяца в плотном массиве: строка - учебный план (группа, предмет), столбец - рабочий день.
+    Пустая ячейка хранится как NaN
+    """
+    def __init__(self, rows, dates, hours_index=None):
+        """
+        :parameter rows: Список (group_name, subject_name) - по строке на учебный план
+        :parameter dates: Список рабочих дней месяца (datetime.date)
+        :parameter hours_index: HoursIndex, из которого заполняются ячейки (None - пустой месяц)
+        """
+        self.rows = list(rows)
+        self.dates = list(dates)
+        self.date_keys = [work_date.isoformat() for work_date in self.dates]
+        self._values = array("d", [math.nan]) * (len(self.rows) * len(self.dates))
+
+        # Поисковый индекс: текст строки в нижнем регистре (группа, предмет, часы), None - не построен или устарел
+        self._search_texts = [None] * len(self.rows)
+        # Результат прошлого поиска и строки, изменённые после него
+        self._last_query = None
+        self._last_matches = set()
+        self._edited_rows = set()
+
+        if hours_index is not None:
+            self.fill_from_index(hours_index)
+
+    def fill_from_index(self, hours_index):
+        """Заполняет массив часами из индекса семестра"""
+        column_count = len(self.date_keys)
+        values = self._values
+        for row, (group_name, subject_name) in enumerate(self.rows):
+            offset = row * column_count
+            for col, date_key in enumerate(self.date_keys):
+                hours = hours_index.get(group_name, subject_name, date_key)
+                if hours is not None:
+                    values[offset + col] = hours
+
+    def row_count(self):
+        return len(self.rows)
+
+    def column_count(self):
+        return len(self.dates)
+
+    def get(self, row, col):
+        """Возвращает часы в ячейке или None для пустой ячейки"""
+        value = self._values[row * len(self.dates) + col]
+        return None if math.isnan(value) else value
+
+    def set(self, row, col, hours):
+        """Записывает часы в ячейку, None очищает её"""
+        self._values[row * len(self.dates) + col] = math.nan if hours is None else hours
+        # Текст строки для поиска изменился
+        self._search_texts[row] = None
+        self._edited_rows.add(row)
+
+    def search_text(self, row):
+        """Текст строки для поиска: группа, предмет и часы месяца в нижнем регистре через перевод строки"""
+        text = self._search_texts[row]
+        if text is None:
+            group_name, subject_name = self.rows[row]
+            parts = [group_name.lower(), subject_name.lower()]
+            offset = row * len(self.dates)
+            for value in self._values[offset:offset + len(self.dates)]:
+                if not math.isnan(value):
+                    parts.append(format_hours(value))
+            text = "\n".join(parts)
+            self._search_texts[row] = text
+        return text
+
+    def match_rows(self, query):
+        """
+        Возвращает множество строк, в группе, предмете или часах которых есть query (в нижнем регистре).
+        Если query продолжает прошлый запрос, проверяются только прошлые совпадения и изменённые с тех пор строки
+        """
+        if self._last_query is not None and query.startswith(self._last_query):
+            candidates = self._last_matches | self._edited_rows
+        else:
+            candidates = range(len(self.rows))
+
+        # Перевод строки разделяет части текста и не может встретиться в запросе из строки поиска
+        matches = {row for row in candidates if query in self.search_text(row)}
+
+        self._last_query = query
+        self._last_matches = matches
+        self._edited_rows = set()
+        return matches
+
+
+def load_semester_grid(work_day_dao, curriculum_dao, semester, group_names=None, subject_names=None):
+    """
+    Загружает данные для таблиц месяцев семестра.
+    Возвращает (HoursIndex, rows), где rows - список (group_name, subject_name) по учебным планам.
+    :parameter group_names: Набор групп для фильтрации (None или пустой набор - без фильтра)
+    :parameter subject_names: Набор предметов для фильтрации (None или пустой набор - без фильтра)
+    """
+    # Строим индекс часов семестра один раз - он общий для всех таблиц месяцев
+    hours_index = HoursIndex.from_dao(work_day_dao, semester, group_names, subject_names)
+
+    # Фильтры применяются в SQL: отфильтрованный вид читает только свои учебные планы
+    curriculums = curriculum_dao.get_curriculums_by_semester(semester, group_names, subject_names)
+    rows = [(curriculum[3], curriculum[4]) for curriculum in curriculums]
+
+    return hours_index, rows
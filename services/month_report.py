@@ -0,0 +1,335 @@
+import calendar
+import csv
+from datetime import date
+
+from .excel_export import (LEADING_HEADERS, TRAILING_HEADERS, MonthReportTable, report_column_widths,
+                           write_report_workbook)
+
+# Номера месяцев по названиям
+MONTH_NUMBERS = {
+    "Январь": 1, "Февраль": 2, "Март": 3, "Апрель": 4,
+    "Май": 5, "Июнь": 6, "Июль": 7, "Август": 8,
+    "Сентябрь": 9, "Октябрь": 10, "Ноябрь": 11, "Декабрь": 12
+}
+
+# Месяцы учебного года по полугодиям в порядке следования
+FIRST_HALF_MONTHS = ["Сентябрь", "Октябрь", "Ноябрь", "Декабрь"]
+SECOND_HALF_MONTHS = ["Январь", "Февраль", "Март", "Апрель", "Май", "Июнь"]
+ACADEMIC_YEAR_MONTHS = FIRST_HALF_MONTHS + SECOND_HALF_MONTHS
+
+# Разделители текстовых отчётов по расширению файла
+CSV_DELIMITERS = {".csv": ",", ".tsv": "\t"}
+
+
+def current_first_half_year(today=None):
+    """Год начала текущего учебного года: учебный год начинается 1 сентября"""
+    today = today or date.today()
+    return today.year if today.month >= 9 else today.year - 1
+
+
+def semester_title(month_name):
+    """Возвращает '1 полугодие' или '2 полугодие' для указанного месяца"""
+    if month_name in FIRST_HALF_MONTHS:
+        return "1 полугодие"
+    elif month_name in SECOND_HALF_MONTHS:
+        return "2 полугодие"
+    return "Неизвестное полугодие"
+
+
+def build_month_titles(first_half_year, month_names):
+    """Заголовки таблиц отчёта для месяцев учебного года: список (month_name, year_title, caption)"""
+    year_title = f"{first_half_year}/{first_half_year + 1} учебный год"
+    return [
+        (month_name, year_title, f"Учет проведенных занятий в {semester_title(month_name)} — {month_name}")
+        for month_name in month_names
+    ]
+
+
+def month_year(first_half_year, month_name):
+    """
+    Возвращает (год, номер месяца) для месяца учебного года или None для неизвестного месяца.
+    Сентябрь-декабрь относятся к году первого полугодия, остальные месяцы - к следующему
+    """
+    month_num = MONTH_NUMBERS.get(month_name, 0)
+    if not month_num:
+        return None
+
+    year = first_half_year if month_num >= 9 else first_half_year + 1
+    return year, month_num
+
+
+def month_date_range(first_half_year, month_name):
+    """Возвращает (первый день, последний день) месяца учебного года или None для неизвестного месяца"""
+    year_month = month_year(first_half_year, month_name)
+    if year_month is None:
+        return None
+
+    year, month_num = year_month
+    return date(year, month_num, 1), date(year, month_num, calendar.monthrange(year, month_num)[1])
+
+
+def working_days_in_month(first_half_year, month_name):
+    """Возвращает список рабочих дней (без воскресений) для указанного месяца учебного года"""
+    year_month = month_year(first_half_year, month_name)
+    if year_month is None:
+        return []
+
+    year, month_num = year_month
+
+    # Собираем даты месяца, исключая воскресенья
+    days = []
+    for day in range(1, calendar.monthrange(year, month_num)[1] + 1):
+        if date(year, month_num, day).weekday() != 6:  # 6 — воскресенье
+            days.append(day)
+
+    return days
+
+
+def month_table_row(total_plan, subject, group, daily_hours, working_days):
+    """
+    Строка таблицы месяца: [всего ч., дисциплина, группа, часы по рабочим дням..., прошло, осталось]
+    :parameter daily_hours: {день месяца: часы}
+    :parameter working_days: Рабочие дни месяца (без воскресений) - столбцы таблицы
+    """
+    row = [total_plan, subject, group]  # I полугодие, дисциплина, группа
+
+    # Воскресений нет среди столбцов дней, поэтому их часы в таблицу не попадут
+    row.extend(daily_hours.get(day, 0) for day in working_days)
+
+    # Прошло и Осталось
+    total_in_month = sum(daily_hours.get(d, 0) for d in working_days)
+    remaining = max(0, total_plan - total_in_month)
+
+    row.append(total_in_month)
+    row.append(remaining)
+    return row
+
+
+def build_months_data(work_day_dao, curriculum_dao, first_half_year, month_names):
+    """
+    Возвращает строки таблиц для нескольких месяцев учебного года: {month_name: rows},
+    строка - [всего ч., дисциплина, группа, часы по рабочим дням..., прошло, осталось].
+    Часы всех месяцев читаются одним сгруппированным запросом и раскладываются по месяцам за один проход,
+    поэтому отчёт за весь учебный год стоит примерно столько же, сколько отчёт за один месяц
+    """
+    # 'YYYY-MM' -> название месяца
+    month_keys = {}
+    date_ranges = []
+    for month_name in month_names:
+        date_range = month_date_range(first_half_year, month_name)
+        if date_range is None:
+            continue
+        month_keys[date_range[0].strftime("%Y-%m")] = month_name
+        date_ranges.append(date_range)
+
+    months_data = {month_name: [] for month_name in month_names}
+    if not date_ranges:
+        return months_data
+
+    # Один запрос на весь период выбранных месяцев
+    start = min(date_range[0] for date_range in date_ranges)
+    end = max(date_range[1] for date_range in date_ranges)
+    daily_hours_rows = work_day_dao.get_daily_hours_in_range(start, end)
+
+    # Карта: (group, subject) -> total_hour
+    curricula = curriculum_dao.get_all_curriculums()
+    curriculum_map = {(c[3], c[4]): c[2] for c in curricula}  # (group_name, subject_name) -> total_hour
+
+    # Рабочие дни (без воскресений) считаем один раз на месяц, а не на каждую строку
+    working_days_by_month = {month_name: working_days_in_month(first_half_year, month_name) for month_name in month_names}
+
+    def append_row(month_name, group, subject, daily_hours):
+        # Первый столбец — общее число часов по предмету у группы в плане
+        total_plan = curriculum_map.get((group, subject), 0)
+        months_data[month_name].append(
+            month_table_row(total_plan, subject, group, daily_hours, working_days_by_month[month_name])
+        )
+
+    # Строки отсортированы по (месяц, группа, предмет, день): строка таблицы закрывается при смене ключа
+    current_key = None
+    daily_hours = {}
+    for month_key, day, group, subject, hours in daily_hours_rows:
+        key = (month_key, group, subject)
+        if key != current_key:
+            if current_key is not None and current_key[0] in month_keys:
+                append_row(month_keys[current_key[0]], current_key[1], current_key[2], daily_hours)
+            current_key = key
+            daily_hours = {}
+        daily_hours[day] = hours
+
+    if current_key is not None and current_key[0] in month_keys:
+        append_row(month_keys[current_key[0]], current_key[1], current_key[2], daily_hours)
+
+    return months_data
+
+
+def build_month_tables(months_data, first_half_year, month_titles):
+    """
+    Раскладка отчёта по уже собранным данным месяцев.
+    :parameter months_data: {month_name: rows}, см. build_months_data
+    :parameter month_titles: Список (month_name, year_title, caption) в порядке вывода в отчёт
+    Возвращает (список MonthReportTable, {номер столбца: ширина})
+    """
+    working_days_by_month = {
+        month_name: working_days_in_month(first_half_year, month_name) for month_name, _, _ in month_titles
+    }
+
+    # Ширины столбцов считаем по уже известным данным: названиям и количеству дней
+    column_widths = report_column_widths(
+        [len(working_days) for working_days in working_days_by_month.values()],
+        {row[1] for rows in months_data.values() for row in rows},
+        {row[2] for rows in months_data.values() for row in rows}
+    )
+
+    month_tables = [
+        MonthReportTable(year_title, caption, working_days_by_month[month_name], months_data.get(month_name, []))
+        for month_name, year_title, caption in month_titles
+    ]
+    return month_tables, column_widths
+
+
+def write_month_report(file_path, work_day_dao, curriculum_dao, first_half_year, month_titles,
+                       progress_callback=None):
+    """
+    Собирает данные месяцев и записывает отчёт Excel.
+    :parameter month_titles: Список (month_name, year_title, caption) в порядке вывода в отчёт
+    :parameter progress_callback: Вызывается после каждого месяца с (записано месяцев, название месяца);
+    если вернёт False, запись прерывается
+    Возвращает True, если отчёт записан, и False, если запись прервана
+    """
+    month_names = [month_name for month_name, _, _ in month_titles]
+
+    # Данные всех выбранных месяцев - одним запросом
+    months_data = build_months_data(work_day_dao, curriculum_dao, first_half_year, month_names)
+    month_tables, column_widths = build_month_tables(months_data, first_half_year, month_titles)
+
+    table_progress = None
+    if progress_callback is not None:
+        # Таблицы пишутся в порядке month_titles - по числу записанных находим название месяца
+        table_progress = lambda written, caption: progress_callback(written, month_names[written - 1])
+    return write_report_workbook(file_path, month_tables, column_widths, table_progress)
+
+
+def iter_month_report_rows(work_day_dao, curriculum_dao, report_months):
+    """
+    Построчно отдаёт таблицы месяцев в раскладке отчёта Excel: заголовок, шапка, строки данных, пустая строка.
+    Часы читаются из курсора одного запроса по мере обхода, так что в памяти одновременно
+    только строка текущей пары (группа, дисциплина) - размер выгрузки не ограничен памятью.
+    :parameter report_months: Список (first_half_year, month_name, year_title, caption);
+    месяцы могут относиться к разным учебным годам и выводятся в хронологическом порядке
+    """
+    tables = []
+    for first_half_year, month_name, year_title, caption in report_months:
+        date_range = month_date_range(first_half_year, month_name)
+        if date_range is None:
+            continue
+        tables.append((date_range, first_half_year, month_name, year_title, caption))
+    if not tables:
+        return
+
+    # Строки запроса упорядочены по месяцу - таблицы идут в том же порядке
+    tables.sort(key=lambda table: table[0][0])
+
+    # Карта: (group, subject) -> total_hour; учебных планов немного, их читаем целиком
+    curricula = curriculum_dao.get_all_curriculums()
+    curriculum_map = {(c[3], c[4]): c[2] for c in curricula}
+
+    start = tables[0][0][0]
+    end = max(table[0][1] for table in tables)
+    daily_hours_rows = work_day_dao.iter_daily_hours_in_range(start, end)
+    pending = next(daily_hours_rows, None)
+
+    for date_range, first_half_year, month_name, year_title, caption in tables:
+        month_key = date_range[0].strftime("%Y-%m")
+        working_days = working_days_in_month(first_half_year, month_name)
+
+        yield [year_title, "", caption]
+        yield LEADING_HEADERS + [str(day) for day in working_days] + TRAILING_HEADERS
+
+        # Пропускаем часы месяцев, которых нет в отчёте
+        while pending is not None and pending[0] < month_key:
+            pending = next(daily_hours_rows, None)
+
+        # Строки отсортированы по (группа, предмет, день): строка таблицы закрывается при смене пары
+        current_key = None
+        daily_hours = {}
+        while pending is not None and pending[0] == month_key:
+            _, day, group, subject, hours = pending
+            if (group, subject) != current_key:
+                if current_key is not None:
+                    yield month_table_row(curriculum_map.get(current_key, 0), current_key[1], current_key[0],
+                                          daily_hours, working_days)
+                current_key = (group, subject)
+                daily_hours = {}
+            daily_hours[day] = hours
+            pending = next(daily_hours_rows, None)
+
+        if current_key is not None:
+            yield month_table_row(curriculum_map.get(current_key, 0), current_key[1], current_key[0],
+                                  daily_hours, working_days)
+
+        # Пустая строка между таблицами
+        yield []
+
+    # Закрываем курсор, если остались непрочитанные строки после последнего месяца
+    daily_hours_rows.close()
+
+
+def write_month_rows_csv(file_path, month_rows, delimiter=",", progress_callback=None):
+    """
+    Записывает строки отчёта в CSV (UTF-8 с BOM - файл открывается в Excel с кириллицей).
+    :parameter month_rows: Генератор строк, см. iter_month_report_rows
+    :parameter delimiter: "," для CSV, "\t" для TSV
+    :parameter progress_callback: Вызывается после каждой таблицы с числом записанных таблиц;
+    если вернёт False, запись прерывается
+    Возвращает True, если отчёт записан, и False, если запись прервана
+    """
+    tables_written = 0
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as csv_file:
+        writer = csv.writer(csv_file, delimiter=delimiter)
+        for row in month_rows:
+            writer.writerow(row)
+            # Пустая строка закрывает таблицу месяца
+            if not row:
+                tables_written += 1
+                if progress_callback is not None and progress_callback(tables_written) is False:
+                    month_rows.close()
+                    return False
+    return True
+
+
+def write_month_report_csv(file_path, work_day_dao, curriculum_dao, first_half_year, month_titles, delimiter=",",
+                           progress_callback=None):
+    """
+    Записывает отчёт по месяцам одного учебного года в CSV/TSV в той же раскладке, что и отчёт Excel.
+    :parameter month_titles: Список (month_name, year_title, caption)
+    :parameter progress_callback: Вызывается после каждого месяца с (записано месяцев, название месяца);
+    если вернёт False, запись прерывается
+    Возвращает True, если отчёт записан, и False, если запись прервана
+    """
+    # Месяцы в хронологическом порядке, как их выводит iter_month_report_rows
+    report_months = sorted(
+        ((first_half_year, month_name, year_title, caption) for month_name, year_title, caption in month_titles
+         if month_year(first_half_year, month_name) is not None),
+        key=lambda report_month: month_year(first_half_year, report_month[1])
+    )
+    month_rows = iter_month_report_rows(work_day_dao, curriculum_dao, report_months)
+
+    table_progress = None
+    if progress_callback is not None:
+        table_progress = lambda written: progress_callback(written, report_months[written - 1][1])
+    return write_month_rows_csv(file_path, month_rows, delimiter, table_progress)
+
+
+def write_years_report_csv(file_path, work_day_dao, curriculum_dao, first_half_years, month_names, delimiter=","):
+    """
+    Выгрузка за несколько учебных лет в один CSV/TSV: для каждого года - таблицы выбранных месяцев
+    с заголовками своего учебного года
+    :parameter first_half_years: Годы начала учебных лет
+    """
+    report_months = [
+        (first_half_year, month_name, year_title, caption)
+        for first_half_year in first_half_years
+        for month_name, year_title, caption in build_month_titles(first_half_year, month_names)
+    ]
+    write_month_rows_csv(file_path, iter_month_report_rows(work_day_dao, curriculum_dao, report_months), delimiter)
@@ -0,0 +1,572 @@
+import math
+import struct
+from datetime import date as date_type
+
+from .work_day_services import EPOCH_ORDINAL, UPSERT_HOURS_QUERY, WorkDayDAO
+
+# Упакованное хранение часов: одна запись на (семестр, группа, предмет, месяц) вместо записи на каждый день.
+# Часы за дни месяца лежат в BLOB массивом из 31 числа uint16 (little-endian) в сотых долях часа,
+# NO_HOURS - в этот день записи нет. Часы округляются до сотых, наибольшее значение за день - 655.34
+PACKED_DAYS = 31
+HOURS_SCALE = 100
+NO_HOURS = 0xFFFF
+MONTH_HOURS = struct.Struct(f"<{PACKED_DAYS}H")
+
+# Записи дня в упакованном хранении нет своего id - он составляется из id месяца и дня:
+# id месяца * ID_DAY_FACTOR + день
+ID_DAY_FACTOR = 32
+
+# Формат хранения часов записывается в таблицу meta: 'rows' (workDays, по умолчанию) или 'packed' (workDaysPacked)
+STORAGE_META_KEY = "work_days_storage"
+ROWS_STORAGE = "rows"
+PACKED_STORAGE = "packed"
+SET_STORAGE_QUERY = """
+    INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value
+"""
+
+# Строки месяцев: (id, month, subject_name, group_name, semester, hours)
+PACKED_COLUMNS = "p.id, p.month, s.name, g.name, p.semester, p.hours"
+PACKED_TABLES = "workDaysPacked p JOIN groups g ON g.id = p.group_id JOIN subjects s ON s.id = p.subject_id"
+
+SELECT_MONTH_QUERY = """
+    SELECT id, hours FROM workDaysPacked WHERE semester = ? AND group_id = ? AND subject_id = ? AND month = ?
+"""
+UPSERT_MONTH_QUERY = """
+    INSERT INTO workDaysPacked (semester, group_id, subject_id, month, hours, total_hours) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (semester, group_id, subject_id, month)
+    DO UPDATE SET hours = excluded.hours, total_hours = excluded.total_hours
+"""
+DELETE_MONTH_QUERY = """DELETE FROM workDaysPacked WHERE id = ?"""
+
+# Часы по дням за месяцы периода, упорядоченные как DAILY_HOURS_QUERY построчного хранения
+DAILY_PACKED_QUERY = f"""
+    SELECT p.month, g.name, s.name, p.group_id, p.subject_id, p.hours
+    FROM {PACKED_TABLES}
+    WHERE p.month BETWEEN ? AND ?
+    ORDER BY p.month, g.name, s.name
+"""
+
+
+def _scaled_to_hours(value):
+    """Сотые доли часа -> часы; целые часы - int, как их отдаёт столбец INTEGER построчного хранения"""
+    return value // HOURS_SCALE if value % HOURS_SCALE == 0 else value / HOURS_SCALE
+
+
+def pack_month_hours(day_hours):
+    """
+    {день месяца: часы} -> (BLOB, сумма часов месяца).
+    Бросает ValueError, если часы не помещаются в формат
+    """
+    values = [NO_HOURS] * PACKED_DAYS
+    for day, hours in day_hours.items():
+        scaled = round(hours * HOURS_SCALE)
+        if not 0 <= scaled < NO_HOURS:
+            raise ValueError(f"часы {hours} не помещаются в упакованный формат")
+        values[day - 1] = scaled
+    total = sum(value for value in values if value != NO_HOURS)
+    return MONTH_HOURS.pack(*values), _scaled_to_hours(total)
+
+
+def unpack_month_hours(blob):
+    """BLOB -> {день месяца: часы} для дней, за которые есть запись"""
+    return {day: _scaled_to_hours(value)
+            for day, value in enumerate(MONTH_HOURS.unpack(blob), 1) if value != NO_HOURS}
+
+
+def _month_start(month):
+    """Номер дня (с 1970-01-01) первого числа месяца 'YYYY-MM'"""
+    return date_type(int(month[:4]), int(month[5:7]), 1).toordinal() - EPOCH_ORDINAL
+
+
+def is_packed_storage(connection):
+    """Хранятся ли часы БД в упакованном виде - по формату, записанному в meta конвертером"""
+    try:
+        row = connection.execute("SELECT value FROM meta WHERE key = ?", (STORAGE_META_KEY,)).fetchone()
+        return row is not None and row[0] == PACKED_STORAGE
+    except Exception as e:
+        print(f"Не удалось определить формат хранения часов: {e}")
+        return False
+
+
+def create_work_day_dao(db_filename=None, connection=None):
+    """
+    DAO часов для формата хранения БД: PackedWorkDayDAO для сконвертированной БД, иначе WorkDayDAO.
+    Параметры - как у WorkDayDAO
+    """
+    work_day_dao = WorkDayDAO(db_filename, connection)
+    if work_day_dao._connection is not None and is_packed_storage(work_day_dao._connection):
+        return PackedWorkDayDAO(db_filename, work_day_dao._connection)
+    return work_day_dao
+
+
+class PackedWorkDayDAO(WorkDayDAO):
+    """
+    Часы в упакованном хранении workDaysPacked с тем же интерфейсом, что у WorkDayDAO:
+    методы принимают и возвращают записи отдельных дней в прежнем виде
+    (id, date, subject_name, group_name, semester, hours, day_number).
+    Выборка месяца читает по одной записи на группу и предмет вместо записи на каждый день.
+    Запись дня - чтение, изменение и перезапись BLOB месяца
+    """
+
+    def hours_storable(self, hours) -> bool:
+        """Можно ли записать часы за день: кроме проверок WorkDayDAO, часы должны поместиться в формат месяца"""
+        return super().hours_storable(hours) and round(hours * HOURS_SCALE) < NO_HOURS
+
+    def _expand(self, month_rows, start_day=None, end_day=None):
+        """
+        Разворачивает строки месяцев (PACKED_COLUMNS) в записи дней.
+        :parameter start_day: Номер дня (с 1970-01-01), раньше которого записи пропускаются (None - без границы)
+        :parameter end_day: Номер дня, позже которого записи пропускаются (None - без границы)
+        """
+        work_days = []
+        for month_id, month, subject_name, group_name, semester, blob in month_rows:
+            month_start = _month_start(month)
+            for day, hours in unpack_month_hours(blob).items():
+                day_number = month_start + day - 1
+                if start_day is not None and day_number < start_day:
+                    continue
+                if end_day is not None and day_number > end_day:
+                    continue
+                work_days.append((month_id * ID_DAY_FACTOR + day, f"{month}-{day:02d}", subject_name, group_name,
+                                  semester, hours, day_number))
+        return work_days
+
+    def _select_work_days(self, where="", params=(), start_day=None, end_day=None):
+        """Записи дней из строк месяцев, отобранных условием where. Ошибки обрабатывает вызывающий метод"""
+        month_rows = self.cursor.execute(f"SELECT {PACKED_COLUMNS} FROM {PACKED_TABLES} {where}", params).fetchall()
+        return self._expand(month_rows, start_day, end_day)
+
+    def _write_days(self, changes):
+        """
+        Применяет изменения часов к упакованным месяцам без фиксации транзакции.
+        :parameter changes: Набор (semester, group_id, subject_id, date 'YYYY-MM-DD', hours), hours=None - удаление
+        Изменения одного месяца собираются вместе - BLOB каждого месяца читается и перезаписывается один раз.
+        Месяц, в котором не осталось часов, удаляется
+        """
+        months = {}
+        for semester, group_id, subject_id, work_date, hours in changes:
+            if group_id is None or subject_id is None:
+                raise ValueError(f"нет группы или предмета для записи за {work_date}")
+            # Проверка даты: в BLOB месяца день задаётся только числом
+            date_type.fromisoformat(work_date)
+            months.setdefault((semester, group_id, subject_id, work_date[:7]), {})[int(work_date[8:10])] = hours
+
+        for key, day_changes in months.items():
+            row = self.cursor.execute(SELECT_MONTH_QUERY, key).fetchone()
+            day_hours = unpack_month_hours(row[1]) if row else {}
+            for day, hours in day_changes.items():
+                if hours is None:
+                    day_hours.pop(day, None)
+                else:
+                    day_hours[day] = hours
+
+            if day_hours:
+                self.cursor.execute(UPSERT_MONTH_QUERY, key + pack_month_hours(day_hours))
+            elif row:
+                self.cursor.execute(DELETE_MONTH_QUERY, (row[0],))
+
+    def _day_hours(self, semester, group_id, subject_id, work_date):
+        """(id записи дня, часы) или None, если за этот день записи нет"""
+        row = self.cursor.execute(SELECT_MONTH_QUERY, (semester, group_id, subject_id, work_date[:7])).fetchone()
+        if row is None:
+            return None
+        day = int(work_date[8:10])
+        hours = unpack_month_hours(row[1]).get(day)
+        if hours is None:
+            return None
+        return row[0] * ID_DAY_FACTOR + day, hours
+
+    def create_work_day(self, date, subject_name, group_name, semester, hours) -> tuple | None:
+        """Заполнение одного рабочего дня"""
+
+        try:
+            date = self._date_to_str(date)
+            group_id = self._group_id(group_name)
+            subject_id = self._subject_id(subject_name)
+            # Как уникальный индекс построчного хранения: вторая запись за тот же день - ошибка
+            if self._day_hours(semester, group_id, subject_id, date) is not None:
+                raise ValueError(f"запись за {date} уже есть")
+            self._write_days([(semester, group_id, subject_id, date, hours)])
+            self._connection.commit()
+
+            work_day_id, _ = self._day_hours(semester, group_id, subject_id, date)
+            return self.get_work_day_by_id(work_day_id)
+        except Exception as e:
+            print(f"Произошла ошибка при заполнении рабочего дня: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def upsert_hours(self, date, group_name, subject_name, semester, hours) -> tuple | None:
+        """
+        Записывает часы за день: добавляет день в месяц или меняет его часы.
+        Возвращает (date, group_name, subject_name, semester, hours) или None при ошибке
+        """
+
+        date = self._date_to_str(date)
+        try:
+            self._write_days([(semester, self._group_id(group_name), self._subject_id(subject_name), date, hours)])
+            self._connection.commit()
+            return date, group_name, subject_name, semester, hours
+        except Exception as e:
+            print(f"Произошла ошибка при записи часов за {date}: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def delete_hours(self, date, group_name, subject_name, semester) -> tuple | None:
+        """
+        Удаление часов за день по ключу (дата, группа, предмет, семестр).
+        Возвращает ключ удалённой записи или None, если записи не было
+        """
+
+        date = self._date_to_str(date)
+        try:
+            group_id = self._group_id(group_name)
+            subject_id = self._subject_id(subject_name)
+            if self._day_hours(semester, group_id, subject_id, date) is None:
+                return None
+            self._write_days([(semester, group_id, subject_id, date, None)])
+            self._connection.commit()
+            return date, group_name, subject_name, semester
+        except Exception as e:
+            print(f"Произошла ошибка при удалении часов за {date}: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def apply_hours(self, changes) -> int | None:
+        """
+        Применяет пачку изменений часов в одной транзакции.
+        :parameter changes: Набор (date, group_name, subject_name, semester, hours), hours=None означает удаление
+        Возвращает количество применённых изменений или None при ошибке (транзакция откатывается)
+        """
+
+        if not changes:
+            return 0
+        try:
+            self._write_days([
+                (semester, self._group_id(group_name), self._subject_id(subject_name), self._date_to_str(date), hours)
+                for date, group_name, subject_name, semester, hours in changes
+            ])
+            self._connection.commit()
+            return len(changes)
+        except Exception as e:
+            print(f"Произошла ошибка при записи пачки часов: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def import_hours(self, batches, rejected=None) -> int | None:
+        """
+        Массовая запись часов: все пачки пишутся в одной транзакции, месяцы каждой пачки перезаписываются один раз.
+        :parameter batches: Итерируемый набор пачек (date, group_name, subject_name, semester, hours)
+        :parameter rejected: Как у WorkDayDAO.import_hours - сюда попадают строки, которые нельзя записать
+        Возвращает количество записанных строк или None при ошибке (транзакция откатывается целиком)
+        """
+
+        written = 0
+        try:
+            for batch in batches:
+                rows = self._resolve_import_batch(batch, rejected)
+                self._write_days([
+                    (semester, group_id, subject_id, date, hours)
+                    for date, group_id, subject_id, semester, hours in rows
+                ])
+                written += len(rows)
+            self._connection.commit()
+            return written
+        except Exception as e:
+            print(f"Произошла ошибка при массовой записи часов: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def get_work_day_by_id(self, work_day_id) -> tuple:
+        """Строгий поиск рабочего дня по его id"""
+
+        try:
+            for work_day in self._select_work_days("WHERE p.id = ?", (work_day_id // ID_DAY_FACTOR,)):
+                if work_day[0] == work_day_id:
+                    return work_day
+            return None
+        except Exception as e:
+            print(f"Произошла ошибка при получении рабочего дня по его id - {work_day_id}: {e}")
+            return ()
+
+    def get_all_work_days(self) -> list:
+        """Получение всех рабочих дней"""
+
+        try:
+            return self._select_work_days()
+        except Exception as e:
+            print(f"Произошла ошибка при получении всех рабочих дней: {e}")
+            return []
+
+    def get_work_days_in_range(self, start, end, semester=None) -> list:
+        """
+        Получение рабочих дней за период [start, end] включительно - диапазон месяцев по индексу month
+        :parameter start: Первый день периода (date или строка 'YYYY-MM-DD')
+        :parameter end: Последний день периода (date или строка 'YYYY-MM-DD')
+        :parameter semester: Семестр (None - все семестры)
+        """
+
+        start = self._date_to_str(start)
+        end = self._date_to_str(end)
+        conditions = ["p.month BETWEEN ? AND ?"]
+        params = [start[:7], end[:7]]
+        if semester is not None:
+            conditions.append("p.semester = ?")
+            params.append(semester)
+
+        where, params = self._build_where(conditions, params, [])
+        try:
+            work_days = self._select_work_days(where, params, self._day_number(start), self._day_number(end))
+            work_days.sort(key=lambda work_day: work_day[6])
+            return work_days
+        except Exception as e:
+            print(f"Произошла ошибка при получении рабочих дней за период {start} - {end}: {e}")
+            return []
+
+    def _iter_daily_hours(self, cursor, start, end):
+        """
+        Часы по дням за период из строк месяцев: (month_key, day, group_name, subject_name, sum_of_hours).
+        Строки разных семестров одной группы и предмета в месяце идут подряд и складываются по дням
+        """
+        start = self._date_to_str(start)
+        end = self._date_to_str(end)
+        start_day = self._day_number(start)
+        end_day = self._day_number(end)
+
+        def month_days(month, day_sums):
+            month_start = _month_start(month)
+            for day in sorted(day_sums):
+                if start_day <= month_start + day - 1 <= end_day:
+                    yield day, day_sums[day]
+
+        current_key = None
+        current_names = None
+        day_sums = {}
+        for month, group_name, subject_name, group_id, subject_id, blob in cursor.execute(
+                DAILY_PACKED_QUERY, (start[:7], end[:7])):
+            key = (month, group_id, subject_id)
+            if key != current_key:
+                if current_key is not None:
+                    for day, hours in month_days(current_key[0], day_sums):
+                        yield (current_key[0], day) + current_names + (hours,)
+                current_key = key
+                current_names = (group_name, subject_name)
+                day_sums = {}
+            for day, hours in unpack_month_hours(blob).items():
+                day_sums[day] = day_sums.get(day, 0) + hours
+
+        if current_key is not None:
+            for day, hours in month_days(current_key[0], day_sums):
+                yield (current_key[0], day) + current_names + (hours,)
+
+    def get_daily_hours_in_range(self, start, end) -> list:
+        """
+        Часы за период [start, end] по месяцу, группе, предмету и дню:
+        (month_key, day, group_name, subject_name, sum_of_hours), в том же порядке, что у WorkDayDAO
+        """
+
+        try:
+            return list(self._iter_daily_hours(self.cursor, start, end))
+        except Exception as e:
+            print(f"Произошла ошибка при подсчёте часов по дням за период {start} - {end}: {e}")
+            return []
+
+    def iter_daily_hours_in_range(self, start, end):
+        """То же, что get_daily_hours_in_range, но строки месяцев читаются из своего курсора по мере обхода"""
+
+        cursor = self.create_cursor()
+        if cursor is None:
+            return
+        try:
+            yield from self._iter_daily_hours(cursor, start, end)
+        except Exception as e:
+            print(f"Произошла ошибка при чтении часов по дням за период {start} - {end}: {e}")
+        finally:
+            cursor.close()
+
+    def get_hours_by_semester(self, semester, group_names=None, subject_names=None) -> list:
+        """
+        Получение часов семестра в виде (date, subject_name, group_name, hours) для построения индекса
+        :parameter group_names: Набор групп для фильтрации (None или пустой набор - без фильтра)
+        :parameter subject_names: Набор предметов для фильтрации (None или пустой набор - без фильтра)
+        """
+
+        where, params = self._build_where(
+            ["p.semester = ?"], [semester],
+            [("p.group_id", self._ids_filter("groups", group_names)),
+             ("p.subject_id", self._ids_filter("subjects", subject_names))]
+        )
+        try:
+            return [(work_date, subject_name, group_name, hours) for _, work_date, subject_name, group_name, _, hours, _
+                    in self._select_work_days(where, params)]
+        except Exception as e:
+            print(f"Произошла ошибка при получении часов семестра {semester}: {e}")
+            return []
+
+    def get_work_days_by_group(self, group_name, use_like=False) -> list:
+        """
+        Получение рабочих дней по группе
+        :parameter use_like: Параметр, означающий, будет ли в запросе использоваться констуркция LIKE
+        """
+
+        if use_like:
+            where = "WHERE g.name LIKE ?"
+            group_name = f"%{group_name}%"
+        else:
+            where = "WHERE g.name = ?"
+
+        try:
+            return self._select_work_days(where, (group_name,))
+        except Exception as e:
+            print(f"Произошла ошибка при получении рабочих дней по группе: {e}")
+            return []
+
+    def get_work_days_by_subject(self, subject_name, use_like=False) -> list:
+        """
+        Получение рабочих дней по предмету
+        :parameter use_like: Параметр, означающий, будет ли в запросе использоваться констуркция LIKE
+        """
+
+        if use_like:
+            where = "WHERE s.name LIKE ?"
+            subject_name = f"%{subject_name}%"
+        else:
+            where = "WHERE s.name = ?"
+
+        try:
+            return self._select_work_days(where, (subject_name,))
+        except Exception as e:
+            print(f"Произошла ошибка при получении рабочих дней по предмету: {e}")
+            return []
+
+    def get_work_days_by_date(self, date) -> list:
+        """Получение рабочих дней по дате"""
+
+        try:
+            date = self._date_to_str(date)
+            day_number = self._day_number(date)
+            return self._select_work_days("WHERE p.month = ?", (date[:7],), day_number, day_number)
+        except Exception as e:
+            print(f"Произошла ошибка при получении рабочих дней по дате: {e}")
+            return []
+
+    def update_work_day(self, id, **kwargs) -> str | None:
+        """
+        Обновление рабочего дня: часы переносятся на новый ключ (date, group_name, subject_name, semester)
+        с новыми часами. id записи определяется её месяцем и днём, поэтому после смены ключа он меняется -
+        возвращается запись с новым id
+        """
+
+        try:
+            work_day = self.get_work_day_by_id(id)
+            if not work_day:
+                return None
+            _, date, subject_name, group_name, semester, hours, _ = work_day
+            values = {"date": date, "subject_name": subject_name, "group_name": group_name,
+                      "semester": semester, "hours": hours}
+            unknown = set(kwargs) - set(values)
+            if unknown:
+                raise ValueError(f"нет столбцов {', '.join(sorted(unknown))}")
+            values.update(kwargs)
+            values["date"] = self._date_to_str(values["date"])
+
+            new_group_id = self._group_id(values["group_name"])
+            new_subject_id = self._subject_id(values["subject_name"])
+            self._write_days([
+                (semester, self._group_id(group_name), self._subject_id(subject_name), date, None),
+                (values["semester"], new_group_id, new_subject_id, values["date"], values["hours"]),
+            ])
+            self._connection.commit()
+
+            new_id, _ = self._day_hours(values["semester"], new_group_id, new_subject_id, values["date"])
+            return self.get_work_day_by_id(new_id)
+        except Exception as e:
+            print(f"Произошла ошибка при обновлении предмета: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def delete_work_day(self, work_day_id) -> str | None:
+        """Удаление записи о рабочем дне"""
+
+        try:
+            work_day = self.get_work_day_by_id(work_day_id)
+            if not work_day:
+                return None
+            _, date, subject_name, group_name, semester, _, _ = work_day
+            self._write_days([(semester, self._group_id(group_name), self._subject_id(subject_name), date, None)])
+            self._connection.commit()
+            return work_day_id
+        except Exception as e:
+            print(f"Произошла ошибка при удалении рабочего дня: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def count_lossy_hours(self) -> tuple | None:
+        """
+        Проверка перед pack_rows: сколько записей workDays упакованный формат изменил бы.
+        Возвращает (часы точнее сотых - будут округлены, часы, которые нельзя записать, - больше 655.34 ч
+        или не конечное число) или None при ошибке
+        """
+
+        rounded = unstorable = 0
+        try:
+            for (hours,) in self.cursor.execute("SELECT hours FROM workDays"):
+                if not self.hours_storable(hours):
+                    unstorable += 1
+                elif not math.isclose(round(hours * HOURS_SCALE), hours * HOURS_SCALE, rel_tol=0, abs_tol=1e-6):
+                    rounded += 1
+            return rounded, unstorable
+        except Exception as e:
+            print(f"Произошла ошибка при проверке часов перед упаковкой: {e}")
+            return None
+
+    def pack_rows(self, allow_rounding=False) -> int | None:
+        """
+        Конвертер построчного хранения в упакованное: переносит все записи workDays в workDaysPacked
+        одной транзакцией (дни, уже лежащие в упакованных месяцах, перезаписываются) и записывает формат в meta.
+        Конвертация с потерей данных не выполняется: если есть часы, которые нельзя записать,
+        или часы точнее сотых без allow_rounding (см. count_lossy_hours)
+        Возвращает количество перенесённых записей или None при ошибке (транзакция откатывается)
+        """
+
+        lossy = self.count_lossy_hours()
+        if lossy is None:
+            return None
+        rounded, unstorable = lossy
+        if unstorable or (rounded and not allow_rounding):
+            print(f"Упаковка отменена: часов точнее сотых - {rounded}, не помещающихся в формат - {unstorable}")
+            return None
+
+        try:
+            rows = self.cursor.execute("SELECT semester, group_id, subject_id, date, hours FROM workDays").fetchall()
+            self._write_days(rows)
+            self.cursor.execute("DELETE FROM workDays")
+            self.cursor.execute(SET_STORAGE_QUERY, (STORAGE_META_KEY, PACKED_STORAGE))
+            self._connection.commit()
+            return len(rows)
+        except Exception as e:
+            print(f"Произошла ошибка при упаковке часов: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def unpack_rows(self) -> int | None:
+        """
+        Обратный конвертер: разворачивает workDaysPacked в записи workDays (по записи на день) одной транзакцией
+        и записывает формат в meta.
+        Возвращает количество записанных строк или None при ошибке (транзакция откатывается)
+        """
+
+        try:
+            month_rows = self.cursor.execute(
+                "SELECT id, month, subject_id, group_id, semester, hours FROM workDaysPacked").fetchall()
+            rows = [(work_date, subject_id, group_id, semester, hours)
+                    for _, work_date, subject_id, group_id, semester, hours, _ in self._expand(month_rows)]
+            self.cursor.executemany(UPSERT_HOURS_QUERY, rows)
+            self.cursor.execute("DELETE FROM workDaysPacked")
+            self.cursor.execute(SET_STORAGE_QUERY, (STORAGE_META_KEY, ROWS_STORAGE))
+            self._connection.commit()
+            return len(rows)
+        except Exception as e:
+            print(f"Произошла ошибка при распаковке часов: {e}")
+            if self._connection:
+                self._connection.rollback()
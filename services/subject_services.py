@@ -1,9 +1,9 @@
-from .general import DBBase
+from .general import DBBase, invalidate_name_ids
 
 
 class SubjectDAO(DBBase):
-    def __init__(self, db_filename=None):
-        super().__init__(db_filename)
+    def __init__(self, db_filename=None, connection=None):
+        super().__init__(db_filename, connection)
         # self.cursor = self.create_cursor()
         # Включаем проверку внешних ключей
         # self._connection.execute("PRAGMA foreign_keys = ON")
@@ -15,6 +15,7 @@ class SubjectDAO(DBBase):
         try:
             self.cursor.execute(query, (subject_name,))
             self._connection.commit()
+            invalidate_name_ids(self.db_path, "subjects")
             return subject_name
         except Exception as e:
             print(f"Произошла ошибка при создании предмета: {e}")
@@ -24,7 +25,7 @@ class SubjectDAO(DBBase):
     def get_subject_by_name(self, subject_name) -> tuple:
         """Строгий поискс предмета по названию"""
 
-        query = """SELECT * FROM subjects WHERE name = ?"""
+        query = """SELECT name FROM subjects WHERE name = ?"""
 
         try:
             result = self.cursor.execute(query, (subject_name,)).fetchone()
@@ -37,7 +38,7 @@ class SubjectDAO(DBBase):
         """Не строгий поискс предметов по названию"""
 
         pattern = f"%{subject_name}%"
-        query = """SELECT * FROM subjects WHERE name LIKE ?"""
+        query = """SELECT name FROM subjects WHERE name LIKE ?"""
 
         try:
             result = self.cursor.execute(query, (pattern,)).fetchall()
@@ -49,7 +50,7 @@ class SubjectDAO(DBBase):
     def get_all_subjects(self) -> list:
         """Получение всех предметов"""
 
-        query = "SELECT * FROM subjects"
+        query = "SELECT name FROM subjects"
         try:
             result = self.cursor.execute(query).fetchall()
             return result
@@ -58,12 +59,13 @@ class SubjectDAO(DBBase):
             return []
 
     def update_subject(self, current_name, new_name) -> str | None:
-        """Обновление предмета"""
+        """Обновление предмета: меняется одна строка справочника, планы и часы ссылаются на её id"""
 
         query = """UPDATE subjects SET name = ? WHERE name = ?"""
         try:
             result = self.cursor.execute(query, (new_name, current_name))
             self._connection.commit()
+            invalidate_name_ids(self.db_path, "subjects")
 
             # Проверяем, что запрос выполнился минимум над 1 записью
             if self.cursor.rowcount == 0:
@@ -75,6 +77,45 @@ class SubjectDAO(DBBase):
             if self._connection:
                 self._connection.rollback()
 
+    def replace_all(self, names) -> tuple | None:
+        """
+        Приводит список дисциплин в БД к переданному одной транзакцией.
+        Названия сравниваются без учёта регистра: совпадающие остаются как есть,
+        отсутствующие в списке удаляются, новые добавляются в написании из списка.
+        Возвращает (список добавленных, список удалённых) или None при ошибке (транзакция откатывается)
+        """
+
+        select_query = """SELECT name FROM subjects"""
+        insert_query = """INSERT INTO subjects (name) VALUES (?)"""
+        delete_query = """DELETE FROM subjects WHERE name = ?"""
+
+        # Название в нижнем регистре -> исходное написание; повтор без учёта регистра не добавляется дважды
+        wanted = {}
+        for name in names:
+            name = name.strip()
+            if name:
+                wanted.setdefault(name.lower(), name)
+
+        try:
+            existing = {row[0].lower(): row[0] for row in self.cursor.execute(select_query)}
+
+            to_add = [name for key, name in wanted.items() if key not in existing]
+            to_delete = [name for key, name in existing.items() if key not in wanted]
+            if not to_add and not to_delete:
+                return [], []
+
+            if to_delete:
+                self.cursor.executemany(delete_query, [(name,) for name in to_delete])
+            if to_add:
+                self.cursor.executemany(insert_query, [(name,) for name in to_add])
+            self._connection.commit()
+            invalidate_name_ids(self.db_path, "subjects")
+            return to_add, to_delete
+        except Exception as e:
+            print(f"Произошла ошибка при синхронизации списка дисциплин: {e}")
+            if self._connection:
+                self._connection.rollback()
+
     def delete_subject(self, subject_name) -> str | None:
         """Удаление предмета"""
 
@@ -82,6 +123,7 @@ class SubjectDAO(DBBase):
         try:
             result = self.cursor.execute(query, (subject_name,))
             self._connection.commit()
+            invalidate_name_ids(self.db_path, "subjects")
 
             # Проверяем, что запрос выполнился минимум над 1 записью
             if self.cursor.rowcount == 0:
@@ -0,0 +1,53 @@
+import csv
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+from .excel_export import CELL_STYLE, HEADER_STYLE, MAX_COLUMN_WIDTH, create_report_styles
+
+SUMMARY_HEADERS = ["Группа", "Дисциплина", "Проведено ч.", "Остаток ч."]
+
+
+def build_semester_summary(curriculum_dao, semester, group_names=None, subject_names=None):
+    """
+    Сводка по семестру: (group_name, subject_name, проведено часов, остаток часов) по каждому учебному плану.
+    Считается в БД одним запросом, фильтры по группам и предметам тоже применяются в SQL
+    """
+    report_data = curriculum_dao.get_semester_report(semester, group_names, subject_names)
+    return [
+        (group_name, subject_name, sum_of_hours, total_hour - sum_of_hours)
+        for group_name, subject_name, total_hour, sum_of_hours in report_data
+    ]
+
+
+def write_summary_csv(file_path, summary_rows):
+    """Записывает сводку по семестру в CSV (UTF-8 с BOM)"""
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(SUMMARY_HEADERS)
+        writer.writerows(summary_rows)
+
+
+def write_summary_xlsx(file_path, summary_rows, sheet_title="Сводка"):
+    """Записывает сводку по семестру в книгу Excel в потоковом режиме"""
+    wb = Workbook(write_only=True)
+    for style in create_report_styles():
+        wb.add_named_style(style)
+    ws = wb.create_sheet(sheet_title)
+
+    # Ширины по самым длинным значениям столбцов - сводка уже в памяти, до записи строк
+    for col, header in enumerate(SUMMARY_HEADERS, 1):
+        width = max([len(header)] + [len(str(summary_row[col - 1])) for summary_row in summary_rows]) + 2
+        ws.column_dimensions[get_column_letter(col)].width = min(width, MAX_COLUMN_WIDTH)
+
+    def styled(value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    ws.append([styled(header, HEADER_STYLE) for header in SUMMARY_HEADERS])
+    for summary_row in summary_rows:
+        ws.append([styled(value, CELL_STYLE) for value in summary_row])
+
+    wb.save(file_path)
@@ -1,9 +1,38 @@
+import math
+from datetime import date as date_type
+
 from .general import DBBase
 
+# Порядковый номер 1970-01-01: номер дня в столбце day_number отсчитывается от этой даты
+EPOCH_ORDINAL = date_type(1970, 1, 1).toordinal()
+
+# Рабочие дни хранят id группы и предмета; наружу DAO отдаёт строки с названиями в прежнем порядке столбцов:
+# (id, date, subject_name, group_name, semester, hours, day_number)
+WORK_DAY_COLUMNS = "w.id, w.date, s.name, g.name, w.semester, w.hours, w.day_number"
+WORK_DAY_TABLES = "workDays w JOIN groups g ON g.id = w.group_id JOIN subjects s ON s.id = w.subject_id"
+
+# Запись часов: вставка или обновление часов существующей записи с тем же ключом
+UPSERT_HOURS_QUERY = """
+    INSERT INTO workDays (date, subject_id, group_id, semester, hours) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (semester, group_id, subject_id, date) DO UPDATE SET hours = excluded.hours
+"""
+DELETE_HOURS_QUERY = """DELETE FROM workDays WHERE semester = ? AND group_id = ? AND subject_id = ? AND date = ?"""
+
+# Часы по дням за период [день начала, день конца], упорядоченные по месяцу, группе, предмету и дню.
+# Группировка идёт по id, названия нужны только для порядка строк в отчёте
+DAILY_HOURS_QUERY = f"""
+    SELECT substr(w.date, 1, 7) AS month_key, CAST(substr(w.date, 9, 2) AS INTEGER) AS day,
+           g.name, s.name, SUM(w.hours)
+    FROM {WORK_DAY_TABLES}
+    WHERE w.day_number BETWEEN ? AND ?
+    GROUP BY month_key, w.group_id, w.subject_id, day
+    ORDER BY month_key, g.name, s.name, day
+"""
+
 
 class WorkDayDAO(DBBase):
-    def __init__(self, db_filename=None):
-        super().__init__(db_filename)
+    def __init__(self, db_filename=None, connection=None):
+        super().__init__(db_filename, connection)
         # self.cursor = self.create_cursor()
         # Включаем проверку внешних ключей
         # self._connection.execute("PRAGMA foreign_keys = ON")
@@ -11,9 +40,9 @@ class WorkDayDAO(DBBase):
     def create_work_day(self, date, subject_name, group_name, semester, hours) -> tuple | None:
         """Заполнение одного рабочего дня"""
 
-        query = """INSERT INTO workDays (date, subject_name, group_name, semester, hours) VALUES (?, ?, ?, ?, ?)"""
+        query = """INSERT INTO workDays (date, subject_id, group_id, semester, hours) VALUES (?, ?, ?, ?, ?)"""
         try:
-            self.cursor.execute(query, (date, subject_name, group_name, semester, hours))
+            self.cursor.execute(query, (date, self._subject_id(subject_name), self._group_id(group_name), semester, hours))
 
             # Проверяем, получилось ли добавить новую запись
             new_row = self.cursor.lastrowid
@@ -22,7 +51,7 @@ class WorkDayDAO(DBBase):
             self._connection.commit()
 
             # Возвращаем набор данных, записанный в бд, используя встроенную переменную ROWID в sqlite
-            select_query = """SELECT * FROM workDays WHERE id = ?"""
+            select_query = f"""SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} WHERE w.id = ?"""
             self.cursor.execute(select_query, (new_row,))
             return self.cursor.fetchone()
         except Exception as e:
@@ -30,10 +59,149 @@ class WorkDayDAO(DBBase):
             if self._connection:
                 self._connection.rollback()
 
+    @staticmethod
+    def _date_to_str(work_date):
+        """Приводит дату к виду 'YYYY-MM-DD', в котором она хранится в БД"""
+        return work_date if isinstance(work_date, str) else work_date.isoformat()
+
+    @staticmethod
+    def _day_number(work_date):
+        """Номер дня с 1970-01-01 - то же значение, что вычисляет столбец day_number"""
+        if isinstance(work_date, str):
+            work_date = date_type.fromisoformat(work_date)
+        return work_date.toordinal() - EPOCH_ORDINAL
+
+    def hours_storable(self, hours) -> bool:
+        """Можно ли записать часы за день: неотрицательное конечное число"""
+        return math.isfinite(hours) and hours >= 0
+
+    def upsert_hours(self, date, group_name, subject_name, semester, hours) -> tuple | None:
+        """
+        Записывает часы за день одной командой: вставляет запись или обновляет часы существующей.
+        Возвращает (date, group_name, subject_name, semester, hours) или None при ошибке
+        """
+
+        date = self._date_to_str(date)
+        try:
+            self.cursor.execute(UPSERT_HOURS_QUERY,
+                                (date, self._subject_id(subject_name), self._group_id(group_name), semester, hours))
+            self._connection.commit()
+            return date, group_name, subject_name, semester, hours
+        except Exception as e:
+            print(f"Произошла ошибка при записи часов за {date}: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def delete_hours(self, date, group_name, subject_name, semester) -> tuple | None:
+        """
+        Удаление записи о часах по ключу (дата, группа, предмет, семестр).
+        Возвращает ключ удалённой записи или None, если записи не было
+        """
+
+        date = self._date_to_str(date)
+        try:
+            self.cursor.execute(DELETE_HOURS_QUERY,
+                                (semester, self._group_id(group_name), self._subject_id(subject_name), date))
+            self._connection.commit()
+
+            # Проверяем, что запрос выполнился минимум над 1 записью
+            if self.cursor.rowcount == 0:
+                return None
+
+            return date, group_name, subject_name, semester
+        except Exception as e:
+            print(f"Произошла ошибка при удалении часов за {date}: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def apply_hours(self, changes) -> int | None:
+        """
+        Применяет пачку изменений часов в одной транзакции.
+        :parameter changes: Набор (date, group_name, subject_name, semester, hours), hours=None означает удаление
+        Возвращает количество применённых изменений или None при ошибке (транзакция откатывается)
+        """
+
+        if not changes:
+            return 0
+        try:
+            upserts = []
+            deletes = []
+            for date, group_name, subject_name, semester, hours in changes:
+                date = self._date_to_str(date)
+                group_id = self._group_id(group_name)
+                subject_id = self._subject_id(subject_name)
+                if hours is None:
+                    deletes.append((semester, group_id, subject_id, date))
+                else:
+                    upserts.append((date, subject_id, group_id, semester, hours))
+
+            if upserts:
+                self.cursor.executemany(UPSERT_HOURS_QUERY, upserts)
+            if deletes:
+                self.cursor.executemany(DELETE_HOURS_QUERY, deletes)
+            self._connection.commit()
+            return len(upserts) + len(deletes)
+        except Exception as e:
+            print(f"Произошла ошибка при записи пачки часов: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def import_hours(self, batches, rejected=None) -> int | None:
+        """
+        Массовая запись часов: все пачки пишутся через executemany в одной транзакции.
+        :parameter batches: Итерируемый набор пачек (date, group_name, subject_name, semester, hours);
+        пачки могут формироваться на лету - в памяти одновременно только текущая
+        :parameter rejected: Список, в который добавляются (строка пачки, причина) для строк, пропущенных
+        _resolve_import_batch (None - пропущенные строки не сообщаются)
+        Существующие записи с тем же ключом (дата, группа, предмет, семестр) получают новые часы.
+        Возвращает количество записанных строк или None при ошибке (транзакция откатывается целиком)
+        """
+
+        written = 0
+        try:
+            for batch in batches:
+                rows = self._resolve_import_batch(batch, rejected)
+                self.cursor.executemany(UPSERT_HOURS_QUERY, [
+                    (date, subject_id, group_id, semester, hours)
+                    for date, group_id, subject_id, semester, hours in rows
+                ])
+                written += len(rows)
+            self._connection.commit()
+            return written
+        except Exception as e:
+            print(f"Произошла ошибка при массовой записи часов: {e}")
+            if self._connection:
+                self._connection.rollback()
+
+    def _resolve_import_batch(self, batch, rejected=None):
+        """
+        Пачка импорта (date, group_name, subject_name, semester, hours) -> (date 'YYYY-MM-DD', group_id, subject_id,
+        semester, hours). Строки, которые нельзя записать - группы или предмета нет в БД, часы не проходят
+        hours_storable, - проверяются до записи и пропускаются, чтобы не откатить весь импорт.
+        Если передан список rejected, в него добавляются (строка пачки, причина)
+        """
+        rows = []
+        for row in batch:
+            date, group_name, subject_name, semester, hours = row
+            group_id = self._group_id(group_name)
+            subject_id = self._subject_id(subject_name)
+            if group_id is None:
+                reason = f"нет группы '{group_name}'"
+            elif subject_id is None:
+                reason = f"нет дисциплины '{subject_name}'"
+            elif hours is None or not self.hours_storable(hours):
+                reason = f"некорректные часы '{hours}'"
+            else:
+                rows.append((self._date_to_str(date), group_id, subject_id, semester, hours))
+                continue
+            if rejected is not None:
+                rejected.append((row, reason))
+        return rows
+
     def get_work_day_by_id(self, work_day_id) -> tuple:
         """Строгий поискс рабочего дня по его id"""
 
-        query = """SELECT * FROM workDays WHERE id = ?"""
+        query = f"""SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} WHERE w.id = ?"""
 
         try:
             result = self.cursor.execute(query, (work_day_id,)).fetchone()
@@ -45,7 +213,7 @@ class WorkDayDAO(DBBase):
     def get_all_work_days(self) -> list:
         """Получение всех рабочих дней"""
 
-        query = "SELECT * FROM workDays"
+        query = f"SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES}"
         try:
             result = self.cursor.execute(query).fetchall()
             return result
@@ -53,6 +221,80 @@ class WorkDayDAO(DBBase):
             print(f"Произошла ошибка при получении всех рабочих дней: {e}")
             return []
 
+    def get_work_days_in_range(self, start, end, semester=None) -> list:
+        """
+        Получение рабочих дней за период [start, end] включительно - диапазон по индексу day_number
+        :parameter start: Первый день периода (date или строка 'YYYY-MM-DD')
+        :parameter end: Последний день периода (date или строка 'YYYY-MM-DD')
+        :parameter semester: Семестр (None - все семестры)
+        """
+
+        conditions = ["w.day_number BETWEEN ? AND ?"]
+        params = [self._day_number(start), self._day_number(end)]
+        if semester is not None:
+            conditions.append("w.semester = ?")
+            params.append(semester)
+
+        where, params = self._build_where(conditions, params, [])
+        query = f"SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} {where} ORDER BY w.day_number"
+        try:
+            result = self.cursor.execute(query, params).fetchall()
+            return result
+        except Exception as e:
+            print(f"Произошла ошибка при получении рабочих дней за период {start} - {end}: {e}")
+            return []
+
+    def get_daily_hours_in_range(self, start, end) -> list:
+        """
+        Часы за период [start, end], сгруппированные одним запросом по месяцу, группе, предмету и дню:
+        (month_key, day, group_name, subject_name, sum_of_hours), где month_key - строка 'YYYY-MM'.
+        Строки упорядочены по месяцу, группе, предмету и дню - их можно разбить на блоки месяцев за один проход
+        """
+
+        try:
+            result = self.cursor.execute(DAILY_HOURS_QUERY, (self._day_number(start), self._day_number(end))).fetchall()
+            return result
+        except Exception as e:
+            print(f"Произошла ошибка при подсчёте часов по дням за период {start} - {end}: {e}")
+            return []
+
+    def iter_daily_hours_in_range(self, start, end):
+        """
+        То же, что get_daily_hours_in_range, но строки читаются из курсора по мере обхода, без fetchall:
+        выгрузка за несколько лет не держит в памяти весь результат запроса.
+        Использует свой курсор, поэтому другие запросы DAO во время обхода ему не мешают
+        """
+
+        cursor = self.create_cursor()
+        if cursor is None:
+            return
+        try:
+            yield from cursor.execute(DAILY_HOURS_QUERY, (self._day_number(start), self._day_number(end)))
+        except Exception as e:
+            print(f"Произошла ошибка при чтении часов по дням за период {start} - {end}: {e}")
+        finally:
+            cursor.close()
+
+    def get_hours_by_semester(self, semester, group_names=None, subject_names=None) -> list:
+        """
+        Получение часов семестра в виде (date, subject_name, group_name, hours) для построения индекса
+        :parameter group_names: Набор групп для фильтрации (None или пустой набор - без фильтра)
+        :parameter subject_names: Набор предметов для фильтрации (None или пустой набор - без фильтра)
+        """
+
+        where, params = self._build_where(
+            ["w.semester = ?"], [semester],
+            [("w.group_id", self._ids_filter("groups", group_names)),
+             ("w.subject_id", self._ids_filter("subjects", subject_names))]
+        )
+        query = f"SELECT w.date, s.name, g.name, w.hours FROM {WORK_DAY_TABLES} {where}"
+        try:
+            result = self.cursor.execute(query, params).fetchall()
+            return result
+        except Exception as e:
+            print(f"Произошла ошибка при получении часов семестра {semester}: {e}")
+            return []
+
     def get_work_days_by_group(self, group_name, use_like=False) -> list:
         """
         Получение рабочих дней по группе
@@ -61,11 +303,11 @@ class WorkDayDAO(DBBase):
 
         # Формируем запрос
         if use_like:
-            query = "SELECT * FROM workDays WHERE group_name LIKE ?"
+            query = f"SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} WHERE g.name LIKE ?"
             # Подготавливаем значение с % по краям
             group_name = f"%{group_name}%"
         else:
-            query = "SELECT * FROM workDays WHERE group_name = ?"
+            query = f"SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} WHERE g.name = ?"
 
         try:
             result = self.cursor.execute(query, (group_name,)).fetchall()
@@ -82,11 +324,11 @@ class WorkDayDAO(DBBase):
 
         # Формируем запрос
         if use_like:
-            query = "SELECT * FROM workDays WHERE subject_name LIKE ?"
+            query = f"SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} WHERE s.name LIKE ?"
             # Подготавливаем значение с % по краям
             subject_name = f"%{subject_name}%"
         else:
-            query = "SELECT * FROM workDays WHERE subject_name = ?"
+            query = f"SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} WHERE s.name = ?"
 
         try:
             result = self.cursor.execute(query, (subject_name,)).fetchall()
@@ -98,7 +340,7 @@ class WorkDayDAO(DBBase):
     def get_work_days_by_date(self, date) -> list:
         """Получение рабочих дней по дате"""
 
-        query = "SELECT * FROM workDays WHERE date = ?"
+        query = f"SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} WHERE w.date = ?"
         try:
             result = self.cursor.execute(query, (date,)).fetchall()
             return result
@@ -109,6 +351,9 @@ class WorkDayDAO(DBBase):
     def update_work_day(self, id, **kwargs) -> str | None:
         """Обновление рабочего дня"""
 
+        # Группа и предмет хранятся по id
+        kwargs = self._names_to_ids(kwargs)
+
         # Формируем строку запроса на основе переданных именованных аргументов
         query = """UPDATE workDays SET """
         for k in kwargs:
@@ -128,7 +373,7 @@ class WorkDayDAO(DBBase):
                 return None
 
             # Возвращаем набор данных, записанный в бд, используя встроенную переменную ROWID в sqlite
-            select_query = """SELECT * FROM workDays WHERE id = ?"""
+            select_query = f"""SELECT {WORK_DAY_COLUMNS} FROM {WORK_DAY_TABLES} WHERE w.id = ?"""
             self.cursor.execute(select_query, (id,))
             return self.cursor.fetchone()
         except Exception as e:
@@ -0,0 +1,55 @@
+class WorkDayWriteBuffer:
+    """
+    Буфер отложенной записи часов между интерфейсом и WorkDayDAO.
+    Повторные правки одной ячейки схлопываются, в БД уходит последнее значение - одной транзакцией при flush()
+    """
+    def __init__(self, work_day_dao):
+        self.work_day_dao = work_day_dao
+        # (date, group_name, subject_name, semester) -> hours, None - запись нужно удалить
+        self._pending = {}
+
+    def set_hours(self, date, group_name, subject_name, semester, hours):
+        """Запоминает новые часы за день"""
+        self._pending[(self.work_day_dao._date_to_str(date), group_name, subject_name, semester)] = hours
+
+    def delete_hours(self, date, group_name, subject_name, semester):
+        """Запоминает удаление часов за день"""
+        self._pending[(self.work_day_dao._date_to_str(date), group_name, subject_name, semester)] = None
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def flush(self) -> list | None:
+        """
+        Записывает накопленные правки в БД одной транзакцией.
+        Правки, которые записать нельзя, убираются из буфера и не мешают записи остальных:
+        - группы или предмета нет в БД (например, они переименованы или удалены) или часы нельзя записать
+          в формате хранения БД (например, NaN) - проверяется до начала транзакции;
+        - правку отвергла БД - если пачка не записалась, правки пишутся по одной.
+        Возвращает список отброшенных правок (date, group_name, subject_name, semester, hours)
+        или None, если не записалась ни одна правка (ошибка БД) - тогда правки остаются в буфере до следующей записи
+        """
+        dropped = []
+        for key, hours in list(self._pending.items()):
+            _, group_name, subject_name, _ = key
+            if (self.work_day_dao._group_id(group_name) is None or self.work_day_dao._subject_id(subject_name) is None
+                    or (hours is not None and not self.work_day_dao.hours_storable(hours))):
+                dropped.append(key + (hours,))
+                del self._pending[key]
+
+        if not self._pending:
+            return dropped
+
+        changes = [key + (hours,) for key, hours in self._pending.items()]
+        if self.work_day_dao.apply_hours(changes) is None:
+            # Одна ошибочная правка откатывает всю пачку - пишем правки по одной и отбрасываем отвергнутые
+            failed = [change for change in changes if self.work_day_dao.apply_hours([change]) is None]
+            if len(failed) == len(changes):
+                return None
+            dropped.extend(failed)
+
+        self._pending.clear()
+        return dropped
@@ -8,6 +8,9 @@ ROOT_PATH = str(_BASE_ROOT_PATH / "db")
 # Путь до sql-скрипта таблиц бд
 SQL_SCRIPT_PATH = _BASE_ROOT_PATH / "db" / "base_script.sql"
 
+# Путь до файла настроек (тема оформления, профиль производительности БД)
+CONFIG_PATH = _BASE_ROOT_PATH / "settings" / "config.ini"
+
 db_dir_path = _BASE_ROOT_PATH / "db"
 db_files = list(db_dir_path.glob("*.db"))
 
@@ -39,10 +39,8 @@ class Ui_MainWindow(object):
         self.gridLayout_2.setContentsMargins(9, 9, 9, 9)
         self.gridLayout_2.setSpacing(6)
         self.gridLayout_2.setObjectName("gridLayout_2")
-        self.tableV_hours_1 = QtWidgets.QTableWidget(parent=self.tab_September)
+        self.tableV_hours_1 = QtWidgets.QTableView(parent=self.tab_September)
         self.tableV_hours_1.setObjectName("tableV_hours_1")
-        self.tableV_hours_1.setColumnCount(0)
-        self.tableV_hours_1.setRowCount(0)
         self.gridLayout_2.addWidget(self.tableV_hours_1, 0, 0, 1, 1)
         self.tabW_SlidesFirstHalf.addTab(self.tab_September, "")
         self.tab_October = QtWidgets.QWidget()
@@ -51,53 +49,43 @@ class Ui_MainWindow(object):
         self.gridLayout.setContentsMargins(9, 9, 9, 9)
         self.gridLayout.setSpacing(6)
         self.gridLayout.setObjectName("gridLayout")
-        self.tableV_hours_4 = QtWidgets.QTableWidget(parent=self.tab_October)
+        self.tableV_hours_4 = QtWidgets.QTableView(parent=self.tab_October)
         self.tableV_hours_4.setStyleSheet("")
         self.tableV_hours_4.setObjectName("tableV_hours_4")
-        self.tableV_hours_4.setColumnCount(0)
-        self.tableV_hours_4.setRowCount(0)
         self.gridLayout.addWidget(self.tableV_hours_4, 0, 0, 1, 1)
         self.tabW_SlidesFirstHalf.addTab(self.tab_October, "")
         self.tab_November = QtWidgets.QWidget()
         self.tab_November.setObjectName("tab_November")
         self.gridLayout_4 = QtWidgets.QGridLayout(self.tab_November)
         self.gridLayout_4.setObjectName("gridLayout_4")
-        self.tableV_hours_2 = QtWidgets.QTableWidget(parent=self.tab_November)
+        self.tableV_hours_2 = QtWidgets.QTableView(parent=self.tab_November)
         self.tableV_hours_2.setStyleSheet("")
         self.tableV_hours_2.setObjectName("tableV_hours_2")
-        self.tableV_hours_2.setColumnCount(0)
-        self.tableV_hours_2.setRowCount(0)
         self.gridLayout_4.addWidget(self.tableV_hours_2, 0, 0, 1, 1)
         self.tabW_SlidesFirstHalf.addTab(self.tab_November, "")
         self.tab_December = QtWidgets.QWidget()
         self.tab_December.setObjectName("tab_December")
         self.gridLayout_5 = QtWidgets.QGridLayout(self.tab_December)
         self.gridLayout_5.setObjectName("gridLayout_5")
-        self.tableV_hours_3 = QtWidgets.QTableWidget(parent=self.tab_December)
+        self.tableV_hours_3 = QtWidgets.QTableView(parent=self.tab_December)
         self.tableV_hours_3.setStyleSheet("")
         self.tableV_hours_3.setObjectName("tableV_hours_3")
-        self.tableV_hours_3.setColumnCount(0)
-        self.tableV_hours_3.setRowCount(0)
         self.gridLayout_5.addWidget(self.tableV_hours_3, 0, 0, 1, 1)
         self.tabW_SlidesFirstHalf.addTab(self.tab_December, "")
         self.tab_5 = QtWidgets.QWidget()
         self.tab_5.setObjectName("tab_5")
         self.gridLayout_6 = QtWidgets.QGridLayout(self.tab_5)
         self.gridLayout_6.setObjectName("gridLayout_6")
-        self.tableV_hours_5 = QtWidgets.QTableWidget(parent=self.tab_5)
+        self.tableV_hours_5 = QtWidgets.QTableView(parent=self.tab_5)
         self.tableV_hours_5.setObjectName("tableV_hours_5")
-        self.tableV_hours_5.setColumnCount(0)
-        self.tableV_hours_5.setRowCount(0)
         self.gridLayout_6.addWidget(self.tableV_hours_5, 0, 0, 1, 1)
         self.tabW_SlidesFirstHalf.addTab(self.tab_5, "")
         self.tab_6 = QtWidgets.QWidget()
         self.tab_6.setObjectName("tab_6")
         self.gridLayout_7 = QtWidgets.QGridLayout(self.tab_6)
         self.gridLayout_7.setObjectName("gridLayout_7")
-        self.tableV_hours_6 = QtWidgets.QTableWidget(parent=self.tab_6)
+        self.tableV_hours_6 = QtWidgets.QTableView(parent=self.tab_6)
         self.tableV_hours_6.setObjectName("tableV_hours_6")
-        self.tableV_hours_6.setColumnCount(0)
-        self.tableV_hours_6.setRowCount(0)
         self.gridLayout_7.addWidget(self.tableV_hours_6, 0, 0, 1, 1)
         self.tabW_SlidesFirstHalf.addTab(self.tab_6, "")
         self.gridLayout_3.addWidget(self.tabW_SlidesFirstHalf, 0, 0, 7, 1)
@@ -125,6 +125,11 @@ class Ui_PrintReportDialog(object):
         self.chB_select_all.setFont(font)
         self.chB_select_all.setObjectName("chB_select_all")
         self.gridLayout_3.addWidget(self.chB_select_all, 1, 0, 1, 1)
+        self.progressBar_export = QtWidgets.QProgressBar(parent=PrintReportDialog)
+        self.progressBar_export.setProperty("value", 0)
+        self.progressBar_export.setVisible(False)
+        self.progressBar_export.setObjectName("progressBar_export")
+        self.gridLayout_3.addWidget(self.progressBar_export, 5, 0, 1, 2)
 
         self.retranslateUi(PrintReportDialog)
         QtCore.QMetaObject.connectSlotsByName(PrintReportDialog)